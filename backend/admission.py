@@ -0,0 +1,312 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple
+
+from jobs import Job, JobQueue
+
+# Expensive routes and the limit class each one draws from
+ROUTE_CLASSES = {
+    "/create-token": "deploy",
+    "/deploy-nft": "deploy",
+    "/deploy-contract": "deploy",
+    "/mint-nft": "mint",
+    "/mint-nft/batch": "mint",
+}
+
+# Used for Retry-After until a job has finished and given us a real duration
+DEFAULT_JOB_SECONDS = 60.0
+MAX_RETRY_AFTER = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class RateLimit(NamedTuple):
+    # Tokens refilled per second
+    rate: float
+    # Bucket size: requests a client may make back to back
+    burst: float
+
+
+class Rejection(NamedTuple):
+    status: int
+    reason: str
+    retry_after: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"error": _MESSAGES[self.reason], "reason": self.reason, "retry_after": self.retry_after}
+
+
+_MESSAGES = {
+    "rate_limited": "rate limit exceeded",
+    "client_busy": "too many jobs in flight for this client",
+    "queue_full": "server is at capacity, retry later",
+    "mint_busy": "too many mints in flight, retry later",
+}
+
+
+def _refill(tokens: float, elapsed: float, limit: RateLimit, cost: float) -> Tuple[bool, float, float]:
+    """Token bucket step: returns (allowed, tokens left, seconds until ``cost`` tokens are available)."""
+    tokens = min(limit.burst, tokens + max(elapsed, 0.0) * limit.rate)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / limit.rate if limit.rate > 0 else float(MAX_RETRY_AFTER)
+
+
+class MemoryBucketStore:
+    """Token buckets in process memory; the least recently seen clients are dropped past ``max_keys``."""
+
+    def __init__(self, max_keys: int = 100000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit, cost: float = 1.0) -> Tuple[bool, float]:
+        """Spend ``cost`` tokens from ``key``'s bucket; returns (allowed, seconds to wait if not)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (limit.burst, now))
+            allowed, tokens, wait = _refill(tokens, now - updated_at, limit, cost)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SqliteBucketStore:
+    """Token buckets in a SQLite file, so every worker process on a host enforces one shared limit."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, limit: RateLimit, cost: float = 1.0) -> Tuple[bool, float]:
+        # Wall-clock time, since other processes write the same rows
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated_at = row if row is not None else (limit.burst, now)
+            allowed, tokens, wait = _refill(tokens, now - updated_at, limit, cost)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?)", (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, wait
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0]
+
+
+BUCKET_STORES: Dict[str, Callable[[], Any]] = {
+    "memory": MemoryBucketStore,
+    "sqlite": lambda: SqliteBucketStore(
+        os.getenv("RATE_LIMIT_SQLITE_PATH")
+        or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rate-limits.sqlite3")
+    ),
+}
+
+
+def client_key(api_key: Optional[str], remote_addr: Optional[str], forwarded_for: Optional[str] = None) -> str:
+    """Who a request counts against: its X-API-Key if it sent one, else its IP.
+
+    ``forwarded_for`` (X-Forwarded-For) must only be passed when a trusted
+    proxy sets it; clients can put anything in it themselves.
+    """
+    if api_key:
+        # Keys are credentials; keep only a digest in memory, stats and the store
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    if forwarded_for:
+        return "ip:" + forwarded_for.split(",")[0].strip()
+    return "ip:" + (remote_addr or "unknown")
+
+
+class AdmissionController:
+    """Decides whether a request to an expensive route may start, before any work is done.
+
+    Checks run cheapest and most global first: queue-depth load shedding for
+    deploys and a cap on concurrent mints (503), then each client's share of
+    in-flight deploy jobs and its token bucket (429). Every rejection carries
+    a Retry-After estimated from recent job durations or the bucket's refill.
+    An admitted mint holds a slot until ``release`` is called.
+    """
+
+    def __init__(
+        self,
+        jobs: JobQueue,
+        store: Any,
+        limits: Dict[str, RateLimit],
+        max_queue: int = 50,
+        max_client_jobs: int = 4,
+        max_mints: int = 64,
+        trust_proxy: bool = False,
+    ) -> None:
+        self.jobs = jobs
+        self.store = store
+        self.limits = limits
+        self.max_queue = max_queue
+        self.max_client_jobs = max_client_jobs
+        self.max_mints = max_mints
+        self.trust_proxy = trust_proxy
+        self.concurrency = max(1, getattr(jobs.backend, "concurrency", 1))
+        self.admitted = 0
+        self.rejected: Dict[str, int] = dict.fromkeys(_MESSAGES, 0)
+        self._mints = 0
+        self._job_seconds: Optional[float] = None
+        # client -> ids of its queued and running jobs, and the reverse
+        self._client_jobs: Dict[str, Set[str]] = {}
+        self._job_clients: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        jobs.add_listener(self.job_finished)
+
+    def client(self, api_key: Optional[str], remote_addr: Optional[str], forwarded_for: Optional[str]) -> str:
+        return client_key(api_key, remote_addr, forwarded_for if self.trust_proxy else None)
+
+    def admit(self, route_class: str, client: str, cost: float = 1.0) -> Optional[Rejection]:
+        """Return None if the request may proceed, else the Rejection to answer with."""
+        rejection = self._check(route_class, client, cost)
+        with self._lock:
+            if rejection is None:
+                self.admitted += 1
+            else:
+                self.rejected[rejection.reason] += 1
+        return rejection
+
+    def _check(self, route_class: str, client: str, cost: float) -> Optional[Rejection]:
+        if route_class == "deploy":
+            queued = self.jobs.depth()["queued"]
+            if queued >= self.max_queue:
+                # Time for the workers to drain what is already waiting
+                return Rejection(503, "queue_full", self._retry_after(self._average_job() * queued / self.concurrency))
+            with self._lock:
+                in_flight = len(self._client_jobs.get(client, ()))
+            if in_flight >= self.max_client_jobs:
+                return Rejection(429, "client_busy", self._retry_after(self._average_job()))
+
+        limit = self.limits.get(route_class)
+        if limit is not None:
+            allowed, wait = self.store.take(f"{route_class}:{client}", limit, cost)
+            if not allowed:
+                return Rejection(429, "rate_limited", self._retry_after(wait))
+
+        if route_class == "mint":
+            # Taken last so a request rejected above never holds a slot
+            with self._lock:
+                if self._mints >= self.max_mints:
+                    return Rejection(503, "mint_busy", 1)
+                self._mints += 1
+        return None
+
+    def release(self, route_class: str) -> None:
+        """Give back the slot an admitted mint request held."""
+        if route_class == "mint":
+            with self._lock:
+                self._mints -= 1
+
+    def track(self, client: str, job: Job) -> None:
+        """Count a newly submitted deploy job against ``client`` until it finishes."""
+        with self._lock:
+            # done is set before listeners run, so a job that already finished is never left behind
+            if job.done:
+                return
+            self._client_jobs.setdefault(client, set()).add(job.id)
+            self._job_clients[job.id] = client
+
+    def job_finished(self, job: Job) -> None:
+        """JobQueue listener: free the client's slot and fold the run time into the average."""
+        with self._lock:
+            client = self._job_clients.pop(job.id, None)
+            if client is not None:
+                ids = self._client_jobs[client]
+                ids.discard(job.id)
+                if not ids:
+                    del self._client_jobs[client]
+            if job.started_at is not None and job.finished_at is not None:
+                seconds = job.finished_at - job.started_at
+                previous = self._job_seconds
+                self._job_seconds = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+
+    def _average_job(self) -> float:
+        return self._job_seconds if self._job_seconds is not None else DEFAULT_JOB_SECONDS
+
+    @staticmethod
+    def _retry_after(seconds: float) -> int:
+        # Whole seconds as the Retry-After header wants, and never "retry now"
+        return int(min(MAX_RETRY_AFTER, max(1, math.ceil(seconds))))
+
+    def stats(self) -> Dict[str, Any]:
+        depth = self.jobs.depth()
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                **self.rejected,
+                "queued": depth["queued"],
+                "running": depth["running"],
+                "mints_in_flight": self._mints,
+                "clients_with_jobs": len(self._client_jobs),
+                "average_job_seconds": self._job_seconds,
+                "max_queue": self.max_queue,
+                "max_client_jobs": self.max_client_jobs,
+                "max_mints": self.max_mints,
+                "limits": {name: limit._asdict() for name, limit in self.limits.items()},
+            }
+
+
+def _limit(prefix: str, per_minute: str, burst: str) -> Optional[RateLimit]:
+    rate = float(os.getenv(f"RATE_LIMIT_{prefix}_PER_MINUTE", per_minute))
+    if rate <= 0:
+        return None
+    return RateLimit(rate / 60.0, float(os.getenv(f"RATE_LIMIT_{prefix}_BURST", burst)))
+
+
+def create_admission(jobs: JobQueue) -> Optional[AdmissionController]:
+    """Build admission control from RATE_LIMIT_* / ADMISSION_*; ADMISSION_ENABLED=0 disables it."""
+    if os.getenv("ADMISSION_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    store_name = os.getenv("RATE_LIMIT_STORE", "memory").lower()
+    store_factory = BUCKET_STORES.get(store_name)
+    if store_factory is None:
+        raise ValueError(f"unknown RATE_LIMIT_STORE {store_name!r}; choose one of {sorted(BUCKET_STORES)}")
+    limits: Dict[str, RateLimit] = {}
+    for route_class, limit in (("deploy", _limit("DEPLOY", "10", "5")), ("mint", _limit("MINT", "120", "30"))):
+        if limit is not None:
+            limits[route_class] = limit
+    return AdmissionController(
+        jobs,
+        store_factory(),
+        limits,
+        max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "50")),
+        max_client_jobs=int(os.getenv("ADMISSION_MAX_JOBS_PER_CLIENT", "4")),
+        max_mints=int(os.getenv("ADMISSION_MAX_MINTS", "64")),
+        trust_proxy=os.getenv("RATE_LIMIT_TRUST_PROXY", "0").lower() in ("1", "true", "yes"),
+    )
+
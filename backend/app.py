@@ -1,291 +1,135 @@
-import logging
+import concurrent.futures
+import json
 import os
-import re
-import subprocess
-from time import sleep
-from typing import Any, Dict, Tuple
-import asyncio
-from dotenv import load_dotenv
-
-from flask import Flask, jsonify, request
-
-
-def create_app() -> Flask:
+import queue
+import time
+from typing import Any, Dict, Optional
+
+from flask import Flask, Response, g, jsonify, request, url_for
+
+from idempotency import IdempotencyConflict
+from job_events import STREAM_HEADERS, iter_events, render, resume_from, stream_format
+from jobs import Job
+from runtime import Runtime, create_runtime
+from starknet_client import MINT_TIMEOUT_GRACE
+from validation import (
+    ValidationError,
+    contract_code,
+    history_query,
+    mint_batch_params,
+    mint_params,
+    nft_params,
+    owner_param,
+    token_params,
+)
+
+
+def create_app(runtime: Optional[Runtime] = None) -> Flask:
     app = Flask(__name__)
-    # Load .env variables
-    load_dotenv()
-
-    # Configure basic logging; in production, hook into your centralized logger
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-    logging.basicConfig(level=getattr(logging, log_level, logging.INFO))
-    logger = logging.getLogger(__name__)
+    runtime = runtime or create_runtime()
+    metrics = runtime.metrics
+    jobs = runtime.jobs
+    app.extensions["metrics"] = metrics
+    app.extensions["jobs"] = jobs
+
+    @app.after_request
+    def _count_response(response):
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        metrics.http_requests_total.inc(route=route, status=response.status_code)
+        return response
+
+    @app.before_request
+    def _admit():
+        if runtime.admission is None or request.url_rule is None:
+            return None
+        g.client = runtime.admission.client(
+            request.headers.get("X-API-Key"), request.remote_addr, request.headers.get("X-Forwarded-For")
+        )
+        rejection = runtime.admit(request.url_rule.rule, g.client)
+        if rejection is not None:
+            response = jsonify(rejection.to_dict())
+            response.headers["Retry-After"] = str(rejection.retry_after)
+            return response, rejection.status
+        g.admitted_route = request.url_rule.rule
+        return None
+
+    @app.after_request
+    def _release_on_close(response):
+        # Streamed bodies are still being produced here; hold the slot until the server closes the response
+        route = g.pop("admitted_route", None)
+        if route is not None:
+            response.call_on_close(lambda: runtime.release(route))
+        return response
+
+    @app.teardown_request
+    def _release_on_error(_exc):
+        # Reached with the route still set only if no response was made
+        route = g.pop("admitted_route", None)
+        if route is not None:
+            runtime.release(route)
+
+    @app.errorhandler(ValidationError)
+    def _invalid_request(e: ValidationError):
+        return jsonify(e.to_dict()), 400
+
+    def _accepted(job: Job):
+        status_url = url_for("get_job", job_id=job.id)
+        events_url = url_for("job_events", job_id=job.id)
+        response = jsonify({"job_id": job.id, "status": job.status, "status_url": status_url, "events_url": events_url})
+        response.headers["Location"] = status_url
+        return response, 202
+
+    def _submit(kind: str, runner, params: Dict[str, Any], owner: Optional[str] = None):
+        """Submit a deploy job, or answer from the running/finished job of an identical request."""
+        try:
+            claim = runtime.submit(
+                kind, runner, params, request.headers.get("Idempotency-Key"), g.get("client"), {"owner": owner}
+            )
+        except IdempotencyConflict as e:
+            return jsonify({"error": str(e)}), 422
+        if claim.record is not None:
+            # Same body the job's status endpoint would show as its result
+            response = jsonify({**(claim.record["result"] or {}), "job_id": claim.record["job_id"], "deduplicated": True})
+            status = 200
+        else:
+            response, status = _accepted(claim.job)
+        if claim.reused:
+            response.headers["Idempotent-Replayed"] = "true"
+        return response, status
 
     @app.route("/create-token", methods=["POST"])
     def create_token():
         if not request.is_json:
             return jsonify({"error": "Expected application/json body"}), 400
 
-        payload: Dict[str, Any] = request.get_json(silent=True) or {}
-        name = payload.get("name")
-        symbol = payload.get("symbol")
-        max_token = payload.get("max_token")
-
-        # Basic type/format checks
-        if not isinstance(name, str) or not isinstance(symbol, str):
-            return jsonify({"error": "'name' and 'symbol' must be strings"}), 400
-        try:
-            max_token_int = int(max_token)
-            if max_token_int <= 0:
-                raise ValueError
-        except (TypeError, ValueError):
-            return jsonify({"error": "'max_token' must be a positive integer"}), 400
-
-        # Run deployment in the token-contract directory
-        token_contract_dir = os.path.join(os.path.dirname(__file__), "token-contract")
-        contract_src_path = os.path.join(token_contract_dir, "src", "erc20_token.cairo")
-
-        # Update constructor values in the Cairo source from request body
-        try:
-            with open(contract_src_path, "r", encoding="utf-8") as f:
-                cairo_src = f.read()
-
-            # Replace name and symbol (ByteArray string literals)
-            updated_src = re.sub(
-                r'let\s+name:\s*ByteArray\s*=\s*".*?";',
-                f'let name: ByteArray = "{name}";',
-                cairo_src,
-                count=1,
-            )
-            updated_src = re.sub(
-                r'let\s+symbol:\s*ByteArray\s*=\s*".*?";',
-                f'let symbol: ByteArray = "{symbol}";',
-                updated_src,
-                count=1,
-            )
-            # Decimals remains 18 by default; only change if provided
-            if "decimals" in payload and payload.get("decimals") is not None:
-                try:
-                    decimals_int = int(payload.get("decimals"))
-                except (TypeError, ValueError):
-                    return jsonify({"error": "'decimals' must be an integer"}), 400
-                updated_src = re.sub(
-                    r"let\s+decimals:\s*u8\s*=\s*\d+;",
-                    f"let decimals: u8 = {decimals_int};",
-                    updated_src,
-                    count=1,
-                )
-
-            # initial_supply from max_token
-            updated_src = re.sub(
-                r"let\s+initial_supply:\s*u256\s*=\s*\d+;",
-                f"let initial_supply: u256 = {max_token_int};",
-                updated_src,
-                count=1,
-            )
-
-            if updated_src == cairo_src:
-                return jsonify({
-                    "error": "contract source unchanged after edit",
-                    "hint": "Regex did not match current constructor lines. Please share current lines around constructor.",
-                    "path": contract_src_path
-                }), 400
-
-            with open(contract_src_path, "w", encoding="utf-8") as f:
-                f.write(updated_src)
-        except FileNotFoundError:
-            return jsonify({"error": "contract source not found", "path": contract_src_path}), 500
-        except OSError as e:
-            return jsonify({"error": "failed to update contract source", "details": str(e)}), 500
-
-        def run_cmd(command: str, cwd: str) -> Tuple[int, str, str]:
-            completed = subprocess.run(
-                command,
-                cwd=cwd,
-                shell=True,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            # Print full command outputs for diagnostics
-            logger.info("Command: %s", command)
-            if completed.stdout:
-                logger.info("STDOUT:\n%s", completed.stdout)
-            if completed.stderr:
-                logger.info("STDERR:\n%s", completed.stderr)
-            return completed.returncode, completed.stdout, completed.stderr
-
-        # 1) Build contracts
-        code, out, err = run_cmd("scarb build", cwd=token_contract_dir)
-        logger.info("scarb build -> code=%s", code)
-        if code != 0:
-            logger.error("scarb build failed: %s", err or out)
-            return jsonify({"error": "scarb build failed", "stdout": out, "stderr": err}), 500
-
-        # 2) Declare contract
-        declare_cmd = (
-            "sncast --account=sepolia declare --contract-name=MyToken --network=sepolia"
-        )
-        code, out, err = run_cmd(declare_cmd, cwd=token_contract_dir)
-        logger.info("declare -> code=%s", code)
-        if code != 0 and "already declared" not in (err + out):
-            logger.error("declare failed: %s", err or out)
-            return jsonify({"error": "declare failed", "stdout": out, "stderr": err}), 500
-
-        # Extract class hash from declare output
-        class_hash_match = re.search(r"Class Hash:\s*(0x[0-9a-fA-F]+)", out + "\n" + err)
-        if not class_hash_match:
-            # If already declared, we may need to parse the hash from the message itself; fall back to reading last hex in output
-            fallback_match = re.findall(r"0x[0-9a-fA-F]{10,}", out + "\n" + err)
-            class_hash = fallback_match[-1] if fallback_match else None
-        else:
-            class_hash = class_hash_match.group(1)
-
-        if not class_hash:
-            return jsonify({"error": "could not determine class hash from declare output", "stdout": out, "stderr": err}), 500
-        sleep(30)
-        # 3) Deploy contract
-        deploy_cmd = (
-            f"sncast --account=sepolia deploy --class-hash {class_hash} --salt 0x1 --network sepolia"
-        )
-        code, out, err = run_cmd(deploy_cmd, cwd=token_contract_dir)
-        logger.info("deploy -> code=%s", code)
-        if code != 0:
-            logger.error("deploy failed: %s", err or out)
-            return jsonify({"error": "deploy failed", "stdout": out, "stderr": err}), 500
-
-        # Parse contract address and transaction hash
-        address_match = re.search(r"Contract Address:\s*(0x[0-9a-fA-F]+)", out)
-        tx_hash_match = re.search(r"Transaction Hash:\s*(0x[0-9a-fA-F]+)", out)
-        contract_address = address_match.group(1) if address_match else None
-        transaction_hash = tx_hash_match.group(1) if tx_hash_match else None
-        if not contract_address or not transaction_hash:
-            return jsonify({"error": "could not parse deploy output", "stdout": out, "stderr": err}), 500
-
-        tx_url = f"https://sepolia.starkscan.co/tx/{transaction_hash}"
-
-        logger.info(
-            "Deployed token: name=%s, symbol=%s, max_token=%s, class_hash=%s, address=%s, tx=%s",
-            name,
-            symbol,
-            max_token_int,
-            class_hash,
-            contract_address,
-            transaction_hash,
+        body: Dict[str, Any] = request.get_json(silent=True) or {}
+        params = token_params(body)
+        return _submit(
+            "create-token",
+            lambda j: runtime.deployer.run_token_job(
+                j, params["name"], params["symbol"], params["max_token"], params["decimals"]
+            ),
+            params,
+            owner_param(body),
         )
 
-        return jsonify(
-            {
-                "name": name,
-                "symbol": symbol,
-                "max_token": max_token_int,
-                "class_hash": class_hash,
-                "contract_address": contract_address,
-                "transaction_hash": transaction_hash,
-                "transaction_url": tx_url,
-            }
-        ), 201
-
     @app.route("/deploy-contract", methods=["POST"])
     def deploy_contract():
         # Accept either JSON with { code: "..." } or raw text/plain body
+        owner = None
         if request.is_json:
             body: Dict[str, Any] = request.get_json(silent=True) or {}
-            cairo_code = body.get("code")
+            cairo_code = contract_code(body.get("code"), runtime.max_source_bytes)
+            owner = owner_param(body)
         else:
-            cairo_code = request.data.decode("utf-8") if request.data else None
-
-        if not cairo_code or not isinstance(cairo_code, str):
-            return jsonify({"error": "Provide Cairo code as JSON {code: string} or text/plain body"}), 400
-
-        project_dir = os.path.join(os.path.dirname(__file__), "contract-deployment")
-        src_path = os.path.join(project_dir, "src", "your_contract.cairo")
+            cairo_code = contract_code(request.data.decode("utf-8") if request.data else None, runtime.max_source_bytes)
 
-        try:
-            os.makedirs(os.path.dirname(src_path), exist_ok=True)
-            with open(src_path, "w", encoding="utf-8") as f:
-                f.write(cairo_code)
-        except OSError as e:
-            return jsonify({"error": "failed to write contract source", "details": str(e)}), 500
-
-        def run_cmd(command: str, cwd: str) -> Tuple[int, str, str]:
-            completed = subprocess.run(
-                command,
-                cwd=cwd,
-                shell=True,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            logger.info("Command: %s", command)
-            if completed.stdout:
-                logger.info("STDOUT:\n%s", completed.stdout)
-            if completed.stderr:
-                logger.info("STDERR:\n%s", completed.stderr)
-            return completed.returncode, completed.stdout, completed.stderr
-
-        # Build
-        code, out, err = run_cmd("scarb build", cwd=project_dir)
-        if code != 0:
-            return jsonify({"error": "scarb build failed", "stdout": out, "stderr": err}), 500
-
-        # Declare contract (assumes contract name YourContract in Scarb config)
-        declare_cmd = "sncast --account=sepolia declare --contract-name=YourContract --network=sepolia"
-        code, out, err = run_cmd(declare_cmd, cwd=project_dir)
-        if code != 0 and "already declared" not in (err + out):
-            return jsonify({"error": "declare failed", "stdout": out, "stderr": err}), 500
-
-        class_hash_match = re.search(r"Class Hash:\s*(0x[0-9a-fA-F]+)", out + "\n" + err)
-        if not class_hash_match:
-            # fallback: last long hex
-            fallback_match = re.findall(r"0x[0-9a-fA-F]{10,}", out + "\n" + err)
-            class_hash = fallback_match[-1] if fallback_match else None
-        else:
-            class_hash = class_hash_match.group(1)
-
-        if not class_hash:
-            return jsonify({"error": "could not determine class hash from declare output", "stdout": out, "stderr": err}), 500
-
-        sleep(30)
-        # Deploy
-        # Attempt to infer constructor arguments (ContractAddress) and pass zero addresses by default
-        try:
-            constructor_sig = re.search(r"#[\t ]*constructor\s*\n\s*fn\s+constructor\(([^)]*)\)", cairo_code)
-            calldata_parts = []
-            if constructor_sig:
-                params_text = constructor_sig.group(1)
-                # Remove the leading self param portion
-                params_text = re.sub(r"^\s*ref\s+self:\s*ContractState\s*,?\s*", "", params_text)
-                if params_text:
-                    # Count ContractAddress params and fill with 0x0
-                    contract_addr_count = len(re.findall(r":\s*ContractAddress\b", params_text))
-                    if contract_addr_count > 0:
-                        calldata_parts.extend(["0x0"] * contract_addr_count)
-            calldata_arg = f" --constructor-calldata {' '.join(calldata_parts)}" if calldata_parts else ""
-        except Exception:
-            calldata_arg = ""
-
-        deploy_cmd = f"sncast --account=sepolia deploy --class-hash {class_hash} --salt 0x1 --network sepolia{calldata_arg}"
-        code, out, err = run_cmd(deploy_cmd, cwd=project_dir)
-        if code != 0:
-            return jsonify({"error": "deploy failed", "stdout": out, "stderr": err}), 500
-
-        address_match = re.search(r"Contract Address:\s*(0x[0-9a-fA-F]+)", out)
-        tx_hash_match = re.search(r"Transaction Hash:\s*(0x[0-9a-fA-F]+)", out)
-        contract_address = address_match.group(1) if address_match else None
-        transaction_hash = tx_hash_match.group(1) if tx_hash_match else None
-        if not contract_address or not transaction_hash:
-            return jsonify({"error": "could not parse deploy output", "stdout": out, "stderr": err}), 500
-
-        tx_url = f"https://sepolia.starkscan.co/tx/{transaction_hash}"
-
-        return jsonify(
-            {
-                "class_hash": class_hash,
-                "contract_address": contract_address,
-                "transaction_hash": transaction_hash,
-                "transaction_url": tx_url,
-            }
-        ), 201
+        return _submit(
+            "deploy-contract",
+            lambda j: runtime.deployer.run_contract_job(j, cairo_code),
+            {"code": cairo_code},
+            owner,
+        )
 
     @app.route("/deploy-nft", methods=["POST"])
     def deploy_nft():
@@ -293,134 +137,89 @@ def create_app() -> Flask:
             return jsonify({"error": "Expected application/json body"}), 400
 
         body: Dict[str, Any] = request.get_json(silent=True) or {}
-        name = body.get("name")
-        symbol = body.get("symbol")
-        base_uri = body.get("base_uri")
-
-        if not isinstance(name, str) or not isinstance(symbol, str) or not isinstance(base_uri, str):
-            return jsonify({"error": "'name', 'symbol', and 'base_uri' must be strings"}), 400
-
-        # Owner will be hardcoded in contract; no owner in request is required
-
-        project_dir = os.path.join(os.path.dirname(__file__), "openzeppelin-nft")
-        contract_path = os.path.join(project_dir, "src", "your_collectible.cairo")
-
-        # Update constructor literals in your_collectible.cairo
-        try:
-            with open(contract_path, "r", encoding="utf-8") as f:
-                cairo_src = f.read()
-
-            updated_src = re.sub(
-                r'let\s+name:\s*ByteArray\s*=\s*".*?";',
-                f'let name: ByteArray = "{name}";',
-                cairo_src,
-                count=1,
-            )
-            updated_src = re.sub(
-                r'let\s+symbol:\s*ByteArray\s*=\s*".*?";',
-                f'let symbol: ByteArray = "{symbol}";',
-                updated_src,
-                count=1,
-            )
-
-            # Remove owner param from constructor signature
-            updated_src = re.sub(
-                r"fn\s+constructor\(ref\s+self:\s*ContractState\s*,\s*owner:\s*ContractAddress\)",
-                "fn constructor(ref self: ContractState)",
-                updated_src,
-                count=1,
-            )
-            # Hardcode owner before initializer
-            updated_src = re.sub(
-                r"self\.ownable\.initializer\(\s*owner\s*\);",
-                (
-                    "let owner: ContractAddress = "
-                    "0x04C23F4996013A9A52C78B9f5Ae4D116AC1cb70BB1ED36e193E2901C6479e626"
-                    ".try_into().unwrap();\n        self.ownable.initializer(owner);"
-                ),
-                updated_src,
-                count=1,
-            )
-            updated_src = re.sub(
-                r'let\s+base_uri:\s*ByteArray\s*=\s*".*?";',
-                f'let base_uri: ByteArray = "{base_uri}";',
-                updated_src,
-                count=1,
-            )
+        params = nft_params(body)
+        return _submit(
+            "deploy-nft",
+            lambda j: runtime.deployer.run_nft_job(j, params["name"], params["symbol"], params["base_uri"]),
+            params,
+            owner_param(body),
+        )
 
-            with open(contract_path, "w", encoding="utf-8") as f:
-                f.write(updated_src)
-        except FileNotFoundError:
-            return jsonify({"error": "contract source not found", "path": contract_path}), 500
-        except OSError as e:
-            return jsonify({"error": "failed to update contract source", "details": str(e)}), 500
-
-        def run_cmd(command: str, cwd: str) -> Tuple[int, str, str]:
-            completed = subprocess.run(
-                command,
-                cwd=cwd,
-                shell=True,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            logger.info("Command: %s", command)
-            if completed.stdout:
-                logger.info("STDOUT:\n%s", completed.stdout)
-            if completed.stderr:
-                logger.info("STDERR:\n%s", completed.stderr)
-            return completed.returncode, completed.stdout, completed.stderr
-
-        # Build the NFT project
-        code, out, err = run_cmd("scarb build", cwd=project_dir)
-        if code != 0:
-            return jsonify({"error": "scarb build failed", "stdout": out, "stderr": err}), 500
-
-        # Declare YourCollectible
-        declare_cmd = "sncast --account=sepolia declare --contract-name=YourCollectible --network=sepolia"
-        code, out, err = run_cmd(declare_cmd, cwd=project_dir)
-        if code != 0 and "already declared" not in (err + out):
-            return jsonify({"error": "declare failed", "stdout": out, "stderr": err}), 500
-
-        class_hash_match = re.search(r"Class Hash:\s*(0x[0-9a-fA-F]+)", out + "\n" + err)
-        if not class_hash_match:
-            fallback_match = re.findall(r"0x[0-9a-fA-F]{10,}", out + "\n" + err)
-            class_hash = fallback_match[-1] if fallback_match else None
-        else:
-            class_hash = class_hash_match.group(1)
-
-        if not class_hash:
-            return jsonify({"error": "could not determine class hash from declare output", "stdout": out, "stderr": err}), 500
-
-        # No constructor calldata required (owner hardcoded)
-        calldata_arg = ""
-
-        sleep(30)
-        deploy_cmd = f"sncast --account=sepolia deploy --class-hash {class_hash} --salt 0x1 --network sepolia{calldata_arg}"
-        code, out, err = run_cmd(deploy_cmd, cwd=project_dir)
-        if code != 0:
-            return jsonify({"error": "deploy failed", "stdout": out, "stderr": err}), 500
-
-        address_match = re.search(r"Contract Address:\s*(0x[0-9a-fA-F]+)", out)
-        tx_hash_match = re.search(r"Transaction Hash:\s*(0x[0-9a-fA-F]+)", out)
-        contract_address = address_match.group(1) if address_match else None
-        transaction_hash = tx_hash_match.group(1) if tx_hash_match else None
-        if not contract_address or not transaction_hash:
-            return jsonify({"error": "could not parse deploy output", "stdout": out, "stderr": err}), 500
-
-        tx_url = f"https://sepolia.starkscan.co/tx/{transaction_hash}"
-
-        return jsonify(
-            {
-                "name": name,
-                "symbol": symbol,
-                "base_uri": base_uri,
-                "class_hash": class_hash,
-                "contract_address": contract_address,
-                "transaction_hash": transaction_hash,
-                "transaction_url": tx_url,
-            }
-        ), 201
+    @app.route("/jobs/<job_id>", methods=["GET"])
+    def get_job(job_id: str):
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "job not found", "job_id": job_id}), 404
+        return jsonify(job.to_dict()), 200
+
+    @app.route("/jobs/<job_id>/events", methods=["GET"])
+    def job_events(job_id: str):
+        """Stream stage transitions and scarb/sncast output lines as SSE (default) or NDJSON."""
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "job not found", "job_id": job_id}), 404
+        mimetype = stream_format(request.args.get("format"), request.headers.get("Accept"))
+        since = resume_from(request.args.get("since"), request.headers.get("Last-Event-ID"))
+
+        def generate():
+            for event in iter_events(job, since, runtime.events_heartbeat):
+                yield render(event, mimetype)
+
+        return Response(generate(), mimetype=mimetype, headers=STREAM_HEADERS)
+
+    @app.route("/history", methods=["GET"])
+    def deployment_history():
+        """Recorded deploys and mints, newest first; filter by owner, symbol, contract_address, kind, since/until."""
+        if runtime.history is None:
+            return jsonify({"error": "deployment history is disabled", "hint": "Set HISTORY_ENABLED=1"}), 503
+        return jsonify(runtime.history.query(history_query(request.args))), 200
+
+    @app.route("/idempotency", methods=["GET"])
+    def idempotency_stats():
+        if runtime.dedup is None:
+            return jsonify({"enabled": False}), 200
+        return jsonify({"enabled": True, **runtime.dedup.stats()}), 200
+
+    @app.route("/admission", methods=["GET"])
+    def admission_stats():
+        if runtime.admission is None:
+            return jsonify({"enabled": False}), 200
+        return jsonify({"enabled": True, **runtime.admission.stats()}), 200
+
+    @app.route("/build-cache", methods=["GET"])
+    def build_cache_stats():
+        if runtime.build_cache is None:
+            return jsonify({"enabled": False}), 200
+        return jsonify({"enabled": True, **runtime.build_cache.stats()}), 200
+
+    def _mint_pool():
+        """Return (pool, None), or (None, error response) if minting is not configured."""
+        pool, error = runtime.mint_pool()
+        if pool is None:
+            body, status = error
+            return None, (jsonify(body), status)
+        return pool, None
+
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    @app.route("/debug/command-output", methods=["GET"])
+    def command_output():
+        limit = request.args.get("limit", type=int)
+        return jsonify(metrics.outputs.snapshot(limit)), 200
+
+    @app.route("/network", methods=["GET"])
+    def network_info():
+        return jsonify(runtime.network_info()), 200
+
+    @app.route("/toolchain", methods=["GET"])
+    def toolchain_stats():
+        return jsonify(runtime.toolchain.stats()), 200
+
+    @app.route("/signers", methods=["GET"])
+    def signer_stats():
+        return jsonify(runtime.signers.stats()), 200
 
     @app.route("/mint-nft", methods=["POST"])
     def mint_nft():
@@ -428,87 +227,100 @@ def create_app() -> Flask:
             return jsonify({"error": "Expected application/json body"}), 400
 
         body: Dict[str, Any] = request.get_json(silent=True) or {}
-        contract_address = body.get("contract_address")
-        recipient = body.get("recipient")
-        uri = body.get("uri")
-
-        if not isinstance(contract_address, str) or not contract_address.startswith("0x"):
-            return jsonify({"error": "'contract_address' must be a hex string"}), 400
-        if not isinstance(recipient, str) or not recipient.startswith("0x"):
-            return jsonify({"error": "'recipient' must be a hex string"}), 400
-        if not isinstance(uri, str) or not uri:
-            return jsonify({"error": "'uri' must be a non-empty string"}), 400
-
-        rpc_url = os.getenv("STARKNET_RPC")
-        account_address = os.getenv("STARKNET_ACCOUNT_ADDRESS")
-        private_key_hex = os.getenv("STARKNET_PRIVATE_KEY")
-        chain_id_env = ("SEPOLIA").upper()
-
-        if not rpc_url or not account_address or not private_key_hex:
-            return jsonify({
-                "error": "missing starknet credentials",
-                "hint": "Set STARKNET_RPC, STARKNET_ACCOUNT_ADDRESS, STARKNET_PRIVATE_KEY, optional STARKNET_CHAIN_ID",
-            }), 400
+        mint = mint_params(body)
+        pool, error_response = _mint_pool()
+        if pool is None:
+            return error_response
 
+        # Opt-in fire-and-forget: answer as soon as the tx hash is known
+        wait = mint["wait"] and request.args.get("wait") != "0"
+
+        # Runs on the shared event loop, reusing the pool's client, account and cached Contract
+        started = time.perf_counter()
         try:
-            from starknet_py.net.full_node_client import FullNodeClient
-            from starknet_py.net.account.account import Account
-            from starknet_py.contract import Contract
-            from starknet_py.net.client_errors import ClientError
-            from starknet_py.net.signer.stark_curve_signer import KeyPair
-            from starknet_py.net.models import StarknetChainId
-        except Exception as e:
-            return jsonify({
-                "error": "starknet_py not available",
-                "details": str(e),
-                "hint": "pip install starknet-py",
-            }), 500
-
-        chain_id = StarknetChainId.SEPOLIA if chain_id_env == "SEPOLIA" else (
-            StarknetChainId.MAINNET if chain_id_env == "MAINNET" else StarknetChainId.SEPOLIA
-        )
+            result = pool.run(pool.mint(
+                mint["contract_address"],
+                mint["recipient"],
+                mint["uri"],
+                wait=wait,
+                callback_url=mint["callback_url"],
+                on_settled=runtime.mint_confirmed,
+                timeout=pool.timeout,
+            ), timeout=pool.timeout + MINT_TIMEOUT_GRACE)
+        except concurrent.futures.TimeoutError:
+            # Still waiting for a signer; the mint tracks its tx itself if it is sent later
+            result = {"ok": False, "timed_out": True, "error": f"not sent within {pool.timeout:g}s"}
+        response_body, status = runtime.mint_finished(mint, result, started, wait)
+        if status == 504 and "transaction_hash" in response_body:
+            response_body["status_url"] = url_for("mint_status", tx_hash=response_body["transaction_hash"])
+        if status != 200 or wait:
+            return jsonify(response_body), status
+
+        status_url = url_for("mint_status", tx_hash=result["transaction_hash"])
+        response = jsonify({**response_body, "status": result["status"], "status_url": status_url})
+        response.headers["Location"] = status_url
+        return response, 202
+
+    @app.route("/mint-nft/status/<tx_hash>", methods=["GET"])
+    def mint_status(tx_hash: str):
+        pool, error_response = _mint_pool()
+        if pool is None:
+            return error_response
+        record = pool.tracker.get(tx_hash)
+        if record is None:
+            return jsonify({"error": "transaction not tracked", "transaction_hash": tx_hash}), 404
+        return jsonify(record), 200
+
+    @app.route("/mint-nft/batch", methods=["POST"])
+    def mint_nft_batch():
+        if not request.is_json:
+            return jsonify({"error": "Expected application/json body"}), 400
 
-        async def _mint_async() -> Dict[str, Any]:
-            client = FullNodeClient(node_url=rpc_url)
-            account = Account(
-                address=int(account_address, 16),
-                client=client,
-                key_pair=KeyPair.from_private_key(int(private_key_hex, 16)),
-                chain=chain_id,
-            )
-            contract = await Contract.from_address(address=int(contract_address, 16), provider=account)
+        body: Dict[str, Any] = request.get_json(silent=True) or {}
+        stream = bool(body.get("stream")) or request.args.get("stream") == "1"
+        contract_address, pairs, batch_size = mint_batch_params(body, runtime.default_batch_size, runtime.max_batch_items)
 
+        pool, error_response = _mint_pool()
+        if pool is None:
+            return error_response
+
+        if not stream:
+            started = time.perf_counter()
             try:
-                sent = await contract.functions["mint_item"].invoke_v3(
-                    recipient=int(recipient, 16),
-                    uri=uri,
-                    auto_estimate=True,
-                )
-                # Wait for confirmation
-                await account.client.wait_for_tx(sent.hash)
-            except ClientError as ce:
-                return {"ok": False, "error": str(ce)}
+                # Large airdrops can outlast the pool's default timeout, so wait on the future directly
+                results = pool.submit(pool.mint_batch(contract_address, pairs, batch_size)).result()
             except Exception as e:  # noqa: BLE001
-                return {"ok": False, "error": str(e)}
-
-            return {
-                "ok": True,
-                "transaction_hash": hex(sent.hash),
-            }
-
-        result = asyncio.run(_mint_async())
-        if not result.get("ok"):
-            return jsonify({"error": "mint failed", "details": result.get("error")}), 500
-
-        tx_hash = result["transaction_hash"]
-        tx_url = f"https://sepolia.starkscan.co/tx/{tx_hash}"
-        return jsonify({
-            "contract_address": contract_address,
-            "recipient": recipient,
-            "uri": uri,
-            "transaction_hash": tx_hash,
-            "transaction_url": tx_url,
-        }), 200
+                runtime.batch_finished(0, 1, None)
+                return jsonify({"error": "mint failed", "details": str(e)}), 500
+            runtime.mints_settled(contract_address, results)
+            summary = runtime.batch_summary(contract_address, batch_size, results)
+            runtime.batch_finished(summary["succeeded"], summary["failed"], started)
+            return jsonify(summary), 200
+
+        # Stream one NDJSON line per item as each batch settles, then a summary line
+        settled: "queue.Queue[Any]" = queue.Queue()
+        started = time.perf_counter()
+        future = pool.submit(pool.mint_batch(contract_address, pairs, batch_size, on_batch=settled.put))
+        future.add_done_callback(lambda _f: settled.put(None))
+
+        def generate():
+            succeeded = failed = 0
+            while True:
+                batch = settled.get()
+                if batch is None:
+                    break
+                runtime.mints_settled(contract_address, batch)
+                for result in batch:
+                    succeeded += result["ok"]
+                    failed += not result["ok"]
+                    yield json.dumps(result) + "\n"
+            runtime.batch_finished(succeeded, failed, started)
+            summary: Dict[str, Any] = {"done": True, "succeeded": succeeded, "failed": failed}
+            if future.exception() is not None:
+                summary["error"] = str(future.exception())
+            yield json.dumps(summary) + "\n"
+
+        return Response(generate(), mimetype="application/x-ndjson")
 
     return app
 
@@ -517,6 +329,6 @@ app = create_app()
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
-
-
+    # The Werkzeug debugger runs arbitrary code for whoever reaches it; keep it to local development
+    debug = os.getenv("FLASK_DEBUG", "0").lower() not in ("0", "false", "no")
+    app.run(host=os.getenv("HOST", "0.0.0.0"), port=int(os.getenv("PORT", "5000")), debug=debug)
@@ -0,0 +1,380 @@
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+from event_loop import use_loop
+from idempotency import IdempotencyConflict
+from job_events import STREAM_HEADERS, aiter_events, render, resume_from, stream_format
+from jobs import Job
+from runtime import Runtime, create_runtime
+from starknet_client import MINT_TIMEOUT_GRACE
+from validation import (
+    ValidationError,
+    contract_code,
+    history_query,
+    mint_batch_params,
+    mint_params,
+    nft_params,
+    owner_param,
+    token_params,
+)
+
+# /mint-nft/batch bodies with MINT_BATCH_MAX_ITEMS items exceed aiohttp's 1 MiB default
+MAX_REQUEST_BYTES = 32 * 1024 * 1024
+
+
+def _json(body: Any, status: int = 200) -> web.Response:
+    return web.json_response(body, status=status)
+
+
+def _is_json(request: web.Request) -> bool:
+    # Same rule as Flask's request.is_json
+    return request.content_type == "application/json" or request.content_type.endswith("+json")
+
+
+async def _json_body(request: web.Request) -> Dict[str, Any]:
+    try:
+        body = await request.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def _route_label(request: web.Request) -> str:
+    # Label routes like Flask's url_rule ("/jobs/<job_id>") so metrics match across servers
+    resource = request.match_info.route.resource
+    if resource is None:
+        return "unmatched"
+    return re.sub(r"\{(\w+)\}", r"<\1>", resource.canonical)
+
+
+def create_async_app(runtime: Optional[Runtime] = None) -> web.Application:
+    """The deploy and mint API as an aiohttp application, route for route the same as app.py.
+
+    Handlers run on the shared event loop together with the deploy pipeline,
+    the scarb/sncast subprocesses and every RPC call, so a slow build or a
+    pending mint occupies no thread.
+    """
+    runtime = runtime or create_runtime()
+    metrics = runtime.metrics
+    jobs = runtime.jobs
+    routes = web.RouteTableDef()
+
+    @web.middleware
+    async def _admit(request: web.Request, handler: Any) -> web.StreamResponse:
+        if runtime.admission is None:
+            return await handler(request)
+        request["client"] = runtime.admission.client(
+            request.headers.get("X-API-Key"), request.remote, request.headers.get("X-Forwarded-For")
+        )
+        route = _route_label(request)
+        rejection = runtime.admit(route, request["client"])
+        if rejection is not None:
+            response = _json(rejection.to_dict(), rejection.status)
+            response.headers["Retry-After"] = str(rejection.retry_after)
+            return response
+        try:
+            # Streaming handlers return only once the body is written, so the slot covers the stream
+            return await handler(request)
+        finally:
+            runtime.release(route)
+
+    @web.middleware
+    async def _observe(request: web.Request, handler: Any) -> web.StreamResponse:
+        try:
+            response = await handler(request)
+        except ValidationError as e:
+            response = _json(e.to_dict(), 400)
+        except web.HTTPException as e:
+            metrics.http_requests_total.inc(route=_route_label(request), status=e.status)
+            raise
+        metrics.http_requests_total.inc(route=_route_label(request), status=response.status)
+        return response
+
+    def _accepted(request: web.Request, job: Job) -> web.Response:
+        status_url = str(request.app.router["get_job"].url_for(job_id=job.id))
+        events_url = str(request.app.router["job_events"].url_for(job_id=job.id))
+        response = _json({"job_id": job.id, "status": job.status, "status_url": status_url, "events_url": events_url}, 202)
+        response.headers["Location"] = status_url
+        return response
+
+    def _submit(
+        request: web.Request, kind: str, runner: Any, params: Dict[str, Any], owner: Optional[str] = None
+    ) -> web.Response:
+        """Submit a deploy job, or answer from the running/finished job of an identical request."""
+        try:
+            claim = runtime.submit(
+                kind, runner, params, request.headers.get("Idempotency-Key"), request.get("client"), {"owner": owner}
+            )
+        except IdempotencyConflict as e:
+            return _json({"error": str(e)}, 422)
+        if claim.record is not None:
+            # Same body the job's status endpoint would show as its result
+            response = _json({**(claim.record["result"] or {}), "job_id": claim.record["job_id"], "deduplicated": True})
+        else:
+            response = _accepted(request, claim.job)
+        if claim.reused:
+            response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+    def _mint_pool() -> Any:
+        """Return (pool, None), or (None, error response) if minting is not configured."""
+        pool, error = runtime.mint_pool()
+        if pool is None:
+            body, status = error
+            return None, _json(body, status)
+        return pool, None
+
+    @routes.post("/create-token")
+    async def create_token(request: web.Request) -> web.Response:
+        if not _is_json(request):
+            return _json({"error": "Expected application/json body"}, 400)
+
+        body = await _json_body(request)
+        params = token_params(body)
+        return _submit(
+            request,
+            "create-token",
+            lambda j: runtime.deployer.run_token_job(
+                j, params["name"], params["symbol"], params["max_token"], params["decimals"]
+            ),
+            params,
+            owner_param(body),
+        )
+
+    @routes.post("/deploy-contract")
+    async def deploy_contract(request: web.Request) -> web.Response:
+        # Accept either JSON with { code: "..." } or raw text/plain body
+        owner = None
+        if _is_json(request):
+            body = await _json_body(request)
+            cairo_code = contract_code(body.get("code"), runtime.max_source_bytes)
+            owner = owner_param(body)
+        else:
+            cairo_code = contract_code(await request.text() if request.can_read_body else None, runtime.max_source_bytes)
+
+        return _submit(
+            request,
+            "deploy-contract",
+            lambda j: runtime.deployer.run_contract_job(j, cairo_code),
+            {"code": cairo_code},
+            owner,
+        )
+
+    @routes.post("/deploy-nft")
+    async def deploy_nft(request: web.Request) -> web.Response:
+        if not _is_json(request):
+            return _json({"error": "Expected application/json body"}, 400)
+
+        body = await _json_body(request)
+        params = nft_params(body)
+        return _submit(
+            request,
+            "deploy-nft",
+            lambda j: runtime.deployer.run_nft_job(j, params["name"], params["symbol"], params["base_uri"]),
+            params,
+            owner_param(body),
+        )
+
+    @routes.get("/jobs/{job_id}", name="get_job")
+    async def get_job(request: web.Request) -> web.Response:
+        job_id = request.match_info["job_id"]
+        job = jobs.get(job_id)
+        if job is None:
+            return _json({"error": "job not found", "job_id": job_id}, 404)
+        return _json(job.to_dict())
+
+    @routes.get("/jobs/{job_id}/events", name="job_events")
+    async def job_events(request: web.Request) -> web.StreamResponse:
+        """Stream stage transitions and scarb/sncast output lines as SSE (default) or NDJSON."""
+        job_id = request.match_info["job_id"]
+        job = jobs.get(job_id)
+        if job is None:
+            return _json({"error": "job not found", "job_id": job_id}, 404)
+        mimetype = stream_format(request.query.get("format"), request.headers.get("Accept"))
+        since = resume_from(request.query.get("since"), request.headers.get("Last-Event-ID"))
+
+        response = web.StreamResponse(headers={"Content-Type": mimetype, **STREAM_HEADERS})
+        await response.prepare(request)
+        async for event in aiter_events(job, since, runtime.events_heartbeat):
+            await response.write(render(event, mimetype).encode())
+        await response.write_eof()
+        return response
+
+    @routes.get("/history")
+    async def deployment_history(request: web.Request) -> web.Response:
+        """Recorded deploys and mints, newest first; filter by owner, symbol, contract_address, kind, since/until."""
+        if runtime.history is None:
+            return _json({"error": "deployment history is disabled", "hint": "Set HISTORY_ENABLED=1"}, 503)
+        query = history_query(request.query)
+        # A query may flush buffered writes first; keep SQLite off the event loop
+        return _json(await asyncio.to_thread(runtime.history.query, query))
+
+    @routes.get("/idempotency")
+    async def idempotency_stats(request: web.Request) -> web.Response:
+        if runtime.dedup is None:
+            return _json({"enabled": False})
+        return _json({"enabled": True, **runtime.dedup.stats()})
+
+    @routes.get("/admission")
+    async def admission_stats(request: web.Request) -> web.Response:
+        if runtime.admission is None:
+            return _json({"enabled": False})
+        return _json({"enabled": True, **runtime.admission.stats()})
+
+    @routes.get("/build-cache")
+    async def build_cache_stats(request: web.Request) -> web.Response:
+        if runtime.build_cache is None:
+            return _json({"enabled": False})
+        return _json({"enabled": True, **runtime.build_cache.stats()})
+
+    @routes.get("/metrics")
+    async def prometheus_metrics(request: web.Request) -> web.Response:
+        return web.Response(text=metrics.render(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    @routes.get("/debug/command-output")
+    async def command_output(request: web.Request) -> web.Response:
+        try:
+            limit = int(request.query["limit"]) if "limit" in request.query else None
+        except ValueError:
+            limit = None
+        return _json(metrics.outputs.snapshot(limit))
+
+    @routes.get("/network")
+    async def network_info(request: web.Request) -> web.Response:
+        return _json(runtime.network_info())
+
+    @routes.get("/toolchain")
+    async def toolchain_stats(request: web.Request) -> web.Response:
+        return _json(runtime.toolchain.stats())
+
+    @routes.get("/signers")
+    async def signer_stats(request: web.Request) -> web.Response:
+        return _json(runtime.signers.stats())
+
+    @routes.post("/mint-nft")
+    async def mint_nft(request: web.Request) -> web.Response:
+        if not _is_json(request):
+            return _json({"error": "Expected application/json body"}, 400)
+
+        body = await _json_body(request)
+        # Resolves the callback host
+        mint = await asyncio.to_thread(mint_params, body)
+        pool, error_response = _mint_pool()
+        if pool is None:
+            return error_response
+
+        # Opt-in fire-and-forget: answer as soon as the tx hash is known
+        wait = mint["wait"] and request.query.get("wait") != "0"
+
+        started = time.perf_counter()
+        minting = pool.mint(
+            mint["contract_address"],
+            mint["recipient"],
+            mint["uri"],
+            wait=wait,
+            callback_url=mint["callback_url"],
+            on_settled=runtime.mint_confirmed,
+            timeout=pool.timeout,
+        )
+        try:
+            # Shielded: a mint still waiting for a signer carries on, and tracks its tx itself once sent
+            result = await asyncio.wait_for(asyncio.shield(minting), pool.timeout + MINT_TIMEOUT_GRACE)
+        except asyncio.TimeoutError:
+            result = {"ok": False, "timed_out": True, "error": f"not sent within {pool.timeout:g}s"}
+        response_body, status = runtime.mint_finished(mint, result, started, wait)
+        if status == 504 and "transaction_hash" in response_body:
+            tx_hash = response_body["transaction_hash"]
+            response_body["status_url"] = str(request.app.router["mint_status"].url_for(tx_hash=tx_hash))
+        if status != 200 or wait:
+            return _json(response_body, status)
+
+        status_url = str(request.app.router["mint_status"].url_for(tx_hash=result["transaction_hash"]))
+        response = _json({**response_body, "status": result["status"], "status_url": status_url}, 202)
+        response.headers["Location"] = status_url
+        return response
+
+    @routes.get("/mint-nft/status/{tx_hash}", name="mint_status")
+    async def mint_status(request: web.Request) -> web.Response:
+        tx_hash = request.match_info["tx_hash"]
+        pool, error_response = _mint_pool()
+        if pool is None:
+            return error_response
+        record = pool.tracker.get(tx_hash)
+        if record is None:
+            return _json({"error": "transaction not tracked", "transaction_hash": tx_hash}, 404)
+        return _json(record)
+
+    @routes.post("/mint-nft/batch")
+    async def mint_nft_batch(request: web.Request) -> web.StreamResponse:
+        if not _is_json(request):
+            return _json({"error": "Expected application/json body"}, 400)
+
+        body = await _json_body(request)
+        stream = bool(body.get("stream")) or request.query.get("stream") == "1"
+        contract_address, pairs, batch_size = mint_batch_params(body, runtime.default_batch_size, runtime.max_batch_items)
+
+        pool, error_response = _mint_pool()
+        if pool is None:
+            return error_response
+
+        if not stream:
+            started = time.perf_counter()
+            try:
+                results = await pool.mint_batch(contract_address, pairs, batch_size)
+            except Exception as e:  # noqa: BLE001
+                runtime.batch_finished(0, 1, None)
+                return _json({"error": "mint failed", "details": str(e)}, 500)
+            runtime.mints_settled(contract_address, results)
+            summary = runtime.batch_summary(contract_address, batch_size, results)
+            runtime.batch_finished(summary["succeeded"], summary["failed"], started)
+            return _json(summary)
+
+        # Stream one NDJSON line per item as each batch settles, then a summary line
+        settled: "asyncio.Queue[Any]" = asyncio.Queue()
+        started = time.perf_counter()
+        # A task of its own, so the batch still finishes if the client goes away
+        task = asyncio.ensure_future(pool.mint_batch(contract_address, pairs, batch_size, on_batch=settled.put_nowait))
+        task.add_done_callback(lambda _t: settled.put_nowait(None))
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        succeeded = failed = 0
+        while True:
+            batch = await settled.get()
+            if batch is None:
+                break
+            runtime.mints_settled(contract_address, batch)
+            for result in batch:
+                succeeded += result["ok"]
+                failed += not result["ok"]
+                await response.write((json.dumps(result) + "\n").encode())
+        runtime.batch_finished(succeeded, failed, started)
+        summary: Dict[str, Any] = {"done": True, "succeeded": succeeded, "failed": failed}
+        if task.exception() is not None:
+            summary["error"] = str(task.exception())
+        await response.write((json.dumps(summary) + "\n").encode())
+        await response.write_eof()
+        return response
+
+    app = web.Application(middlewares=[_observe, _admit], client_max_size=MAX_REQUEST_BYTES)
+    app.add_routes(routes)
+    return app
+
+
+def main() -> None:
+    # The server's loop is the shared loop: jobs, subprocesses and RPC calls all run on it
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    use_loop(loop)
+    app = create_async_app()
+    web.run_app(app, host=os.getenv("HOST", "0.0.0.0"), port=int(os.getenv("PORT", "5000")), loop=loop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Measure the deployment history store: batched writes and indexed lookups.
+
+Fills a scratch HistoryStore with ``--rows`` deploys and mints spread over
+``--owners`` wallets and ``--contracts`` collections, comparing the batched
+writer with committing each row on its own, then times the lookups GET
+/history serves (by owner, symbol, contract address, time range, and the
+next page of each) and prints the plan SQLite picks for them:
+
+    python benchmarks/bench_history.py --rows 200000 --queries 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import HistoryQuery, HistoryStore, parse_cursor  # noqa: E402
+
+
+def _address(rng: random.Random) -> str:
+    return hex(rng.getrandbits(251))
+
+
+def _fill(store: HistoryStore, rows: int, owners: List[str], contracts: List[str], rng: random.Random) -> None:
+    for i in range(rows):
+        contract = rng.choice(contracts)
+        if i % 10 == 0:
+            symbol = f"SYM{contracts.index(contract)}"
+            store.record(
+                "deploy-nft",
+                {"name": f"Collection {symbol}", "symbol": symbol, "base_uri": "ipfs://x/"},
+                {"contract_address": contract, "class_hash": _address(rng), "transaction_hash": _address(rng)},
+                owner=rng.choice(owners),
+                stages={"build": 1.2, "declare": 3.4, "deploy": 2.1},
+                duration=6.7,
+            )
+        else:
+            recipient = rng.choice(owners)
+            store.record(
+                "mint-nft",
+                {"contract_address": contract, "recipient": recipient, "uri": str(i)},
+                {"transaction_hash": _address(rng)},
+                owner=recipient,
+                duration=0.8,
+            )
+        if len(store._pending) >= store.batch_size:
+            store.flush()
+    store.flush()
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50": statistics.median(ordered),
+        "p95": ordered[int(len(ordered) * 0.95) - 1],
+        "max": ordered[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--owners", type=int, default=2000)
+    parser.add_argument("--contracts", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=1000, help="timed lookups per query shape")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--unbatched-rows", type=int, default=2000, help="rows committed one at a time for comparison")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    owners = [_address(rng) for _ in range(args.owners)]
+    contracts = [_address(rng) for _ in range(args.contracts)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        unbatched = HistoryStore(os.path.join(tmp, "unbatched.sqlite3"), "bench", batch_size=1, flush_interval=60)
+        started = time.perf_counter()
+        _fill(unbatched, args.unbatched_rows, owners, contracts, rng)
+        unbatched_rate = args.unbatched_rows / (time.perf_counter() - started)
+
+        store = HistoryStore(os.path.join(tmp, "history.sqlite3"), "bench", batch_size=args.batch_size, flush_interval=60)
+        started = time.perf_counter()
+        _fill(store, args.rows, owners, contracts, rng)
+        batched_rate = args.rows / (time.perf_counter() - started)
+        print(f"writes: {batched_rate:,.0f} rows/s in batches of {args.batch_size}, "
+              f"{unbatched_rate:,.0f} rows/s committing each row ({batched_rate / unbatched_rate:.1f}x)")
+
+        conn = store._conn()
+        oldest, newest = conn.execute("SELECT MIN(recorded_at), MAX(recorded_at) FROM history").fetchone()
+        shapes: Dict[str, Callable[[], HistoryQuery]] = {
+            "owner": lambda: HistoryQuery(owner=rng.choice(owners)),
+            "symbol": lambda: HistoryQuery(symbol=f"SYM{rng.randrange(args.contracts)}"),
+            "contract": lambda: HistoryQuery(contract_address=rng.choice(contracts)),
+            "time range": lambda: HistoryQuery(since=rng.uniform(oldest, newest), until=newest),
+            "kind+owner": lambda: HistoryQuery(owner=rng.choice(owners), kind="deploy-nft"),
+            "owner+range": lambda: HistoryQuery(owner=rng.choice(owners), since=rng.uniform(oldest, newest)),
+        }
+        print(f"{args.rows:,} rows, {args.queries} lookups per shape, page size 50")
+        print(f"{'query':<14}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'page 2 p50':>12}")
+        for label, make in shapes.items():
+            first: List[float] = []
+            second: List[float] = []
+            for _ in range(args.queries):
+                query = make()
+                started = time.perf_counter()
+                page = store.query(query)
+                first.append((time.perf_counter() - started) * 1000)
+                if page["next_cursor"] is not None:
+                    started = time.perf_counter()
+                    store.query(query._replace(cursor=parse_cursor(page["next_cursor"])))
+                    second.append((time.perf_counter() - started) * 1000)
+            stats = _summary(first)
+            page_two = f"{statistics.median(second):>12.3f}" if second else f"{'-':>12}"
+            print(f"{label:<14}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['max']:>10.3f}{page_two}")
+
+        print("plans:")
+        for label, make in shapes.items():
+            sql, sql_args = store._select(make())
+            plan = conn.execute("EXPLAIN QUERY PLAN " + sql, sql_args).fetchall()
+            print(f"  {label:<12} " + "; ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Load-test the deploy and mint routes and report throughput and per-stage latency.
+
+By default the service runs in-process on an ephemeral port with
+STARKNET_NETWORK=fake, so scarb, sncast and the node are simulated and no
+devnet or testnet funds are needed; the --*-ms flags set the simulated
+latencies, and --server picks the Flask app or the async (aiohttp) one.
+Point --url at a running server (for example one started with
+STARKNET_NETWORK=devnet) to drive that instead:
+
+    python benchmarks/bench_load.py --requests 40 --concurrency 16
+    python benchmarks/bench_load.py --server async --requests 200 --concurrency 64
+    python benchmarks/bench_load.py --server async --requests 200 --concurrency 64 --accounts 8
+    python benchmarks/bench_load.py --url http://127.0.0.1:5000 --routes create-token,mint-nft
+
+Each deploy request is followed to completion through its status_url; stage
+timings come from the job's recorded stages plus its time in the queue.
+Payloads are unique per run so request deduplication does not short-circuit.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+ROUTES = ("create-token", "deploy-nft", "deploy-contract", "mint-nft")
+
+
+class Sample(NamedTuple):
+    route: str
+    ok: bool
+    seconds: float
+    stages: Dict[str, float]
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+
+def _request(method: str, url: str, body: Optional[Dict[str, Any]] = None, timeout: float = 300.0) -> Tuple[int, Any]:
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, json.loads(resp.read() or b"null")
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        try:
+            return e.code, json.loads(payload)
+        except ValueError:
+            return e.code, {"error": payload.decode(errors="replace")}
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    # Nearest-rank percentile on pre-sorted samples
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _run_deploy(base_url: str, route: str, body: Dict[str, Any], poll_interval: float, job_timeout: float) -> Sample:
+    started = time.perf_counter()
+    status, reply = _request("POST", f"{base_url}/{route}", body)
+    if status == 200:
+        # Replayed from a finished identical request; nothing ran
+        return Sample(route, True, time.perf_counter() - started, {}, result=reply)
+    if status != 202:
+        return Sample(route, False, time.perf_counter() - started, {}, f"HTTP {status}: {reply}")
+
+    deadline = time.monotonic() + job_timeout
+    while True:
+        time.sleep(poll_interval)
+        status, job = _request("GET", base_url + reply["status_url"])
+        if status == 200 and job["status"] in ("succeeded", "failed"):
+            break
+        if time.monotonic() > deadline:
+            return Sample(route, False, time.perf_counter() - started, {}, "timed out waiting for job")
+    seconds = time.perf_counter() - started
+
+    stages = {"queue": job["started_at"] - job["created_at"]}
+    for stage in job["stages"]:
+        if stage.get("finished_at") is not None:
+            stages[stage["name"]] = stages.get(stage["name"], 0.0) + stage["finished_at"] - stage["started_at"]
+    error = None if job["status"] == "succeeded" else (job.get("error") or {}).get("error", "failed")
+    return Sample(route, job["status"] == "succeeded", seconds, stages, error, job.get("result"))
+
+
+def _run_mint(base_url: str, body: Dict[str, Any]) -> Sample:
+    started = time.perf_counter()
+    status, reply = _request("POST", f"{base_url}/mint-nft", body)
+    seconds = time.perf_counter() - started
+    if status != 200:
+        return Sample("mint-nft", False, seconds, {}, f"HTTP {status}: {reply}")
+    return Sample("mint-nft", True, seconds, {"mint_invoke": seconds})
+
+
+def _start_in_process_server(args: argparse.Namespace, scratch: str) -> Tuple[str, Callable[[], None]]:
+    latencies = {
+        "FAKENET_BUILD_LATENCY": args.build_ms,
+        "FAKENET_DECLARE_LATENCY": args.declare_ms,
+        "FAKENET_DEPLOY_LATENCY": args.deploy_ms,
+        "FAKENET_INVOKE_LATENCY": args.invoke_ms,
+        "FAKENET_ACCEPT_LATENCY": args.accept_ms,
+    }
+    for key, ms in latencies.items():
+        os.environ[key] = str(ms / 1000)
+    os.environ["STARKNET_NETWORK"] = "fake"
+    os.environ.setdefault("FAKENET_JITTER", str(args.jitter))
+    os.environ.setdefault("FAKENET_ACCOUNTS", str(args.accounts))
+    os.environ.setdefault("JOB_CONCURRENCY", str(args.concurrency))
+    os.environ.setdefault("WORKSPACES_ENABLED", "1")
+    os.environ.setdefault("WORKSPACE_ROOT", os.path.join(scratch, "workspaces"))
+    os.environ.setdefault("BUILD_CACHE_DIR", os.path.join(scratch, "build-cache"))
+    os.environ.setdefault("HISTORY_PATH", os.path.join(scratch, "history.sqlite3"))
+    os.environ.setdefault("DECLARE_WAIT_INITIAL_DELAY", "0.05")
+    os.environ.setdefault("DECLARE_WAIT_MAX_DELAY", "0.5")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Every simulated client shares one IP; measure the pipeline, not the rate limiter
+    os.environ.setdefault("ADMISSION_ENABLED", "0")
+    if args.server == "async":
+        os.environ.setdefault("JOB_BACKEND", "asyncio")
+        return _start_async_server()
+
+    from werkzeug.serving import make_server
+
+    from app import create_app
+
+    # werkzeug logs every request at INFO regardless of LOG_LEVEL
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name="bench-server", daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+
+def _start_async_server() -> Tuple[str, Callable[[], None]]:
+    from aiohttp import web
+
+    from async_app import create_async_app
+    from event_loop import use_loop
+
+    loop = asyncio.new_event_loop()
+    use_loop(loop)
+    runner = web.AppRunner(create_async_app(), access_log=None)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = runner.addresses[0][1]
+    thread = threading.Thread(target=loop.run_forever, name="bench-server", daemon=True)
+    thread.start()
+
+    def stop() -> None:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(30)
+        loop.call_soon_threadsafe(loop.stop)
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def _print_report(samples: List[Sample], elapsed: float) -> None:
+    by_route: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_route[sample.route].append(sample)
+
+    print(f"\n{'route':<17}{'ok':>6}{'failed':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route in ROUTES:
+        route_samples = by_route.get(route)
+        if not route_samples:
+            continue
+        ok = [s for s in route_samples if s.ok]
+        ordered = sorted(s.seconds * 1000 for s in ok) or [0.0]
+        print(
+            f"{route:<17}{len(ok):>6}{len(route_samples) - len(ok):>8}{len(ok) / elapsed:>9.2f}"
+            f"{_percentile(ordered, 50):>10.1f}{_percentile(ordered, 95):>10.1f}{_percentile(ordered, 99):>10.1f}"
+        )
+    total_ok = sum(1 for s in samples if s.ok)
+    print(f"{'all':<17}{total_ok:>6}{len(samples) - total_ok:>8}{total_ok / elapsed:>9.2f}")
+
+    stage_samples: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+    for sample in samples:
+        if sample.ok:
+            for stage, seconds in sample.stages.items():
+                stage_samples[(sample.route, stage)].append(seconds * 1000)
+    print(f"\n{'route':<17}{'stage':<13}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for (route, stage), values in sorted(stage_samples.items(), key=lambda kv: (ROUTES.index(kv[0][0]), kv[0][1])):
+        ordered = sorted(values)
+        print(
+            f"{route:<17}{stage:<13}{len(ordered):>6}"
+            f"{_percentile(ordered, 50):>10.1f}{_percentile(ordered, 95):>10.1f}{_percentile(ordered, 99):>10.1f}"
+        )
+
+    errors: Dict[str, int] = defaultdict(int)
+    for sample in samples:
+        if not sample.ok:
+            errors[f"{sample.route}: {sample.error}"] += 1
+    for message, count in sorted(errors.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"  {count}x {message}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="drive a running server instead of an in-process fake-network one")
+    parser.add_argument("--server", choices=("flask", "async"), default="flask", help="in-process server to start")
+    parser.add_argument("--routes", default=",".join(ROUTES), help="comma-separated subset of " + ",".join(ROUTES))
+    parser.add_argument("--requests", type=int, default=20, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent client threads")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="job status poll interval (s)")
+    parser.add_argument("--job-timeout", type=float, default=600.0)
+    parser.add_argument("--nft-address", help="collection for /mint-nft; deployed first when omitted")
+    parser.add_argument("--build-ms", type=float, default=500.0, help="fake scarb build")
+    parser.add_argument("--declare-ms", type=float, default=150.0, help="fake sncast declare")
+    parser.add_argument("--deploy-ms", type=float, default=150.0, help="fake sncast deploy")
+    parser.add_argument("--invoke-ms", type=float, default=50.0, help="fake mint invoke submission")
+    parser.add_argument("--accept-ms", type=float, default=300.0, help="fake time to ACCEPTED_ON_L2")
+    parser.add_argument("--jitter", type=float, default=0.2, help="fake latency jitter (fraction)")
+    parser.add_argument("--accounts", type=int, default=1, help="fake signer accounts to spread transactions over")
+    args = parser.parse_args()
+
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    unknown = set(routes) - set(ROUTES)
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        stop: Callable[[], None] = lambda: None
+        base_url = args.url.rstrip("/") if args.url else None
+        if base_url is None:
+            base_url, stop = _start_in_process_server(args, scratch)
+        try:
+            run_id = uuid.uuid4().hex[:8]
+            with open(os.path.join(BACKEND_DIR, "contract-deployment", "src", "your_contract.cairo"), encoding="utf-8") as f:
+                contract_code = f.read()
+
+            nft_address = args.nft_address
+            if "mint-nft" in routes and not nft_address:
+                setup = _run_deploy(
+                    base_url,
+                    "deploy-nft",
+                    {"name": f"Bench {run_id}", "symbol": "BEN", "base_uri": f"ipfs://bench/{run_id}/"},
+                    args.poll_interval,
+                    args.job_timeout,
+                )
+                if not setup.ok:
+                    raise SystemExit(f"could not deploy a collection for /mint-nft: {setup.error}")
+                nft_address = setup.result["contract_address"]
+
+            def task(route: str, i: int) -> Sample:
+                if route == "create-token":
+                    body = {"name": f"Load Token {run_id} {i}", "symbol": f"LT{i}", "max_token": 1000 + i}
+                elif route == "deploy-nft":
+                    body = {"name": f"Load NFT {run_id} {i}", "symbol": "LN", "base_uri": f"ipfs://load/{run_id}/{i}/"}
+                elif route == "deploy-contract":
+                    body = {"code": f"{contract_code}\n// load {run_id} {i}\n"}
+                else:
+                    return _run_mint(base_url, {"contract_address": nft_address, "recipient": hex(0x1000 + i), "uri": f"{i}.json"})
+                return _run_deploy(base_url, route, body, args.poll_interval, args.job_timeout)
+
+            # Interleave routes so they contend for workers the way mixed traffic would
+            work = [(route, i) for i in range(args.requests) for route in routes]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                samples = list(pool.map(lambda w: task(*w), work))
+            elapsed = time.perf_counter() - started
+        finally:
+            stop()
+
+    target = args.url or (
+        f"in-process {args.server} server, fake network (build={args.build_ms}ms declare={args.declare_ms}ms deploy={args.deploy_ms}ms "
+        f"invoke={args.invoke_ms}ms accept={args.accept_ms}ms jitter={args.jitter})"
+    )
+    print(f"target: {target}")
+    print(f"{len(work)} requests, concurrency={args.concurrency}, wall time {elapsed:.2f}s")
+    _print_report(samples, elapsed)
+
+
+if __name__ == "__main__":
+    main()
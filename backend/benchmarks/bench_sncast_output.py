@@ -0,0 +1,105 @@
+"""Check the sncast output parser against the fixture corpus, then time it.
+
+The corpus (fixtures/sncast_outputs.json) holds declare and deploy outputs in
+every format the pipeline has to read: sncast's current padded labels, the
+older ``command:`` header and snake_case labels, ``--json`` lines, and the
+errors it branches on (already declared, nonce, unavailable address),
+including multi-line ``Caused by:`` errors. Every case must parse to its
+expected fields before anything is timed. Cases marked ``"source":
+"reconstructed"`` were written from sncast's documented formats; add real
+ones with benchmarks/capture_sncast_output.py.
+
+The timing compares ``sncast_output.parse`` with the per-field regex
+searches the pipeline used before it, on each case as captured and with
+``--noise`` lines of build output in front, as when scarb prints warnings
+into the same stream:
+
+    python benchmarks/bench_sncast_output.py --iterations 20000 --noise 200
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sncast_output import SncastOutput, parse  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sncast_outputs.json")
+NOISE_LINE = "warn: Unused variable. Consider ignoring by prefixing with `_`. --> src/lib.cairo:12:13\n"
+
+
+def _legacy(out: str, err: str, returncode: int) -> Tuple[Optional[str], ...]:
+    # The pipeline's declare and deploy parsing before sncast_output, which ignored the exit status
+    already_declared = "already declared" in (err + out)
+    class_hash_match = re.search(r"Class Hash:\s*(0x[0-9a-fA-F]+)", out + "\n" + err)
+    if class_hash_match:
+        class_hash = class_hash_match.group(1)
+    else:
+        fallback_match = re.findall(r"0x[0-9a-fA-F]{10,}", out + "\n" + err)
+        class_hash = fallback_match[-1] if fallback_match else None
+    address_match = re.search(r"Contract Address:\s*(0x[0-9a-fA-F]+)", out)
+    tx_hash_match = re.search(r"Transaction Hash:\s*(0x[0-9a-fA-F]+)", out)
+    return (
+        class_hash,
+        address_match.group(1) if address_match else None,
+        tx_hash_match.group(1) if tx_hash_match else None,
+        str(already_declared),
+    )
+
+
+def _check(cases: List[Dict[str, Any]]) -> List[str]:
+    failures = []
+    for case in cases:
+        got = parse(case["stdout"], case["stderr"], case["returncode"])._asdict()
+        expected = {**SncastOutput()._asdict(), **case["expected"]}
+        wrong = {key: (got[key], expected[key]) for key in expected if got[key] != expected[key]}
+        if wrong:
+            failures.append(f"{case['name']}: (got, expected) {wrong}")
+    return failures
+
+
+def _measure(fn: Callable[[str, str, int], Any], cases: List[Tuple[str, str, int]], iterations: int) -> float:
+    """Mean microseconds per parse over ``iterations`` passes through ``cases``."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for out, err, returncode in cases:
+            fn(out, err, returncode)
+    return (time.perf_counter() - started) * 1e6 / (iterations * len(cases))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--noise", type=int, default=200, help="build output lines in front of each padded case")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs; the median is reported")
+    args = parser.parse_args()
+
+    with open(FIXTURES, encoding="utf-8") as f:
+        cases = json.load(f)
+    failures = _check(cases)
+    print(f"corpus: {len(cases)} cases, {len(cases) - len(failures)} parsed as expected")
+    for failure in failures:
+        print("  FAIL " + failure)
+    if failures:
+        sys.exit(1)
+
+    noise = NOISE_LINE * args.noise
+    inputs = {
+        "captured": [(case["stdout"], case["stderr"], case["returncode"]) for case in cases],
+        "padded": [(noise + case["stdout"], noise + case["stderr"], case["returncode"]) for case in cases],
+    }
+    print(f"iterations={args.iterations} noise={args.noise} lines, median of {args.repeat} runs")
+    print(f"{'input':<10}{'legacy us':>12}{'parse us':>12}{'ratio':>8}")
+    for label, pairs in inputs.items():
+        legacy = statistics.median(_measure(_legacy, pairs, args.iterations) for _ in range(args.repeat))
+        current = statistics.median(_measure(parse, pairs, args.iterations) for _ in range(args.repeat))
+        print(f"{label:<10}{legacy:>12.2f}{current:>12.2f}{legacy / current:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Compare cold and warm scarb build invocations.
+
+Cold is the old per-request path: ``subprocess.run("scarb build", shell=True)``,
+which pays for a shell and scarb's dependency resolution on every call. Warm
+goes through ToolchainExecutor after ``warm()``: no shell, resolved binary,
+and ``--offline`` builds.
+
+What the offline builds save is only visible against the real toolchain, so
+point ``--scarb`` at a scarb binary and ``--project`` at a Scarb project:
+
+    python benchmarks/bench_toolchain.py --scarb "$(which scarb)" --project token-contract
+
+Without ``--scarb`` a stub scarb stands in. It sleeps for the same startup and
+compile time whatever its arguments, so the difference it shows is only the
+shell and binary lookup the warm path skips, not dependency resolution:
+
+    python benchmarks/bench_toolchain.py --iterations 50 --startup-ms 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolchain import ToolchainExecutor  # noqa: E402
+
+STUB_SCARB = """#!{python}
+import sys, time
+args = sys.argv[1:]
+time.sleep({startup})
+if args and args[0] == "fetch":
+    sys.exit(0)
+time.sleep({compile})
+print("Finished release target(s)")
+"""
+
+
+def _write_stub(bin_dir: str, startup_ms: float, compile_ms: float) -> str:
+    path = os.path.join(bin_dir, "scarb")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            STUB_SCARB.format(
+                python=sys.executable,
+                startup=startup_ms / 1000,
+                compile=compile_ms / 1000,
+            )
+        )
+    os.chmod(path, 0o755)
+    return path
+
+
+def _measure(fn: Callable[[], None], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean": statistics.mean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--scarb", help="real scarb binary to measure; the stub is used when omitted")
+    parser.add_argument("--project", help="Scarb project to build with --scarb")
+    parser.add_argument("--startup-ms", type=float, default=5.0, help="stub toolchain process startup")
+    parser.add_argument("--compile-ms", type=float, default=20.0, help="stub compile time")
+    args = parser.parse_args()
+    if args.scarb and not args.project:
+        parser.error("--scarb needs --project")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.scarb:
+            scarb = os.path.abspath(args.scarb)
+            project_dir = os.path.abspath(args.project)
+            setup = f"scarb={scarb} project={project_dir}"
+        else:
+            bin_dir = os.path.join(tmp, "bin")
+            project_dir = os.path.join(tmp, "project")
+            os.makedirs(bin_dir)
+            os.makedirs(project_dir)
+            scarb = _write_stub(bin_dir, args.startup_ms, args.compile_ms)
+            setup = f"stub scarb startup={args.startup_ms}ms compile={args.compile_ms}ms (shell and lookup overhead only)"
+        path = os.path.dirname(scarb) + os.pathsep + os.environ.get("PATH", "")
+        env = {**os.environ, "PATH": path}
+
+        def cold() -> None:
+            subprocess.run("scarb build", cwd=project_dir, shell=True, env=env, text=True,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+
+        executor = ToolchainExecutor(binaries={"scarb": scarb}, env={"PATH": path})
+        warm_started = time.perf_counter()
+        if not executor.warm([project_dir]):
+            raise RuntimeError("scarb fetch failed; warm builds would not run offline")
+        warm_up_ms = (time.perf_counter() - warm_started) * 1000
+
+        def warm() -> None:
+            result = executor.scarb_build(project_dir)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr)
+
+        results = {"cold": _summary(_measure(cold, args.iterations)), "warm": _summary(_measure(warm, args.iterations))}
+
+    print(f"iterations={args.iterations} {setup} (one-off warm-up {warm_up_ms:.1f}ms)")
+    print(f"{'mode':<6}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, stats in results.items():
+        print(f"{mode:<6}{stats['mean']:>10.1f}{stats['p50']:>10.1f}{stats['p95']:>10.1f}")
+    speedup = results["cold"]["mean"] / results["warm"]["mean"]
+    print(f"warm is {speedup:.2f}x faster per build")
+
+
+if __name__ == "__main__":
+    main()
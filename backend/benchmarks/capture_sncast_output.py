@@ -0,0 +1,61 @@
+"""Record a real sncast run as a case in the parser's fixture corpus.
+
+Runs sncast (SNCAST_BIN, else sncast on PATH) with the arguments after
+``--`` in ``--cwd``, and stores its stdout, stderr and exit status under
+``--name`` in fixtures/sncast_outputs.json, replacing a case of that name.
+The expected fields are what sncast_output.parse makes of the run today;
+check them by hand before committing the case:
+
+    python benchmarks/capture_sncast_output.py --name declare_already_declared_devnet \\
+        --cwd token-contract -- --account=devnet declare --contract-name=MyTokenTemplate \\
+        --url http://127.0.0.1:5050/rpc
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sncast_output import SncastOutput, parse  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sncast_outputs.json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--name", required=True, help="case name in the corpus")
+    parser.add_argument("--cwd", default=".", help="directory to run sncast in")
+    parser.add_argument("sncast_args", nargs=argparse.REMAINDER, help="arguments for sncast, after --")
+    args = parser.parse_args()
+    sncast_args = args.sncast_args[1:] if args.sncast_args[:1] == ["--"] else args.sncast_args
+    if not sncast_args:
+        parser.error("give the sncast arguments after --")
+
+    binary = os.getenv("SNCAST_BIN", "sncast")
+    version = subprocess.run([binary, "--version"], capture_output=True, text=True, check=True).stdout.strip()
+    proc = subprocess.run([binary, *sncast_args], cwd=args.cwd, capture_output=True, text=True)
+    got = parse(proc.stdout, proc.stderr, proc.returncode)._asdict()
+    defaults = SncastOutput()._asdict()
+    case = {
+        "name": args.name,
+        "source": version,
+        "returncode": proc.returncode,
+        "stdout": proc.stdout,
+        "stderr": proc.stderr,
+        "expected": {key: value for key, value in got.items() if value != defaults[key]},
+    }
+
+    with open(FIXTURES, encoding="utf-8") as f:
+        cases = json.load(f)
+    cases = [c for c in cases if c["name"] != args.name] + [case]
+    with open(FIXTURES, "w", encoding="utf-8") as f:
+        json.dump(cases, f, indent=2)
+        f.write("\n")
+    print(f"{args.name}: exit {proc.returncode}, recorded with {version}")
+    print(json.dumps(case["expected"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
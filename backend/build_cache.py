@@ -0,0 +1,189 @@
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Files outside src/ that change what scarb produces
+MANIFEST_FILES = ("Scarb.toml", "Scarb.lock")
+ARTIFACT_SUFFIXES = (".contract_class.json", ".compiled_contract_class.json", ".starknet_artifacts.json")
+
+
+def _iter_sources(project_dir: str) -> Iterable[str]:
+    src_dir = os.path.join(project_dir, "src")
+    for root, dirs, files in os.walk(src_dir):
+        dirs.sort()
+        for fname in sorted(files):
+            if fname.endswith(".cairo"):
+                yield os.path.join(root, fname)
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def _scan(root: str) -> List[Tuple[float, str, int]]:
+    """(mtime, key, size) of every entry on disk; entries removed mid-scan are skipped."""
+    found = []
+    for key in os.listdir(root):
+        path = os.path.join(root, key)
+        if key.startswith("."):
+            continue
+        try:
+            if os.path.isdir(path):
+                found.append((os.path.getmtime(path), key, _dir_size(path)))
+        except FileNotFoundError:
+            # Evicted by another worker while we looked
+            continue
+    return sorted(found)
+
+
+class BuildCache:
+    """Content-addressed store of scarb artifacts, bounded by total size with LRU eviction.
+
+    Entries are keyed on a hash of every rendered ``src/**/*.cairo`` file plus
+    Scarb.toml/Scarb.lock, so identical renders reuse the same Sierra/CASM output.
+
+    Several worker processes may share ``root``. Recency is the entry
+    directory's mtime, which a restore bumps, and every store re-reads the
+    directory before evicting, so ``max_bytes`` bounds the whole cache rather
+    than what one worker wrote. An entry is pinned while this process copies
+    it out; one removed by another worker mid-copy counts as a miss.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        # key -> restores copying it right now; never evicted while pinned
+        self._pins: Dict[str, int] = {}
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        self._entries = OrderedDict((key, size) for _, key, size in _scan(self.root))
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._entries.values())
+
+    def key(self, project_dir: str) -> str:
+        digest = hashlib.sha256()
+        for fname in MANIFEST_FILES:
+            path = os.path.join(project_dir, fname)
+            if os.path.exists(path):
+                digest.update(fname.encode() + b"\0")
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+        for path in _iter_sources(project_dir):
+            digest.update(os.path.relpath(path, project_dir).encode() + b"\0")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def restore(self, key: str, target_dir: str) -> bool:
+        """Copy cached artifacts for ``key`` into ``target_dir``; False on a miss."""
+        entry_dir = os.path.join(self.root, key)
+        with self._lock:
+            if not os.path.isdir(entry_dir):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return False
+            self._pins[key] = self._pins.get(key, 0) + 1
+        copied = []
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+            for fname in os.listdir(entry_dir):
+                shutil.copy2(os.path.join(entry_dir, fname), os.path.join(target_dir, fname))
+                copied.append(fname)
+            now = time.time()
+            os.utime(entry_dir, (now, now))
+        except FileNotFoundError:
+            # Another worker evicted the entry mid-copy; scarb rebuilds over a clean target
+            for fname in copied:
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(target_dir, fname))
+            with self._lock:
+                self._unpin(key)
+                self._entries.pop(key, None)
+                self.misses += 1
+            return False
+        with self._lock:
+            self._unpin(key)
+            if key not in self._entries:
+                # Stored by another worker; its size is picked up by the next rescan
+                self._entries[key] = 0
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True
+
+    def _unpin(self, key: str) -> None:
+        if self._pins[key] == 1:
+            del self._pins[key]
+        else:
+            self._pins[key] -= 1
+
+    def store(self, key: str, target_dir: str) -> None:
+        """Snapshot the Sierra/CASM artifacts scarb left in ``target_dir`` under ``key``."""
+        artifacts = [f for f in os.listdir(target_dir) if f.endswith(ARTIFACT_SUFFIXES)] if os.path.isdir(target_dir) else []
+        if not artifacts:
+            logger.warning("build cache: no artifacts found in %s", target_dir)
+            return
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.root)
+        for fname in artifacts:
+            shutil.copy2(os.path.join(target_dir, fname), os.path.join(staging, fname))
+        entry_dir = os.path.join(self.root, key)
+        try:
+            os.rename(staging, entry_dir)
+        except OSError:
+            # Another worker stored the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+        now = time.time()
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry_dir, (now, now))
+        with self._lock:
+            # Other workers' entries count against the same bound
+            self._load()
+            self._evict(keep=key)
+
+    def _evict(self, keep: str) -> None:
+        for key in list(self._entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key == keep or key in self._pins:
+                continue
+            del self._entries[key]
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def create_build_cache() -> Optional[BuildCache]:
+    """Build the cache from BUILD_CACHE_DIR / BUILD_CACHE_MAX_MB; BUILD_CACHE_ENABLED=0 disables it."""
+    if os.getenv("BUILD_CACHE_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    root = os.getenv("BUILD_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".build-cache")
+    max_mb = int(os.getenv("BUILD_CACHE_MAX_MB", "512"))
+    return BuildCache(root, max_bytes=max_mb * 1024 * 1024)
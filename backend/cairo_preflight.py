@@ -0,0 +1,262 @@
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Submissions above this are rejected before anything is written or compiled;
+# the Runtime reads the CAIRO_MAX_SOURCE_BYTES override
+MAX_SOURCE_BYTES = 256 * 1024
+
+# Comments and string/short-string literals; blanked out before structural checks
+_NOISE = re.compile(r"//[^\n]*|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'")
+_DELIMITERS = re.compile(r"[(){}\[\]]")
+_CLOSING = {")": "(", "}": "{", "]": "["}
+_CONTRACT_MODULE = re.compile(r"#\[starknet::contract\]\s*(?:pub\s+)?mod\s+(\w+)\s*\{")
+_STORAGE = re.compile(r"#\[storage\]\s*(?:pub\s+)?struct\s+Storage\b")
+_CONSTRUCTOR = re.compile(r"#\[constructor\]\s*(?:#\[[^\]]*\]\s*)*(?:pub\s+)?fn\s+(\w+)\s*\(")
+_STRUCT = re.compile(r"(?:pub\s+)?struct\s+(\w+)\s*\{")
+_ENUM = re.compile(r"(?:pub\s+)?enum\s+(\w+)\s*\{")
+_GENERIC = re.compile(r"^(\w+)\s*<(.*)>$", re.DOTALL)
+_FIXED_ARRAY = re.compile(r"^\[(.*);\s*(\d+)\]$", re.DOTALL)
+
+# Types that serialize to a single felt; the zero value is a valid default for all of them
+_ONE_FELT = frozenset((
+    "felt252", "bool", "bytes31", "usize",
+    "u8", "u16", "u32", "u64", "u128",
+    "i8", "i16", "i32", "i64", "i128",
+    "ContractAddress", "ClassHash", "EthAddress", "StorageAddress",
+))
+_FELT_WIDTH = {"u256": 2, "u512": 4}
+_MAX_DEPTH = 16
+
+
+class CairoPreflightError(ValueError):
+    """The submitted source can be rejected without running scarb."""
+
+    def __init__(self, message: str, **details: Any) -> None:
+        super().__init__(message)
+        self.message = message
+        self.details = details
+
+
+class ConstructorParam(NamedTuple):
+    name: str
+    type: str
+    default: List[str]
+
+
+class CairoAnalysis(NamedTuple):
+    contract_name: str
+    constructor: List[ConstructorParam]
+
+    @property
+    def calldata(self) -> List[str]:
+        """Default constructor calldata: the zero value of every parameter, serialized as Serde does."""
+        return [felt for param in self.constructor for felt in param.default]
+
+
+def _line_of(text: str, offset: int) -> int:
+    return text.count("\n", 0, offset) + 1
+
+
+def _blank(match: "re.Match[str]") -> str:
+    text = match.group(0)
+    if text.startswith("//"):
+        return " " * len(text)
+    # Keep the quotes so literals still separate tokens
+    return text[0] + " " * (len(text) - 2) + text[-1]
+
+
+def _strip_noise(code: str) -> str:
+    # Same length and line breaks as the input, so offsets and line numbers still apply
+    stripped = _NOISE.sub(_blank, code)
+    for quote in ('"', "'"):
+        # Every terminated literal now has exactly two quotes left
+        index = stripped.find(quote)
+        while index != -1:
+            end = stripped.find(quote, index + 1)
+            if end == -1 or "\n" in stripped[index:end]:
+                raise CairoPreflightError("unterminated string literal", line=_line_of(code, index))
+            index = stripped.find(quote, end + 1)
+    return stripped
+
+
+def _check_delimiters(code: str) -> Dict[int, int]:
+    """Verify (), {} and [] nest; returns each opening offset -> its closing offset."""
+    stack: List[Tuple[str, int]] = []
+    pairs: Dict[int, int] = {}
+    for match in _DELIMITERS.finditer(code):
+        char, offset = match.group(0), match.start()
+        if char in "({[":
+            stack.append((char, offset))
+            continue
+        if not stack or stack[-1][0] != _CLOSING[char]:
+            raise CairoPreflightError(f"unbalanced '{char}'", line=_line_of(code, offset))
+        pairs[stack.pop()[1]] = offset
+    if stack:
+        char, offset = stack[-1]
+        raise CairoPreflightError(f"unclosed '{char}'", line=_line_of(code, offset))
+    return pairs
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas outside (), <> and [] nesting; empty trailing items are dropped."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char in "(<[":
+            depth += 1
+        elif char in ")>]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _strip_attributes(text: str) -> str:
+    return re.sub(r"#\[[^\]]*\]", "", text).strip()
+
+
+def _local_types(code: str, pairs: Dict[int, int]) -> Dict[str, Tuple[str, List[Tuple[str, Optional[str]]]]]:
+    """Structs and enums declared in the submission: name -> (kind, [(member, type or None)])."""
+    types: Dict[str, Tuple[str, List[Tuple[str, Optional[str]]]]] = {}
+    for kind, pattern in (("struct", _STRUCT), ("enum", _ENUM)):
+        for match in pattern.finditer(code):
+            body_start = match.end() - 1
+            body = code[body_start + 1:pairs[body_start]]
+            members: List[Tuple[str, Optional[str]]] = []
+            for item in _split_top_level(body):
+                item = _strip_attributes(item)
+                name, _, member_type = item.partition(":")
+                members.append((name.strip(), member_type.strip() or None))
+            types[match.group(1)] = (kind, members)
+    return types
+
+
+def _normalize(type_text: str) -> str:
+    type_text = " ".join(type_text.split())
+    # core::integer::u256 -> u256, starknet::ContractAddress -> ContractAddress
+    head, sep, rest = type_text.partition("<")
+    return head.rsplit("::", 1)[-1].strip() + sep + rest
+
+
+def default_calldata(type_text: str, local_types: Optional[Dict[str, Any]] = None, _depth: int = 0) -> List[str]:
+    """Zero-value calldata for a Cairo type as its Serde impl reads it.
+
+    Raises CairoPreflightError for types whose serialization cannot be derived
+    from the source (external structs, generics without a known layout).
+    """
+    if _depth > _MAX_DEPTH:
+        raise CairoPreflightError("constructor parameter type nests too deeply", type=type_text)
+    local_types = local_types or {}
+    type_text = _normalize(type_text)
+
+    if type_text in ("()", ""):
+        return []
+    if type_text in _ONE_FELT:
+        return ["0x0"]
+    if type_text in _FELT_WIDTH:
+        return ["0x0"] * _FELT_WIDTH[type_text]
+    if type_text == "ByteArray":
+        # data: Array<bytes31> (empty), pending_word, pending_word_len
+        return ["0x0", "0x0", "0x0"]
+    if type_text.startswith("(") and type_text.endswith(")"):
+        return [felt for item in _split_top_level(type_text[1:-1]) for felt in default_calldata(item, local_types, _depth + 1)]
+
+    fixed = _FIXED_ARRAY.match(type_text)
+    if fixed:
+        # Fixed-size arrays serialize their elements without a length prefix
+        return default_calldata(fixed.group(1), local_types, _depth + 1) * int(fixed.group(2))
+
+    generic = _GENERIC.match(type_text)
+    if generic:
+        name, args = generic.group(1), _split_top_level(generic.group(2))
+        if name in ("Array", "Span"):
+            return ["0x0"]
+        if name == "Option":
+            # Variant index 1 is None
+            return ["0x1"]
+        if name == "Box" and len(args) == 1:
+            return default_calldata(args[0], local_types, _depth + 1)
+        if name == "NonZero" and len(args) == 1:
+            # Zero would fail deserialization; use one (low word first for u256)
+            inner = default_calldata(args[0], local_types, _depth + 1)
+            return ["0x1", *inner[1:]]
+        raise CairoPreflightError("unsupported constructor parameter type", type=type_text)
+
+    if type_text in local_types:
+        kind, members = local_types[type_text]
+        if kind == "struct":
+            return [felt for _, member in members for felt in default_calldata(member or "", local_types, _depth + 1)]
+        if not members:
+            raise CairoPreflightError("constructor parameter enum has no variants", type=type_text)
+        # First variant, plus its payload if it has one
+        return ["0x0", *default_calldata(members[0][1] or "", local_types, _depth + 1)]
+    raise CairoPreflightError("unsupported constructor parameter type", type=type_text)
+
+
+def analyze(code: str, contract_name: Optional[str] = None, max_bytes: int = MAX_SOURCE_BYTES) -> CairoAnalysis:
+    """Pre-flight a user contract in one pass over the source, without invoking scarb.
+
+    Checks the size limit, string and delimiter balance, that there is exactly
+    one ``#[starknet::contract]`` module (named ``contract_name`` if given)
+    with a ``#[storage]`` struct, and at most one constructor whose parameter
+    types all have a known serialization. Raises CairoPreflightError otherwise.
+    """
+    size = len(code.encode("utf-8"))
+    if size > max_bytes:
+        raise CairoPreflightError("contract source too large", bytes=size, max_bytes=max_bytes)
+    if not code.strip():
+        raise CairoPreflightError("contract source is empty")
+
+    stripped = _strip_noise(code)
+    pairs = _check_delimiters(stripped)
+
+    modules = list(_CONTRACT_MODULE.finditer(stripped))
+    if not modules:
+        raise CairoPreflightError(
+            "no #[starknet::contract] module found",
+            hint=f"Wrap the contract in #[starknet::contract] mod {contract_name or 'YourContract'} {{ ... }}",
+        )
+    if len(modules) > 1:
+        raise CairoPreflightError(
+            "more than one #[starknet::contract] module",
+            modules=[m.group(1) for m in modules],
+        )
+    module = modules[0]
+    if contract_name is not None and module.group(1) != contract_name:
+        raise CairoPreflightError(
+            f"contract module must be named {contract_name}",
+            found=module.group(1),
+            line=_line_of(code, module.start(1)),
+        )
+    body_start = module.end() - 1
+    body = stripped[body_start:pairs[body_start]]
+    if not _STORAGE.search(body):
+        raise CairoPreflightError("contract module has no #[storage] struct Storage", line=_line_of(code, module.start()))
+
+    constructors = list(_CONSTRUCTOR.finditer(body))
+    if len(constructors) > 1:
+        raise CairoPreflightError(
+            "more than one #[constructor]",
+            lines=[_line_of(code, body_start + c.start()) for c in constructors],
+        )
+    params: List[ConstructorParam] = []
+    if constructors:
+        open_paren = body_start + constructors[0].end() - 1
+        local_types = _local_types(stripped, pairs)
+        for item in _split_top_level(stripped[open_paren + 1:pairs[open_paren]]):
+            declaration = re.sub(r"^(?:ref|mut)\s+", "", _strip_attributes(item))
+            name, _, param_type = declaration.partition(":")
+            name, param_type = name.strip(), param_type.strip()
+            if name == "self":
+                continue
+            if not param_type:
+                raise CairoPreflightError("constructor parameter has no type", parameter=name)
+            # Types come from the stripped source, where string contents are blank
+            param_type = " ".join(param_type.split())
+            try:
+                default = default_calldata(param_type, local_types)
+            except CairoPreflightError as e:
+                raise CairoPreflightError(e.message, parameter=name, **e.details)
+            params.append(ConstructorParam(name, param_type, default))
+    return CairoAnalysis(module.group(1), params)
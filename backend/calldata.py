@@ -0,0 +1,57 @@
+from typing import List
+
+# Cairo ByteArray packs this many bytes into each full word
+BYTES31_SIZE = 31
+FIELD_PRIME = 2**251 + 17 * 2**192  # felts are < P
+U128_MAX = 2**128 - 1
+
+
+def encode_felt(value: int) -> str:
+    if not 0 <= value < FIELD_PRIME:
+        raise ValueError(f"felt out of range: {value}")
+    return hex(value)
+
+
+def encode_u8(value: int) -> List[str]:
+    if not 0 <= value <= 255:
+        raise ValueError(f"u8 out of range: {value}")
+    return [hex(value)]
+
+
+def encode_u256(value: int) -> List[str]:
+    """u256 is serialised as two u128 felts, low word first."""
+    if not 0 <= value < 2**256:
+        raise ValueError(f"u256 out of range: {value}")
+    return [hex(value & U128_MAX), hex(value >> 128)]
+
+
+def encode_byte_array(text: str) -> List[str]:
+    """Serialise ``text`` the way Cairo's Serde<ByteArray> reads it.
+
+    Layout: number of full 31-byte words, the words themselves (big-endian),
+    then the pending word and its length in bytes.
+    """
+    data = text.encode("utf-8")
+    full_len = len(data) - len(data) % BYTES31_SIZE
+    words = [int.from_bytes(data[i:i + BYTES31_SIZE], "big") for i in range(0, full_len, BYTES31_SIZE)]
+    pending = data[full_len:]
+    return [
+        hex(len(words)),
+        *(hex(w) for w in words),
+        hex(int.from_bytes(pending, "big")),
+        hex(len(pending)),
+    ]
+
+
+def encode_address(address: str) -> List[str]:
+    return [encode_felt(int(address, 16))]
+
+
+def token_constructor_calldata(name: str, symbol: str, decimals: int, initial_supply: int) -> List[str]:
+    """Constructor calldata for MyTokenTemplate(name, symbol, decimals, initial_supply)."""
+    return [*encode_byte_array(name), *encode_byte_array(symbol), *encode_u8(decimals), *encode_u256(initial_supply)]
+
+
+def nft_constructor_calldata(name: str, symbol: str, base_uri: str, owner: str) -> List[str]:
+    """Constructor calldata for YourCollectibleTemplate(name, symbol, base_uri, owner)."""
+    return [*encode_byte_array(name), *encode_byte_array(symbol), *encode_byte_array(base_uri), *encode_address(owner)]
@@ -0,0 +1,103 @@
+import glob
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS declared_classes (
+    network TEXT NOT NULL,
+    artifact_hash TEXT NOT NULL,
+    class_hash TEXT NOT NULL,
+    contract_name TEXT,
+    declared_at REAL NOT NULL,
+    PRIMARY KEY (network, artifact_hash)
+)
+"""
+
+
+def artifact_hash(target_dir: str, contract_name: str) -> Optional[str]:
+    """sha256 of the compiled Sierra class for ``contract_name``, or None if scarb produced none."""
+    matches = sorted(glob.glob(os.path.join(target_dir, f"*_{contract_name}.contract_class.json")))
+    if not matches:
+        return None
+    digest = hashlib.sha256()
+    with open(matches[0], "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ClassRegistry:
+    """Persistent map of (network, artifact hash) -> declared class hash.
+
+    Backed by SQLite in WAL mode so several worker processes can read and write
+    it at once. Rows are loaded into memory at startup; lookups that miss the
+    in-memory map fall through to the database to pick up other processes' writes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._classes: Dict[Tuple[str, str], str] = {}
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+        for network, art_hash, class_hash in conn.execute(
+            "SELECT network, artifact_hash, class_hash FROM declared_classes"
+        ):
+            self._classes[(network, art_hash)] = class_hash
+        logger.info("class registry: loaded %d declared classes from %s", len(self._classes), path)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return len(self._classes)
+
+    def get(self, network: str, art_hash: str) -> Optional[str]:
+        class_hash = self._classes.get((network, art_hash))
+        if class_hash is not None:
+            return class_hash
+        row = self._conn().execute(
+            "SELECT class_hash FROM declared_classes WHERE network = ? AND artifact_hash = ?",
+            (network, art_hash),
+        ).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self._classes[(network, art_hash)] = row[0]
+        return row[0]
+
+    def put(self, network: str, art_hash: str, class_hash: str, contract_name: Optional[str] = None) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO declared_classes "
+                "(network, artifact_hash, class_hash, contract_name, declared_at) VALUES (?, ?, ?, ?, ?)",
+                (network, art_hash, class_hash, contract_name, time.time()),
+            )
+        with self._lock:
+            self._classes[(network, art_hash)] = class_hash
+
+
+def create_class_registry() -> Optional[ClassRegistry]:
+    """Open the registry at CLASS_REGISTRY_PATH; CLASS_REGISTRY_ENABLED=0 disables it."""
+    if os.getenv("CLASS_REGISTRY_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    path = os.getenv("CLASS_REGISTRY_PATH") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".class-registry.sqlite3"
+    )
+    return ClassRegistry(path)
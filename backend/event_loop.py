@@ -0,0 +1,44 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def use_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Make ``loop`` the process-wide shared loop; the async server calls this with its own loop at startup."""
+    global _loop
+    with _loop_lock:
+        if _loop is not None and _loop is not loop:
+            raise RuntimeError("a different shared event loop is already in use")
+        _loop = loop
+
+
+def shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the loop all pipeline, RPC and mint coroutines run on.
+
+    Under the async server this is the server's own loop. Under the Flask
+    server it is started on first use in a daemon thread, and request or job
+    threads hand work to it with ``run()``.
+    """
+    global _loop
+    if _loop is not None:
+        return _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="shared-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def submit(coro: Awaitable[Any]) -> "concurrent.futures.Future[Any]":
+    """Schedule ``coro`` on the shared loop from any thread without waiting for it."""
+    return asyncio.run_coroutine_threadsafe(coro, shared_loop())
+
+
+def run(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run ``coro`` on the shared loop and block the calling (non-loop) thread for its result."""
+    return submit(coro).result(timeout)
@@ -0,0 +1,429 @@
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from signers import SignerAccount, SignerPool
+from starknet_client import StarknetClientPool
+from toolchain import TOOLS, CommandResult, OutputCallback, ToolchainExecutor
+from tx_tracker import TxTracker
+
+_CONTRACT_MODULE = re.compile(r"#\[starknet::contract\]\s*(?:pub\s+)?mod\s+(\w+)")
+_PACKAGE_NAME = re.compile(r'^name\s*=\s*"([^"]+)"', re.MULTILINE)
+# sncast options that take exactly one value when not written as --opt=value
+_VALUE_OPTIONS = ("--account", "--contract-name", "--class-hash", "--salt", "--network", "--url", "--nonce")
+_FELT_MASK = (1 << 250) - 1
+
+
+class FakeLatencies(NamedTuple):
+    """Simulated durations in seconds; each one varies by up to ``jitter`` (a fraction) either way."""
+
+    build: float = 2.0
+    declare: float = 0.5
+    deploy: float = 0.5
+    invoke: float = 0.2
+    # Time until a sent transaction is reported ACCEPTED_ON_L2
+    accept: float = 1.0
+    jitter: float = 0.2
+
+
+def _random_felt() -> int:
+    return secrets.randbits(250)
+
+
+def _felt_from(*parts: str) -> str:
+    digest = hashlib.sha256("\0".join(parts).encode()).digest()
+    return hex(int.from_bytes(digest, "big") & _FELT_MASK)
+
+
+def fake_account_address(name: str) -> str:
+    """Address of the simulated account that fake sncast signs with for ``--account=name``."""
+    return _felt_from("account", name)
+
+
+class FakeNode:
+    """In-memory stand-in for a node; classes become visible ``ready_after`` seconds after declare."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self._classes: Dict[str, float] = {}
+        self._txs: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def declare(self, class_hash: str, tx_hash: Optional[str] = None, ready_after: float = 0.0) -> None:
+        ready_at = self.clock() + ready_after
+        with self._lock:
+            self._classes[class_hash.lower()] = ready_at
+            if tx_hash:
+                self._txs[tx_hash.lower()] = ready_at
+
+    def send(self, tx_hash: str, ready_after: float = 0.0) -> None:
+        """Record a non-declare transaction that is accepted ``ready_after`` seconds from now."""
+        with self._lock:
+            self._txs[tx_hash.lower()] = self.clock() + ready_after
+
+    def reject(self, tx_hash: str) -> None:
+        with self._lock:
+            self._txs[tx_hash.lower()] = "REJECTED"
+
+    def is_class_declared(self, class_hash: str) -> bool:
+        with self._lock:
+            ready_at = self._classes.get(class_hash.lower())
+        return ready_at is not None and self.clock() >= ready_at
+
+    def transaction_status(self, tx_hash: str) -> Dict[str, Any]:
+        with self._lock:
+            state = self._txs.get(tx_hash.lower())
+        if state is None:
+            return {}
+        if state == "REJECTED":
+            return {"finality_status": "REJECTED"}
+        if self.clock() >= state:
+            return {"finality_status": "ACCEPTED_ON_L2", "execution_status": "SUCCEEDED"}
+        return {"finality_status": "RECEIVED"}
+
+
+class FakeNetwork:
+    """In-process stand-in for a Starknet node plus the scarb/sncast toolchain.
+
+    Classes, deployments and transactions live in memory: declares become
+    visible to the readiness waiter after the ``accept`` latency, deploys
+    fail for undeclared classes or reused addresses as on a real node, and
+    every transaction is checked against its sender's nonce. Lets the whole service be
+    load-tested without a devnet or testnet funds.
+    """
+
+    def __init__(self, latencies: Optional[FakeLatencies] = None, seed: Optional[int] = None) -> None:
+        self.latencies = latencies or FakeLatencies()
+        self.node = FakeNode()
+        self._declared: set = set()
+        self._deployed: set = set()
+        self._nonces: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def delay(self, name: str) -> float:
+        base = getattr(self.latencies, name)
+        with self._lock:
+            spread = self._random.uniform(-self.latencies.jitter, self.latencies.jitter)
+        return max(0.0, base * (1 + spread))
+
+    async def get_nonce(self, address: str) -> int:
+        with self._lock:
+            return self._nonces.get(address, 0)
+
+    def take_nonce(self, sender: str, nonce: Optional[int]) -> str:
+        """Spend ``sender``'s next nonce; returns an error if ``nonce`` is given and is not that one."""
+        with self._lock:
+            return self._take_nonce(sender, nonce)
+
+    def _take_nonce(self, sender: str, nonce: Optional[int]) -> str:
+        expected = self._nonces.get(sender, 0)
+        if nonce is not None and nonce != expected:
+            return f"Invalid transaction nonce: expected {expected}, got {nonce}"
+        self._nonces[sender] = expected + 1
+        return ""
+
+    def declare(self, class_hash: str, sender: str = "", nonce: Optional[int] = None) -> Tuple[bool, Optional[str], str]:
+        """Returns (newly_declared, tx_hash, error)."""
+        with self._lock:
+            if class_hash in self._declared:
+                return False, None, ""
+            error = self._take_nonce(sender, nonce)
+            if error:
+                return False, None, error
+            self._declared.add(class_hash)
+        tx_hash = hex(_random_felt())
+        self.node.declare(class_hash, tx_hash, ready_after=self.delay("accept"))
+        return True, tx_hash, ""
+
+    def deploy(
+        self, class_hash: str, salt: str, calldata: List[str], sender: str = "", nonce: Optional[int] = None
+    ) -> Tuple[Optional[str], Optional[str], str]:
+        """Returns (address, tx_hash, error)."""
+        if not self.node.is_class_declared(class_hash):
+            return None, None, f"Class with hash {class_hash} is not declared"
+        address = _felt_from(class_hash, salt, *calldata)
+        with self._lock:
+            if address in self._deployed:
+                return None, None, f"Requested contract address {address} is unavailable for deployment"
+            error = self._take_nonce(sender, nonce)
+            if error:
+                return None, None, error
+            self._deployed.add(address)
+        tx_hash = hex(_random_felt())
+        self.node.send(tx_hash, ready_after=self.delay("accept"))
+        return address, tx_hash, ""
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "latencies": self.latencies._asdict(),
+                "declared": len(self._declared),
+                "deployed": len(self._deployed),
+                "accounts": len(self._nonces),
+            }
+
+
+def _parse_sncast_args(args: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+    commands: List[str] = []
+    options: Dict[str, Any] = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--constructor-calldata":
+            values = []
+            while i + 1 < len(args) and not args[i + 1].startswith("--"):
+                i += 1
+                values.append(args[i])
+            options["constructor-calldata"] = values
+        elif arg.startswith("--") and "=" in arg:
+            key, value = arg[2:].split("=", 1)
+            options[key] = value
+        elif arg in _VALUE_OPTIONS and i + 1 < len(args):
+            i += 1
+            options[arg[2:]] = args[i]
+        elif not arg.startswith("-"):
+            commands.append(arg)
+        i += 1
+    return commands, options
+
+
+class FakeToolchain(ToolchainExecutor):
+    """ToolchainExecutor that answers scarb and sncast from a FakeNetwork instead of running them.
+
+    Keeps the real executor's per-tool concurrency limits, stats and history,
+    so queueing behaves as it would with the real binaries.
+    """
+
+    def __init__(self, network: FakeNetwork, max_concurrency: Optional[Dict[str, int]] = None) -> None:
+        super().__init__(max_concurrency=max_concurrency)
+        self.network = network
+        self.binaries = {tool: f"fake-{tool}" for tool in TOOLS}
+
+    def run(self, tool: str, args: List[str], cwd: str, timeout: Optional[float] = None) -> CommandResult:
+        with self._slots[tool]:
+            started = time.perf_counter()
+            time.sleep(self._delay(tool, list(args)))
+            answer = self._answer(tool, list(args), cwd)
+            duration = time.perf_counter() - started
+        return self._result(tool, args, answer, duration)
+
+    async def arun(
+        self,
+        tool: str,
+        args: List[str],
+        cwd: str,
+        timeout: Optional[float] = None,
+        on_line: Optional[OutputCallback] = None,
+    ) -> CommandResult:
+        async with self._async_slot(tool):
+            started = time.perf_counter()
+            await asyncio.sleep(self._delay(tool, list(args)))
+            answer = self._answer(tool, list(args), cwd)
+            duration = time.perf_counter() - started
+        if on_line is not None:
+            _, stdout, stderr = answer
+            for stream, text in (("stdout", stdout), ("stderr", stderr)):
+                for line in text.splitlines():
+                    on_line(stream, line)
+        return self._result(tool, args, answer, duration)
+
+    def _result(self, tool: str, args: List[str], answer: Tuple[int, str, str], duration: float) -> CommandResult:
+        argv = [self.binaries[tool], *args]
+        returncode, stdout, stderr = answer
+        self._record(tool, argv, returncode, duration, False)
+        return CommandResult(tool, argv, returncode, stdout, stderr, duration)
+
+    def _delay(self, tool: str, args: List[str]) -> float:
+        if tool == "scarb":
+            return self.network.delay("build") if "build" in args else 0.0
+        commands, _ = _parse_sncast_args(args)
+        for command in ("declare", "deploy"):
+            if command in commands:
+                return self.network.delay(command)
+        return 0.0
+
+    def _answer(self, tool: str, args: List[str], cwd: str) -> Tuple[int, str, str]:
+        return self._scarb(args, cwd) if tool == "scarb" else self._sncast(args, cwd)
+
+    def _scarb(self, args: List[str], cwd: str) -> Tuple[int, str, str]:
+        if "build" not in args:
+            return 0, "", ""
+        package = "contracts"
+        manifest = os.path.join(cwd, "Scarb.toml")
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                match = _PACKAGE_NAME.search(f.read())
+            package = match.group(1) if match else package
+
+        digest = hashlib.sha256()
+        contracts: List[str] = []
+        for path in sorted(glob.glob(os.path.join(cwd, "src", "**", "*.cairo"), recursive=True)):
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+            digest.update(source.encode())
+            contracts.extend(_CONTRACT_MODULE.findall(source))
+        if not contracts:
+            return 1, "", "error: no starknet contracts found in src/"
+
+        target_dir = os.path.join(cwd, "target", "dev")
+        os.makedirs(target_dir, exist_ok=True)
+        for name in contracts:
+            with open(os.path.join(target_dir, f"{package}_{name}.contract_class.json"), "w", encoding="utf-8") as f:
+                json.dump({"contract": name, "sources": digest.hexdigest()}, f)
+        return 0, f"Finished `dev` profile target(s) for {package}\n", ""
+
+    def _sncast(self, args: List[str], cwd: str) -> Tuple[int, str, str]:
+        commands, options = _parse_sncast_args(args)
+        sender = fake_account_address(options.get("account", ""))
+        nonce = int(options["nonce"], 0) if "nonce" in options else None
+        as_json = "--json" in args
+        if "declare" in commands:
+            name = options.get("contract-name", "")
+            artifacts = glob.glob(os.path.join(cwd, "target", "dev", f"*_{name}.contract_class.json"))
+            if not artifacts:
+                error = f"Failed to find {name} artifact in starknet_artifacts.json file"
+                return _sncast_answer(as_json, "declare", 2, error=error)
+            with open(artifacts[0], encoding="utf-8") as f:
+                class_hash = _felt_from(f.read())
+            declared, tx_hash, error = self.network.declare(class_hash, sender, nonce)
+            if error:
+                return _sncast_answer(as_json, "declare", 1, error=error)
+            if not declared:
+                return _sncast_answer(as_json, "declare", 1, error=f"Class with hash {class_hash} is already declared.")
+            return _sncast_answer(as_json, "declare", 0, class_hash=class_hash, transaction_hash=tx_hash)
+        if "deploy" in commands:
+            address, tx_hash, error = self.network.deploy(
+                options.get("class-hash", ""),
+                options.get("salt", "0x0"),
+                options.get("constructor-calldata", []),
+                sender,
+                nonce,
+            )
+            if error:
+                return _sncast_answer(as_json, "deploy", 1, error=error)
+            return _sncast_answer(as_json, "deploy", 0, contract_address=address, transaction_hash=tx_hash)
+        return 2, "", f"fake sncast does not support: {' '.join(args)}"
+
+
+def _sncast_answer(as_json: bool, command: str, returncode: int, error: str = "", **fields: str) -> Tuple[int, str, str]:
+    """Print ``fields`` (or ``error``) the way sncast does, as text or as one --json line."""
+    if as_json:
+        line = json.dumps({"command": command, "error": error} if error else {"command": command, **fields})
+        return (returncode, "", line + "\n") if error else (returncode, line + "\n", "")
+    if error:
+        return returncode, "", f"Error: {error}"
+    labels = "".join(f"{key.replace('_', ' ').title()}: {value}\n" for key, value in fields.items())
+    return returncode, f"command: {command}\n{labels}", ""
+
+
+class _FakeSent(NamedTuple):
+    hash: int
+
+
+class _FakeClient:
+    def __init__(self, network: FakeNetwork) -> None:
+        self.network = network
+
+    async def wait_for_tx(self, tx_hash: int) -> Dict[str, Any]:
+        while True:
+            status = self.network.node.transaction_status(hex(tx_hash))
+            if status.get("finality_status") == "ACCEPTED_ON_L2":
+                return status
+            await asyncio.sleep(0.01)
+
+
+class _FakeAccount:
+    def __init__(self, network: FakeNetwork, address: str) -> None:
+        self.network = network
+        self.address = address
+        self.client = _FakeClient(network)
+
+    async def execute_v3(
+        self, calls: List[Dict[str, Any]], nonce: Optional[int] = None, auto_estimate: bool = False
+    ) -> _FakeSent:
+        await asyncio.sleep(self.network.delay("invoke"))
+        error = self.network.take_nonce(self.address, nonce)
+        if error:
+            raise RuntimeError(error)
+        tx_hash = _random_felt()
+        self.network.node.send(hex(tx_hash), ready_after=self.network.delay("accept"))
+        return _FakeSent(tx_hash)
+
+
+class _FakeFunction:
+    def __init__(self, address: int, name: str) -> None:
+        self.address = address
+        self.name = name
+
+    def prepare_invoke_v3(self, **inputs: Any) -> Dict[str, Any]:
+        return {"to": self.address, "selector": self.name, "inputs": inputs}
+
+
+class _FakeContract:
+    def __init__(self, address: int) -> None:
+        self.address = address
+        self.functions = {"mint_item": _FakeFunction(address, "mint_item")}
+
+
+class FakeTxTracker(TxTracker):
+    """TxTracker that reads statuses from the fake node instead of a JSON-RPC endpoint."""
+
+    def __init__(self, node: FakeNode, session_factory: Any, **kwargs: Any) -> None:
+        super().__init__("fake://", session_factory, **kwargs)
+        self.node = node
+
+    async def _fetch_statuses(self, tx_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        statuses = {h: self.node.transaction_status(h) for h in tx_hashes}
+        return {h: s for h, s in statuses.items() if s}
+
+
+class FakeStarknetClientPool(StarknetClientPool):
+    """StarknetClientPool whose accounts and contracts are served by a FakeNetwork.
+
+    Account leasing, nonce tracking, batching and tracking are the real
+    pool's code; only the starknet_py objects underneath are simulated.
+    """
+
+    def __init__(
+        self,
+        network: FakeNetwork,
+        signers: SignerPool,
+        tracker_interval: float = 2.0,
+        tracker_timeout: float = 900.0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__("fake://", signers, tracker_interval=tracker_interval, tracker_timeout=tracker_timeout, **kwargs)
+        self.network = network
+        self.tracker = FakeTxTracker(network.node, self.http_session, interval=tracker_interval, timeout=tracker_timeout)
+
+    async def account(self, signer: SignerAccount) -> Any:
+        account = self._accounts.get(signer.address)
+        if account is None:
+            account = self._accounts[signer.address] = _FakeAccount(self.network, signer.address)
+        return account
+
+    async def contract(self, address: int) -> Any:
+        contract = self._contracts.get(address)
+        if contract is None:
+            contract = self._contracts[address] = _FakeContract(address)
+        return contract
+
+
+def create_fake_network() -> FakeNetwork:
+    """Build the fake network from the FAKENET_* latency settings (seconds)."""
+    defaults = FakeLatencies()
+    latencies = FakeLatencies(
+        **{field: float(os.getenv(f"FAKENET_{field.upper()}_LATENCY", str(getattr(defaults, field)))) for field in FakeLatencies._fields[:-1]},
+        jitter=float(os.getenv("FAKENET_JITTER", str(defaults.jitter))),
+    )
+    seed = os.getenv("FAKENET_SEED")
+    return FakeNetwork(latencies, seed=int(seed) if seed else None)
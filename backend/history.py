@@ -0,0 +1,307 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from jobs import JOB_SUCCEEDED, Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "kind",
+    "network",
+    "owner",
+    "name",
+    "symbol",
+    "contract_address",
+    "class_hash",
+    "transaction_hash",
+    "job_id",
+    "params",
+    "stages",
+    "created_at",
+    "recorded_at",
+    "duration",
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        network TEXT NOT NULL,
+        owner TEXT,
+        name TEXT,
+        symbol TEXT,
+        contract_address TEXT,
+        class_hash TEXT,
+        transaction_hash TEXT,
+        job_id TEXT,
+        params TEXT,
+        stages TEXT,
+        created_at REAL NOT NULL,
+        recorded_at REAL NOT NULL,
+        duration REAL
+    )
+    """,
+    # Every lookup reads one network's rows newest first. Each index ends in
+    # recorded_at (and implicitly the rowid), so a page is a bounded index range
+    # scan in result order, with or without a time range, and never a sort
+    "CREATE INDEX IF NOT EXISTS history_owner ON history (network, owner, recorded_at)",
+    "CREATE INDEX IF NOT EXISTS history_symbol ON history (network, symbol, recorded_at)",
+    "CREATE INDEX IF NOT EXISTS history_contract ON history (network, contract_address, recorded_at)",
+    "CREATE INDEX IF NOT EXISTS history_recorded_at ON history (network, recorded_at)",
+)
+
+# Request params not worth keeping: deploy-contract's Cairo source, the mint's
+# wait flag, and callback URLs, which may carry a client's credentials
+_PARAM_SKIP = ("code", "wait", "callback_url")
+
+
+def normalize_address(value: Optional[str]) -> Optional[str]:
+    """Canonical hex for an address, so 0x0abc and 0xABC find the same rows."""
+    if not value:
+        return None
+    try:
+        return hex(int(value, 16))
+    except ValueError:
+        return value
+
+
+def parse_cursor(cursor: str) -> Tuple[float, int]:
+    """Read a page's ``next_cursor``; raises ValueError if it is not one."""
+    recorded_at, row_id = cursor.split(":")
+    return float(recorded_at), int(row_id)
+
+
+class HistoryQuery(NamedTuple):
+    owner: Optional[str] = None
+    symbol: Optional[str] = None
+    contract_address: Optional[str] = None
+    kind: Optional[str] = None
+    # Unix seconds, inclusive
+    since: Optional[float] = None
+    until: Optional[float] = None
+    limit: int = 50
+    # (recorded_at, id) of the previous page's last row, from its ``next_cursor``
+    cursor: Optional[Tuple[float, int]] = None
+
+
+class HistoryStore:
+    """Durable record of every successful deploy and mint, queryable without an indexer.
+
+    Rows go to a SQLite file in WAL mode so several worker processes share it
+    and readers never wait on the writer. Writes are appended to an in-memory
+    buffer and committed by a background thread in one transaction per
+    ``batch_size`` rows or ``flush_interval`` seconds, whichever comes first;
+    a query flushes the buffer first, so callers always see their own writes.
+    Pages are newest first and keyset-paginated on (recorded_at, id).
+    """
+
+    def __init__(
+        self, path: str, network: str, batch_size: int = 100, flush_interval: float = 0.5, max_limit: int = 500
+    ) -> None:
+        self.path = path
+        self.network = network
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_limit = max_limit
+        self.recorded = 0
+        self.flushes = 0
+        self.queries = 0
+        self.write_errors = 0
+        self._local = threading.local()
+        self._pending: List[Tuple[Any, ...]] = []
+        # Held across a whole flush so rows commit in the order they were recorded
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Condition()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        threading.Thread(target=self._writer, name="history-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            # WAL makes NORMAL durable across application crashes; only a power loss may drop the last commits
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def record(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        result: Dict[str, Any],
+        owner: Optional[str] = None,
+        job_id: Optional[str] = None,
+        stages: Optional[Dict[str, float]] = None,
+        created_at: Optional[float] = None,
+        duration: Optional[float] = None,
+    ) -> None:
+        """Buffer one successful deploy or mint; it reaches the database with the next flush."""
+        now = time.time()
+        row = (
+            kind,
+            self.network,
+            normalize_address(owner),
+            params.get("name") or result.get("name"),
+            params.get("symbol") or result.get("symbol"),
+            normalize_address(result.get("contract_address") or params.get("contract_address")),
+            result.get("class_hash"),
+            result.get("transaction_hash"),
+            job_id,
+            json.dumps({k: v for k, v in params.items() if k not in _PARAM_SKIP}, sort_keys=True),
+            json.dumps(stages) if stages else None,
+            created_at if created_at is not None else now,
+            now,
+            duration,
+        )
+        with self._wake:
+            self._pending.append(row)
+            self.recorded += 1
+            if len(self._pending) >= self.batch_size:
+                self._wake.notify()
+
+    def job_finished(self, job: Job) -> None:
+        """JobQueue listener: record a succeeded deploy job with its per-stage timings."""
+        if job.status != JOB_SUCCEEDED or job.result is None:
+            return
+        stages = {
+            stage["name"]: round(stage["finished_at"] - stage["started_at"], 6)
+            for stage in job.stages
+            if stage.get("finished_at") is not None and stage.get("started_at") is not None
+        }
+        self.record(
+            job.kind,
+            job.params,
+            job.result,
+            owner=job.meta.get("owner"),
+            job_id=job.id,
+            stages=stages,
+            created_at=job.created_at,
+            duration=job.finished_at - job.created_at if job.finished_at is not None else None,
+        )
+
+    def _writer(self) -> None:
+        while True:
+            with self._wake:
+                self._wake.wait_for(lambda: len(self._pending) >= self.batch_size, timeout=self.flush_interval)
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001
+                logger.exception("history flush failed")
+                # The rows are back in the buffer; give the database a moment before retrying
+                time.sleep(self.flush_interval)
+
+    def flush(self) -> int:
+        """Commit every buffered row in one transaction; returns how many were written."""
+        with self._flush_lock:
+            with self._wake:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            conn = self._conn()
+            try:
+                with conn:
+                    conn.executemany(
+                        f"INSERT INTO history ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                        rows,
+                    )
+            except sqlite3.Error:
+                # Put them back in front of anything recorded since, for the next flush to retry
+                with self._wake:
+                    self._pending[:0] = rows
+                    self.write_errors += 1
+                raise
+            self.flushes += 1
+            return len(rows)
+
+    def query(self, query: HistoryQuery) -> Dict[str, Any]:
+        """One page of this network's records matching ``query``, newest first, and the cursor of the next."""
+        if self._pending:
+            self.flush()
+        sql, args = self._select(query)
+        rows = self._conn().execute(sql, args).fetchall()
+        self.queries += 1
+        items = [self._item(row) for row in rows]
+        next_cursor = None
+        if len(items) == args[-1]:
+            # Opaque to clients; read back by parse_cursor
+            next_cursor = f"{items[-1]['recorded_at']!r}:{items[-1]['id']}"
+        return {"items": items, "next_cursor": next_cursor}
+
+    def _select(self, query: HistoryQuery) -> Tuple[str, List[Any]]:
+        clauses = ["network = ?"]
+        args: List[Any] = [self.network]
+        for column, value in (
+            ("owner", normalize_address(query.owner)),
+            ("symbol", query.symbol),
+            ("contract_address", normalize_address(query.contract_address)),
+            ("kind", query.kind),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if query.since is not None:
+            clauses.append("recorded_at >= ?")
+            args.append(query.since)
+        if query.until is not None:
+            clauses.append("recorded_at <= ?")
+            args.append(query.until)
+        if query.cursor is not None:
+            clauses.append("(recorded_at, id) < (?, ?)")
+            args.extend(query.cursor)
+        args.append(max(1, min(query.limit, self.max_limit)))
+        sql = (
+            f"SELECT id, {', '.join(_COLUMNS)} FROM history WHERE {' AND '.join(clauses)} "
+            "ORDER BY recorded_at DESC, id DESC LIMIT ?"
+        )
+        return sql, args
+
+    @staticmethod
+    def _item(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item["params"] = json.loads(item["params"]) if item["params"] else {}
+        item["stages"] = json.loads(item["stages"]) if item["stages"] else {}
+        return item
+
+    def stats(self) -> Dict[str, Any]:
+        with self._wake:
+            pending = len(self._pending)
+        return {
+            "network": self.network,
+            "recorded": self.recorded,
+            "pending": pending,
+            "flushes": self.flushes,
+            "write_errors": self.write_errors,
+            "queries": self.queries,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+        }
+
+
+def create_history(network: str, jobs: JobQueue) -> Optional[HistoryStore]:
+    """Open the history at HISTORY_PATH and record succeeded deploy jobs; HISTORY_ENABLED=0 disables it."""
+    if os.getenv("HISTORY_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    path = os.getenv("HISTORY_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".history.sqlite3")
+    history = HistoryStore(
+        path,
+        network,
+        batch_size=int(os.getenv("HISTORY_BATCH_SIZE", "100")),
+        flush_interval=float(os.getenv("HISTORY_FLUSH_INTERVAL", "0.5")),
+        max_limit=int(os.getenv("HISTORY_MAX_PAGE_SIZE", "500")),
+    )
+    jobs.add_listener(history.job_finished)
+    return history
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from jobs import JOB_SUCCEEDED, Job, JobQueue
+
+
+class IdempotencyConflict(Exception):
+    """An Idempotency-Key was reused with a different request payload."""
+
+
+class Claim(NamedTuple):
+    # The live job serving the request, or None when a stored result is replayed
+    job: Optional[Job]
+    # Snapshot of the finished job (see Job.to_dict) for replayed results
+    record: Optional[Dict[str, Any]]
+    reused: bool
+
+
+def fingerprint(kind: str, params: Dict[str, Any]) -> str:
+    """Stable hash of a validated request: same route and same normalised params, same fingerprint."""
+    canonical = json.dumps({"kind": kind, "params": params}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class RequestDeduplicator:
+    """Routes repeated deploy requests to the job that already serves them.
+
+    Every request is indexed by the fingerprint of its normalised payload and,
+    when the client sends one, by its ``Idempotency-Key``. A request matching a
+    queued or running job attaches to that job; one matching a succeeded job
+    gets the stored result back without touching scarb or sncast. Failed jobs
+    are forgotten so a retry runs the pipeline again. Finished results expire
+    after ``ttl`` seconds and the index holds at most ``max_entries`` keys,
+    dropping the oldest finished ones first.
+    """
+
+    def __init__(self, jobs: JobQueue, ttl: float = 86400.0, max_entries: int = 10000) -> None:
+        self.jobs = jobs
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.coalesced = 0
+        self.replayed = 0
+        # index key -> {"fingerprint", "job_id", "record", "expires_at"}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._keys_by_job: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        jobs.add_listener(self.job_finished)
+
+    def submit(
+        self,
+        kind: str,
+        runner: Callable[[Job], Dict[str, Any]],
+        params: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Claim:
+        """Return the job or stored result for this request, submitting a new job only if there is none.
+
+        Only ``params`` identify the request; ``meta`` goes to a newly submitted
+        job and is dropped when the request attaches to an existing one.
+        Raises IdempotencyConflict if ``idempotency_key`` was already used for another payload.
+        """
+        fp = fingerprint(kind, params)
+        keys = [f"payload:{fp}"]
+        if idempotency_key:
+            keys.insert(0, f"key:{kind}:{idempotency_key}")
+
+        with self._lock:
+            self._expire()
+            for index_key in keys:
+                entry = self._entries.get(index_key)
+                if entry is None:
+                    continue
+                if entry["fingerprint"] != fp:
+                    raise IdempotencyConflict(f"Idempotency-Key {idempotency_key!r} was used for a different request")
+                claim = self._claim(entry)
+                if claim is None:
+                    continue
+                self._entries.move_to_end(index_key)
+                # Make the other index key resolve to the same job from now on
+                for other in keys:
+                    if other not in self._entries:
+                        self._index(other, entry)
+                return claim
+
+            # Submitted under the lock so job_finished cannot run before the job is indexed
+            job = self.jobs.submit(kind, runner, params, meta)
+            entry = {"fingerprint": fp, "job_id": job.id, "record": None, "expires_at": None}
+            for index_key in keys:
+                self._index(index_key, entry)
+            self._evict()
+            return Claim(job, None, False)
+
+    def job_finished(self, job: Job) -> None:
+        """JobQueue listener: keep successful results for replay, forget failed ones."""
+        with self._lock:
+            index_keys = self._keys_by_job.pop(job.id, [])
+            record = job.to_dict() if job.status == JOB_SUCCEEDED else None
+            expires_at = time.time() + self.ttl
+            for index_key in index_keys:
+                entry = self._entries.get(index_key)
+                if entry is None or entry["job_id"] != job.id:
+                    # Already expired, evicted or taken over by a retry
+                    continue
+                if record is None:
+                    del self._entries[index_key]
+                else:
+                    entry.update(record=record, expires_at=expires_at)
+
+    def _claim(self, entry: Dict[str, Any]) -> Optional[Claim]:
+        if entry["record"] is not None:
+            self.replayed += 1
+            return Claim(None, entry["record"], True)
+        job = self.jobs.get(entry["job_id"])
+        if job is None or job.done:
+            # Finished but not yet seen by job_finished; the job itself has the answer
+            if job is not None and job.status == JOB_SUCCEEDED:
+                self.replayed += 1
+                return Claim(None, job.to_dict(), True)
+            return None
+        self.coalesced += 1
+        return Claim(job, None, True)
+
+    def _index(self, index_key: str, entry: Dict[str, Any]) -> None:
+        self._entries[index_key] = entry
+        if entry["record"] is None:
+            self._keys_by_job.setdefault(entry["job_id"], []).append(index_key)
+
+    def _expire(self) -> None:
+        now = time.time()
+        for index_key in [k for k, e in self._entries.items() if e["expires_at"] is not None and e["expires_at"] <= now]:
+            del self._entries[index_key]
+
+    def _evict(self) -> None:
+        # Oldest finished results go first; keys of live jobs are kept until they finish
+        if len(self._entries) <= self.max_entries:
+            return
+        for index_key in [k for k, e in self._entries.items() if e["record"] is not None]:
+            if len(self._entries) <= self.max_entries:
+                break
+            del self._entries[index_key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "in_flight": len(self._keys_by_job),
+                "coalesced": self.coalesced,
+                "replayed": self.replayed,
+                "ttl": self.ttl,
+                "max_entries": self.max_entries,
+            }
+
+
+def create_deduplicator(jobs: JobQueue) -> Optional[RequestDeduplicator]:
+    """Build the deduplicator from IDEMPOTENCY_* settings; IDEMPOTENCY_ENABLED=0 runs every request."""
+    if os.getenv("IDEMPOTENCY_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    return RequestDeduplicator(
+        jobs,
+        ttl=float(os.getenv("IDEMPOTENCY_TTL", "86400")),
+        max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000")),
+    )
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from jobs import JOB_FAILED, JOB_SUCCEEDED, Job
+
+SSE = "text/event-stream"
+NDJSON = "application/x-ndjson"
+# Proxies must pass events through as they are written
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# An idle stream sends a keep-alive this often (seconds) so proxies keep it open;
+# servers pass the JOB_EVENTS_HEARTBEAT setting from their Runtime
+HEARTBEAT_SECONDS = 15.0
+
+
+def stream_format(format_param: Optional[str], accept: Optional[str]) -> str:
+    """SSE unless NDJSON is asked for with ?format=ndjson or the Accept header."""
+    if format_param:
+        return NDJSON if format_param.lower() == "ndjson" else SSE
+    return NDJSON if accept and NDJSON in accept and SSE not in accept else SSE
+
+
+def resume_from(since: Optional[str], last_event_id: Optional[str]) -> int:
+    """First event to send: ``?since=<seq>``, else the one after an EventSource's Last-Event-ID."""
+    try:
+        if since is not None:
+            return max(0, int(since))
+        if last_event_id is not None:
+            return max(0, int(last_event_id) + 1)
+    except ValueError:
+        pass
+    return 0
+
+
+def render(event: Optional[Dict[str, Any]], mimetype: str) -> str:
+    """One event as an SSE message or NDJSON line; ``None`` renders a keep-alive."""
+    if mimetype == NDJSON:
+        return json.dumps(event if event is not None else {"type": "heartbeat"}) + "\n"
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def _is_final(event: Dict[str, Any]) -> bool:
+    return event["type"] == "status" and event["status"] in (JOB_SUCCEEDED, JOB_FAILED)
+
+
+def _ended_before(job: Job, since: int) -> bool:
+    # A client resuming after the final event has nothing left to wait for
+    last = job.last_event()
+    return last is not None and _is_final(last) and since > last["seq"]
+
+
+def iter_events(job: Job, since: int = 0, heartbeat: float = HEARTBEAT_SECONDS) -> Iterator[Optional[Dict[str, Any]]]:
+    """Yield the job's events from ``since`` as they happen, ``None`` when idle; ends with the final status."""
+    wake = threading.Event()
+    unwatch = job.watch(wake.set)
+    try:
+        while True:
+            # Clear before reading so an event emitted in between still wakes us
+            wake.clear()
+            events = job.events_since(since)
+            for event in events:
+                yield event
+                if _is_final(event):
+                    return
+                since = event["seq"] + 1
+            if not events and _ended_before(job, since):
+                return
+            if not events and not wake.wait(heartbeat):
+                yield None
+    finally:
+        unwatch()
+
+
+async def aiter_events(
+    job: Job, since: int = 0, heartbeat: float = HEARTBEAT_SECONDS
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """``iter_events`` for the event loop; the job may emit from other threads."""
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    unwatch = job.watch(lambda: loop.call_soon_threadsafe(wake.set))
+    try:
+        while True:
+            wake.clear()
+            events = job.events_since(since)
+            for event in events:
+                yield event
+                if _is_final(event):
+                    return
+                since = event["seq"] + 1
+            if not events and _ended_before(job, since):
+                return
+            if not events:
+                try:
+                    await asyncio.wait_for(wake.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+    finally:
+        unwatch()
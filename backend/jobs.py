@@ -0,0 +1,324 @@
+import asyncio
+import inspect
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional
+
+import event_loop
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# Per-job event log bound; the oldest events (in practice, log lines) go first
+DEFAULT_MAX_EVENTS = 2000
+
+
+class JobError(Exception):
+    """Raised by a job runner to fail the job with a JSON-serialisable payload."""
+
+    def __init__(self, message: str, **details: Any) -> None:
+        super().__init__(message)
+        self.message = message
+        self.details = details
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"error": self.message, **self.details}
+
+
+class Job:
+    """A unit of background work with per-stage status tracking.
+
+    Besides the snapshot in ``to_dict`` a job keeps an ordered, bounded log of
+    events (status changes, stage transitions, tool output lines) that
+    streaming clients read with ``events_since`` and follow with ``watch``.
+    ``meta`` carries caller context that is not part of the request itself,
+    such as the wallet /history lists the job under.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_events: int = DEFAULT_MAX_EVENTS,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.meta = meta or {}
+        self.status = JOB_QUEUED
+        self.stages: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._next_seq = 0
+        self._watchers: List[Callable[[], None]] = []
+
+    def update(self, **fields: Any) -> None:
+        with self._lock:
+            for key, value in fields.items():
+                setattr(self, key, value)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        """Append an event and wake every watcher; safe from any thread."""
+        with self._lock:
+            self._events.append({"seq": self._next_seq, "type": event_type, "time": time.time(), **data})
+            self._next_seq += 1
+            watchers = list(self._watchers)
+        for wake in watchers:
+            try:
+                wake()
+            except Exception:  # noqa: BLE001
+                logger.debug("job %s watcher failed", self.id, exc_info=True)
+
+    def events_since(self, seq: int) -> List[Dict[str, Any]]:
+        """Events numbered ``seq`` and later that are still retained."""
+        with self._lock:
+            first = self._next_seq - len(self._events)
+            return list(self._events)[max(0, seq - first):]
+
+    def last_event(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._events[-1] if self._events else None
+
+    def watch(self, wake: Callable[[], None]) -> Callable[[], None]:
+        """Call ``wake()`` after every new event; returns a function that stops watching."""
+        with self._lock:
+            self._watchers.append(wake)
+
+        def unwatch() -> None:
+            with self._lock:
+                if wake in self._watchers:
+                    self._watchers.remove(wake)
+
+        return unwatch
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Record a named pipeline stage; marks it failed if the body raises.
+
+        Keys the body puts in the yielded dict are attached to the stage when it ends.
+        """
+        entry: Dict[str, Any] = {"name": name, "status": JOB_RUNNING, "started_at": time.time()}
+        info: Dict[str, Any] = {}
+        with self._lock:
+            self.stages.append(entry)
+        self.emit("stage", stage=name, status=JOB_RUNNING)
+        try:
+            yield info
+        except BaseException:
+            with self._lock:
+                entry.update(info, status=JOB_FAILED, finished_at=time.time())
+            self.emit("stage", stage=name, status=JOB_FAILED, **info)
+            raise
+        with self._lock:
+            entry.update(info, status=JOB_SUCCEEDED, finished_at=time.time())
+        self.emit("stage", stage=name, status=JOB_SUCCEEDED, **info)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "stages": [dict(s) for s in self.stages],
+                "result": self.result,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class InProcessBackend:
+    """Runs jobs on a local thread pool; needs no broker or external services.
+
+    Coroutine runners are handed to the shared event loop and the worker
+    thread waits for them, so ``concurrency`` still bounds running jobs.
+    """
+
+    def __init__(self, concurrency: int = 2) -> None:
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job-worker")
+
+    def submit(self, fn: Callable[[], None]) -> None:
+        self._executor.submit(fn)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+class AsyncioBackend:
+    """Runs jobs as tasks on the shared event loop, at most ``concurrency`` at a time.
+
+    Suited to the async server: a job waiting on scarb, sncast or the node
+    holds no thread, so concurrency can be raised well past a thread pool's.
+    """
+
+    is_async = True
+
+    def __init__(self, concurrency: int = 2) -> None:
+        self.concurrency = concurrency
+        # Created on the loop by the first job so it binds to that loop
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def submit(self, fn: Callable[[], Awaitable[None]]) -> None:
+        event_loop.submit(self._limited(fn))
+
+    async def _limited(self, fn: Callable[[], Awaitable[None]]) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        async with self._slots:
+            await fn()
+
+    def shutdown(self, wait: bool = True) -> None:
+        pass
+
+
+BACKENDS: Dict[str, Callable[..., Any]] = {
+    "inprocess": InProcessBackend,
+    "asyncio": AsyncioBackend,
+}
+
+
+class JobQueue:
+    """Tracks submitted jobs and hands them to a worker backend.
+
+    A runner may be a plain function or return a coroutine; coroutines always
+    run on the shared event loop, whichever backend picked up the job.
+    """
+
+    def __init__(self, backend: Any, max_jobs: int = 1000, max_events: int = DEFAULT_MAX_EVENTS) -> None:
+        self.backend = backend
+        self.max_jobs = max_jobs
+        self.max_events = max_events
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Job], None]] = []
+        self._queued = 0
+        self._running = 0
+
+    def add_listener(self, fn: Callable[[Job], None]) -> None:
+        """Call ``fn(job)`` on the worker (thread or event loop) after every job finishes."""
+        self._listeners.append(fn)
+
+    def submit(
+        self,
+        kind: str,
+        runner: Callable[[Job], Any],
+        params: Optional[Dict[str, Any]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Job:
+        job = Job(kind, params, max_events=self.max_events, meta=meta)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._evict()
+        if getattr(self.backend, "is_async", False):
+            self.backend.submit(lambda: self._run_async(job, runner))
+        else:
+            self.backend.submit(lambda: self._run(job, runner))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def depth(self) -> Dict[str, int]:
+        """Jobs waiting for a worker slot and jobs holding one."""
+        with self._lock:
+            return {"queued": self._queued, "running": self._running}
+
+    def _evict(self) -> None:
+        # Drop the oldest finished jobs once we are over capacity; never drop live ones
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in [jid for jid, j in self._jobs.items() if j.done]:
+            if len(self._jobs) <= self.max_jobs:
+                break
+            del self._jobs[job_id]
+
+    def _run(self, job: Job, runner: Callable[[Job], Any]) -> None:
+        self._start(job)
+        try:
+            result = runner(job)
+            if inspect.isawaitable(result):
+                result = event_loop.run(result)
+        except Exception as e:  # noqa: BLE001
+            self._fail(job, e)
+        else:
+            job.update(status=JOB_SUCCEEDED, result=result, finished_at=time.time())
+        self._notify(job)
+
+    async def _run_async(self, job: Job, runner: Callable[[Job], Any]) -> None:
+        self._start(job)
+        try:
+            # A synchronous runner must not block the loop, so call it off-loop
+            result = await asyncio.to_thread(runner, job)
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as e:  # noqa: BLE001
+            self._fail(job, e)
+        else:
+            job.update(status=JOB_SUCCEEDED, result=result, finished_at=time.time())
+        self._notify(job)
+
+    def _start(self, job: Job) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        job.update(status=JOB_RUNNING, started_at=time.time())
+        job.emit("status", status=JOB_RUNNING)
+
+    def _fail(self, job: Job, e: Exception) -> None:
+        if isinstance(e, JobError):
+            logger.error("job %s (%s) failed: %s", job.id, job.kind, e.message)
+            job.update(status=JOB_FAILED, error=e.to_dict(), finished_at=time.time())
+        else:
+            logger.error("job %s (%s) crashed", job.id, job.kind, exc_info=e)
+            job.update(
+                status=JOB_FAILED,
+                error={"error": "internal error", "details": str(e)},
+                finished_at=time.time(),
+            )
+
+    def _notify(self, job: Job) -> None:
+        with self._lock:
+            self._running -= 1
+        # The terminal event: streams end after delivering it
+        job.emit("status", status=job.status, result=job.result, error=job.error)
+        for listener in self._listeners:
+            try:
+                listener(job)
+            except Exception:  # noqa: BLE001
+                logger.exception("job listener failed for %s", job.id)
+
+
+def create_job_queue() -> JobQueue:
+    """Build the job queue from JOB_BACKEND / JOB_CONCURRENCY / JOB_MAX_JOBS / JOB_MAX_EVENTS."""
+    backend_name = os.getenv("JOB_BACKEND", "inprocess").lower()
+    backend_cls = BACKENDS.get(backend_name)
+    if backend_cls is None:
+        raise ValueError(f"unknown JOB_BACKEND {backend_name!r}; choose one of {sorted(BACKENDS)}")
+    concurrency = int(os.getenv("JOB_CONCURRENCY", "2"))
+    max_jobs = int(os.getenv("JOB_MAX_JOBS", "1000"))
+    max_events = int(os.getenv("JOB_MAX_EVENTS", str(DEFAULT_MAX_EVENTS)))
+    return JobQueue(backend_cls(concurrency=concurrency), max_jobs=max_jobs, max_events=max_events)
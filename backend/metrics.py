@@ -0,0 +1,191 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Deploy stages run from milliseconds (cache hits) to minutes (declare waits)
+STAGE_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = STAGE_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts, sum, count)
+        self._series: Dict[LabelValues, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                inf = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class CounterFunc:
+    """Exports counters kept elsewhere (e.g. build cache stats) when scraped."""
+
+    def __init__(self, name: str, help_text: str, fn: Callable[[], float], metric_type: str = "counter") -> None:
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.metric_type = metric_type
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.metric_type}", f"{self.name} {_format_value(self.fn())}"]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Any) -> Any:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = STAGE_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def counter_func(self, name: str, help_text: str, fn: Callable[[], float]) -> CounterFunc:
+        return self.register(CounterFunc(name, help_text, fn))
+
+    def gauge_func(self, name: str, help_text: str, fn: Callable[[], float]) -> CounterFunc:
+        return self.register(CounterFunc(name, help_text, fn, metric_type="gauge"))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class OutputRing:
+    """Bounded buffer of full command output, kept off the log and only formatted when read."""
+
+    def __init__(self, maxlen: int = 200) -> None:
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def append(self, argv: Sequence[str], returncode: int, stdout: str, stderr: str, duration: float) -> None:
+        # Store references only; nothing is joined or formatted on the hot path
+        with self._lock:
+            self._entries.append(
+                {"at": time.time(), "argv": argv, "returncode": returncode, "stdout": stdout, "stderr": stderr, "seconds": duration}
+            )
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._entries)
+        if limit is not None:
+            entries = entries[-limit:]
+        return [{**e, "argv": list(e["argv"])} for e in entries]
+
+
+class ServiceMetrics:
+    """The service's metric set: stage histograms, per-route outcomes and command output."""
+
+    def __init__(self, output_ring_size: int = 200) -> None:
+        self.registry = MetricsRegistry()
+        self.stage_seconds = self.registry.histogram(
+            "starkflow_stage_seconds", "Duration of deploy and mint pipeline stages.", ("route", "stage")
+        )
+        self.results_total = self.registry.counter(
+            "starkflow_results_total", "Finished deploy jobs and mints by route and outcome.", ("route", "outcome")
+        )
+        self.http_requests_total = self.registry.counter(
+            "starkflow_http_requests_total", "HTTP responses by route and status code.", ("route", "status")
+        )
+        self.outputs = OutputRing(output_ring_size)
+
+    def observe_job(self, job: Any) -> None:
+        """JobQueue listener: record each finished stage's duration and the job outcome."""
+        for stage in job.to_dict()["stages"]:
+            if stage.get("finished_at") is not None:
+                self.stage_seconds.observe(stage["finished_at"] - stage["started_at"], route=job.kind, stage=stage["name"])
+        self.results_total.inc(route=job.kind, outcome=job.status)
+
+    def register_stats(self, prefix: str, stats_fn: Callable[[], Dict[str, Any]], counters: Iterable[str], gauges: Iterable[str] = ()) -> None:
+        """Export selected numeric fields of a component's ``stats()`` dict."""
+        for key in counters:
+            self.registry.counter_func(f"starkflow_{prefix}_{key}_total", f"{prefix} {key}.", lambda k=key: stats_fn()[k])
+        for key in gauges:
+            self.registry.gauge_func(f"starkflow_{prefix}_{key}", f"{prefix} {key}.", lambda k=key: stats_fn()[k])
+
+    def render(self) -> str:
+        return self.registry.render()
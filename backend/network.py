@@ -0,0 +1,68 @@
+import os
+from typing import Any, List, Optional
+
+DEFAULT_DEVNET_URL = "http://127.0.0.1:5050/rpc"
+
+_EXPLORER_TX_URLS = {
+    "sepolia": "https://sepolia.starkscan.co/tx/{}",
+    "mainnet": "https://starkscan.co/tx/{}",
+}
+
+
+class NetworkConfig:
+    """Where the pipeline and the mint client send their transactions.
+
+    ``name`` is the sncast network (sepolia, mainnet, devnet) unless ``url`` is
+    set, in which case sncast talks to that node directly. Ephemeral networks
+    (a local devnet, or the in-process fake) lose their state on restart, so
+    nothing learnt on them is persisted across processes. ``fake`` holds the
+    in-process stand-in when the network is simulated.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        account: Optional[str] = None,
+        url: Optional[str] = None,
+        rpc_url: Optional[str] = None,
+        ephemeral: bool = False,
+        fake: Optional[Any] = None,
+    ) -> None:
+        self.name = name
+        self.account = account or name
+        self.url = url
+        self.rpc_url = rpc_url
+        self.ephemeral = ephemeral
+        self.fake = fake
+
+    def sncast_account_args(self, account: Optional[str] = None) -> List[str]:
+        return [f"--account={account or self.account}"]
+
+    def sncast_network_args(self) -> List[str]:
+        return ["--url", self.url] if self.url else ["--network", self.name]
+
+    def tx_url(self, transaction_hash: str) -> Optional[str]:
+        template = _EXPLORER_TX_URLS.get(self.name)
+        return template.format(transaction_hash) if template else None
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "account": self.account, "url": self.url, "ephemeral": self.ephemeral}
+
+
+SEPOLIA = NetworkConfig("sepolia")
+
+
+def create_network() -> NetworkConfig:
+    """Build the network from STARKNET_NETWORK: sepolia (default), mainnet, devnet or fake."""
+    name = os.getenv("STARKNET_NETWORK", "sepolia").lower()
+    account = os.getenv("SNCAST_ACCOUNT") or None
+    if name in ("sepolia", "mainnet"):
+        return NetworkConfig(name, account=account, rpc_url=os.getenv("STARKNET_RPC") or None)
+    if name == "devnet":
+        url = os.getenv("DEVNET_URL", DEFAULT_DEVNET_URL)
+        return NetworkConfig(name, account=account, url=url, rpc_url=os.getenv("STARKNET_RPC") or url, ephemeral=True)
+    if name == "fake":
+        from fakenet import create_fake_network
+
+        return NetworkConfig(name, account=account, ephemeral=True, fake=create_fake_network())
+    raise ValueError(f"unknown STARKNET_NETWORK {name!r}; choose sepolia, mainnet, devnet or fake")
@@ -1,4 +1,5 @@
 pub mod your_collectible;
+pub mod your_collectible_template;
 pub mod components {
     pub mod counter;
 }
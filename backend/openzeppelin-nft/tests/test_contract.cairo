@@ -1,6 +1,10 @@
 use contracts::your_collectible::YourCollectible;
 use contracts::your_collectible::YourCollectible::{WrappedIERC721MetadataImpl, YourCollectibleImpl};
+use contracts::your_collectible::{IYourCollectibleDispatcher, IYourCollectibleDispatcherTrait};
 use core::traits::TryInto;
+use openzeppelin_access::ownable::interface::{IOwnableDispatcher, IOwnableDispatcherTrait};
+use openzeppelin_testing::declare_and_deploy;
+use openzeppelin_token::erc721::interface::{IERC721MetadataDispatcher, IERC721MetadataDispatcherTrait};
 use openzeppelin_token::erc721::ERC721Component;
 use openzeppelin_token::erc721::ERC721Component::{ERC721Impl, InternalImpl as ERC721InternalImpl};
 use openzeppelin_token::erc721::extensions::erc721_enumerable::ERC721EnumerableComponent;
@@ -178,3 +182,26 @@ fn test_mint_item2() {
     println!("token of owner by index: {:?}", index);
     assert(index == 1, 'Token must be 1');
 }
+
+#[test]
+fn test_collectible_template_constructor_calldata() {
+    // Exactly what backend/calldata.py nft_constructor_calldata(
+    //     "Starkflow Genesis Collection", "SFG", "https://ipfs.io/ipfs/QmTemplateBase/", "0x4f574e4552") produces
+    let calldata = array![
+        0x0, 0x537461726b666c6f772047656e6573697320436f6c6c656374696f6e, 0x1c,
+        0x0, 0x534647, 0x3,
+        0x1, 0x68747470733a2f2f697066732e696f2f697066732f516d54656d706c617465, 0x426173652f, 0x5,
+        0x4f574e4552,
+    ];
+    let contract_address = declare_and_deploy("YourCollectibleTemplate", calldata);
+
+    let metadata = IERC721MetadataDispatcher { contract_address };
+    assert(metadata.name() == "Starkflow Genesis Collection", 'name');
+    assert(metadata.symbol() == "SFG", 'symbol');
+
+    let owner: ContractAddress = 'OWNER'.try_into().unwrap();
+    assert(IOwnableDispatcher { contract_address }.owner() == owner, 'owner');
+
+    let token_id = IYourCollectibleDispatcher { contract_address }.mint_item(TESTER_ADDRESS, "1.json");
+    assert(metadata.token_uri(token_id) == "https://ipfs.io/ipfs/QmTemplateBase/1.json", 'token uri');
+}
@@ -0,0 +1,477 @@
+import asyncio
+import logging
+import os
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+from build_cache import BuildCache
+from cairo_preflight import CairoPreflightError, analyze
+from calldata import nft_constructor_calldata, token_constructor_calldata
+from class_registry import ClassRegistry, artifact_hash
+from jobs import Job, JobError
+from readiness import DeclarationWaiter
+from metrics import OutputRing
+from network import SEPOLIA, NetworkConfig
+from signers import SignerAccount, SignerPool, Turn
+from sncast_output import parse as parse_sncast_output
+from toolchain import CommandResult, OutputCallback, ToolchainExecutor
+from workspaces import WorkspaceManager
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+TOKEN_PROJECT_DIR = os.path.join(BACKEND_DIR, "token-contract")
+NFT_PROJECT_DIR = os.path.join(BACKEND_DIR, "openzeppelin-nft")
+CONTRACT_PROJECT_DIR = os.path.join(BACKEND_DIR, "contract-deployment")
+TEMPLATE_DIRS = (TOKEN_PROJECT_DIR, NFT_PROJECT_DIR, CONTRACT_PROJECT_DIR)
+
+NFT_OWNER_ADDRESS = "0x04C23F4996013A9A52C78B9f5Ae4D116AC1cb70BB1ED36e193E2901C6479e626"
+
+# Parameterised variants of MyToken/YourCollectible that take their metadata as
+# constructor calldata; declared once and deployed per request without a rebuild
+TOKEN_TEMPLATE_CONTRACT = "MyTokenTemplate"
+NFT_TEMPLATE_CONTRACT = "YourCollectibleTemplate"
+DEFAULT_DECIMALS = 18
+
+# /deploy-contract submissions must define this contract module
+CONTRACT_NAME = "YourContract"
+
+# Failed jobs keep only the end of a tool's output; the full text was streamed
+# to /jobs/<id>/events as it was produced and is kept in /debug/command-output
+ERROR_OUTPUT_TAIL = 4096
+
+# Without per-job workspaces every request for a project renders into the same
+# source file and scarb target dir, so jobs must not interleave within a project.
+# The pipeline runs on the shared event loop, so these are asyncio locks.
+_project_locks: Dict[str, asyncio.Lock] = {}
+
+
+class Declaration(NamedTuple):
+    class_hash: str
+    transaction_hash: Optional[str]
+    already_declared: bool
+    contract_name: Optional[str] = None
+    # sha256 of the Sierra class, used as the class registry key
+    artifact_hash: Optional[str] = None
+    from_registry: bool = False
+
+
+def _project_lock(project_dir: str) -> asyncio.Lock:
+    return _project_locks.setdefault(project_dir, asyncio.Lock())
+
+
+def is_literal_safe(value: str) -> bool:
+    """Whether ``value`` can go verbatim between the quotes of a Cairo string literal.
+
+    Quotes and backslashes would end the literal or start an escape, and
+    control characters do not belong in one.
+    """
+    return value.isprintable() and '"' not in value and "\\" not in value
+
+
+def render_token_source(
+    cairo_src: str, name: str, symbol: str, max_token: int, decimals: Optional[int] = None
+) -> str:
+    """Patch the MyToken constructor constants into erc20_token.cairo.
+
+    ``name`` and ``symbol`` must pass ``is_literal_safe``; the validators check.
+    Raises ValueError if a constructor line we rewrite is missing from the source.
+    """
+    replacements = [
+        # Replace name and symbol (ByteArray string literals)
+        (r'let\s+name:\s*ByteArray\s*=\s*".*?";', f'let name: ByteArray = "{name}";'),
+        (r'let\s+symbol:\s*ByteArray\s*=\s*".*?";', f'let symbol: ByteArray = "{symbol}";'),
+        # initial_supply from max_token
+        (r"let\s+initial_supply:\s*u256\s*=\s*\d+;", f"let initial_supply: u256 = {max_token};"),
+    ]
+    # Decimals remains 18 by default; only change if provided
+    if decimals is not None:
+        replacements.append((r"let\s+decimals:\s*u8\s*=\s*\d+;", f"let decimals: u8 = {decimals};"))
+
+    updated_src = cairo_src
+    for pattern, replacement in replacements:
+        updated_src, count = re.subn(pattern, lambda _m, r=replacement: r, updated_src, count=1)
+        if count == 0:
+            raise ValueError(f"constructor line not found: {pattern}")
+    return updated_src
+
+
+def render_nft_source(cairo_src: str, name: str, symbol: str, base_uri: str) -> str:
+    """Patch the YourCollectible constructor constants into your_collectible.cairo.
+
+    The strings must pass ``is_literal_safe``; the validators check.
+    """
+    updated_src = re.sub(
+        r'let\s+name:\s*ByteArray\s*=\s*".*?";',
+        f'let name: ByteArray = "{name}";',
+        cairo_src,
+        count=1,
+    )
+    updated_src = re.sub(
+        r'let\s+symbol:\s*ByteArray\s*=\s*".*?";',
+        f'let symbol: ByteArray = "{symbol}";',
+        updated_src,
+        count=1,
+    )
+
+    # Remove owner param from constructor signature
+    updated_src = re.sub(
+        r"fn\s+constructor\(ref\s+self:\s*ContractState\s*,\s*owner:\s*ContractAddress\)",
+        "fn constructor(ref self: ContractState)",
+        updated_src,
+        count=1,
+    )
+    # Hardcode owner before initializer
+    updated_src = re.sub(
+        r"self\.ownable\.initializer\(\s*owner\s*\);",
+        (
+            f"let owner: ContractAddress = {NFT_OWNER_ADDRESS}"
+            ".try_into().unwrap();\n        self.ownable.initializer(owner);"
+        ),
+        updated_src,
+        count=1,
+    )
+    updated_src = re.sub(
+        r'let\s+base_uri:\s*ByteArray\s*=\s*".*?";',
+        f'let base_uri: ByteArray = "{base_uri}";',
+        updated_src,
+        count=1,
+    )
+    return updated_src
+
+
+def _read_source(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise JobError("contract source not found", path=path)
+    except OSError as e:
+        raise JobError("failed to read contract source", details=str(e))
+
+
+def _write_source(path: str, content: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    except OSError as e:
+        raise JobError("failed to write contract source", details=str(e))
+
+
+def _tail(output: str) -> str:
+    return output if len(output) <= ERROR_OUTPUT_TAIL else "..." + output[-ERROR_OUTPUT_TAIL:]
+
+
+def _output_to(job: Job, tool: str) -> OutputCallback:
+    return lambda stream, line: job.emit("log", tool=tool, stream=stream, line=line)
+
+
+class DeployPipeline:
+    """Build, declare and deploy stages shared by the deploy routes.
+
+    Stages are coroutines meant for the shared event loop: scarb and sncast
+    run as asyncio subprocesses, the declaration wait sleeps on the loop, and
+    the remaining file-system work (cache copies, hashing, workspaces) is
+    pushed to worker threads so one job never stalls the others.
+    """
+
+    def __init__(
+        self,
+        waiter: Optional[DeclarationWaiter] = None,
+        build_cache: Optional[BuildCache] = None,
+        class_registry: Optional[ClassRegistry] = None,
+        workspaces: Optional[WorkspaceManager] = None,
+        toolchain: Optional[ToolchainExecutor] = None,
+        outputs: Optional[OutputRing] = None,
+        precompiled_templates: bool = False,
+        network: Optional[NetworkConfig] = None,
+        signers: Optional[SignerPool] = None,
+        sncast_json: bool = False,
+    ) -> None:
+        self.waiter = waiter or DeclarationWaiter()
+        self.build_cache = build_cache
+        self.class_registry = class_registry
+        self.workspaces = workspaces
+        self.toolchain = toolchain or ToolchainExecutor()
+        self.outputs = outputs
+        self.precompiled_templates = precompiled_templates
+        self.network = network or SEPOLIA
+        self.signers = signers or SignerPool([SignerAccount(self.network.account)])
+        # Ask sncast for JSON lines instead of its human-readable output
+        self.sncast_json = sncast_json
+        # contract name -> confirmed declaration of a template class
+        self._template_classes: Dict[str, Declaration] = {}
+        self._template_locks: Dict[str, asyncio.Lock] = {}
+
+    def _record(self, result: CommandResult) -> None:
+        # Full output goes to the ring buffer for diagnostics, not the log
+        logger.debug("Command: %s -> %s (%.2fs)", result.argv, result.returncode, result.duration)
+        if self.outputs is not None:
+            self.outputs.append(result.argv, result.returncode, result.stdout, result.stderr, result.duration)
+
+    async def _sncast(self, job: Job, command: List[str], cwd: str, stage: Dict[str, Any]) -> Tuple[int, str, str]:
+        """Run an sncast transaction ``command`` (subcommand first) as a leased account, at its tracked nonce."""
+        async with self.signers.lease() as lease:
+            stage["account"] = lease.account.name
+
+            async def transaction(turn: Turn) -> CommandResult:
+                args = [*self.network.sncast_account_args(lease.account.name)]
+                if self.sncast_json:
+                    args.append("--json")
+                args.append(command[0])
+                if turn.nonce is not None:
+                    args += ["--nonce", str(turn.nonce)]
+                result = await self.toolchain.asncast([*args, *command[1:]], cwd, on_line=_output_to(job, "sncast"))
+                if result.returncode != 0:
+                    # Nothing was sent (or the node refused it); a nonce error re-syncs and retries once
+                    turn.failed(result.stderr or result.stdout)
+                return result
+
+            result = await lease.send(transaction)
+        self._record(result)
+        return result.returncode, result.stdout, result.stderr
+
+    async def build(self, job: Job, project_dir: str) -> None:
+        """Run scarb build, or restore identical artifacts from the build cache."""
+        target_dir = os.path.join(project_dir, "target", "dev")
+        with job.stage("build") as stage:
+            cache_key = await asyncio.to_thread(self.build_cache.key, project_dir) if self.build_cache else None
+            if cache_key and await asyncio.to_thread(self.build_cache.restore, cache_key, target_dir):
+                logger.info("scarb build skipped: build cache hit %s", cache_key[:12])
+                stage["cache"] = "hit"
+                return
+
+            result = await self.toolchain.ascarb_build(project_dir, on_line=_output_to(job, "scarb"))
+            self._record(result)
+            code, out, err = result.returncode, result.stdout, result.stderr
+            logger.info("scarb build -> code=%s", code)
+            if code != 0:
+                logger.error("scarb build failed: %s", err or out)
+                raise JobError("scarb build failed", stdout=_tail(out), stderr=_tail(err))
+            if cache_key:
+                await asyncio.to_thread(self.build_cache.store, cache_key, target_dir)
+                stage["cache"] = "miss"
+
+    async def build_and_declare(self, job: Job, project_dir: str, contract_name: str) -> Declaration:
+        """Build the project and sncast declare ``contract_name``."""
+        await self.build(job, project_dir)
+
+        with job.stage("declare") as stage:
+            art_hash = None
+            if self.class_registry is not None:
+                art_hash = await asyncio.to_thread(artifact_hash, os.path.join(project_dir, "target", "dev"), contract_name)
+                known_class_hash = (
+                    await asyncio.to_thread(self.class_registry.get, self.network.name, art_hash) if art_hash else None
+                )
+                if known_class_hash:
+                    logger.info("declare skipped: %s already declared as %s", contract_name, known_class_hash)
+                    stage["registry"] = "hit"
+                    return Declaration(
+                        class_hash=known_class_hash,
+                        transaction_hash=None,
+                        already_declared=True,
+                        contract_name=contract_name,
+                        artifact_hash=art_hash,
+                        from_registry=True,
+                    )
+                stage["registry"] = "miss"
+
+            declare_args = [
+                "declare",
+                f"--contract-name={contract_name}",
+                *self.network.sncast_network_args(),
+            ]
+            code, out, err = await self._sncast(job, declare_args, cwd=project_dir, stage=stage)
+            logger.info("declare -> code=%s", code)
+            output = parse_sncast_output(out, err, code)
+            already_declared = output.already_declared
+            if code != 0 and not already_declared:
+                logger.error("declare failed: %s", output.error or err or out)
+                raise JobError("declare failed", stdout=_tail(out), stderr=_tail(err))
+
+            class_hash = output.class_hash
+            if not class_hash:
+                raise JobError("could not determine class hash from declare output", stdout=_tail(out), stderr=_tail(err))
+        return Declaration(
+            class_hash=class_hash,
+            transaction_hash=output.transaction_hash,
+            already_declared=already_declared,
+            contract_name=contract_name,
+            artifact_hash=art_hash,
+        )
+
+    async def await_declaration(self, job: Job, declaration: Declaration) -> None:
+        """Wait until the declared class is deployable and remember it in the class registry."""
+        with job.stage("wait") as stage:
+            stage.update(
+                await self.waiter.wait(
+                    declaration.class_hash,
+                    tx_hash=declaration.transaction_hash,
+                    already_declared=declaration.already_declared,
+                )
+            )
+        if self.class_registry is not None and declaration.artifact_hash and not declaration.from_registry:
+            # Only remember classes the chain has confirmed
+            await asyncio.to_thread(
+                self.class_registry.put,
+                self.network.name,
+                declaration.artifact_hash,
+                declaration.class_hash,
+                declaration.contract_name,
+            )
+
+    async def deploy_class(
+        self, job: Job, project_dir: str, declaration: Declaration, calldata: List[str]
+    ) -> Dict[str, str]:
+        """Wait for the declaration to land, then sncast deploy its class hash."""
+        await self.await_declaration(job, declaration)
+        return await self.deploy(job, project_dir, declaration.class_hash, calldata)
+
+    async def deploy(self, job: Job, project_dir: str, class_hash: str, calldata: List[str]) -> Dict[str, str]:
+        """sncast deploy an already declared class hash and parse the new contract's address."""
+        with job.stage("deploy") as stage:
+            deploy_args = [
+                "deploy",
+                "--class-hash",
+                class_hash,
+                "--salt",
+                "0x1",
+                *self.network.sncast_network_args(),
+            ]
+            if calldata:
+                deploy_args += ["--constructor-calldata", *calldata]
+            code, out, err = await self._sncast(job, deploy_args, cwd=project_dir, stage=stage)
+            logger.info("deploy -> code=%s", code)
+            if code != 0:
+                logger.error("deploy failed: %s", err or out)
+                raise JobError("deploy failed", stdout=_tail(out), stderr=_tail(err))
+
+        with job.stage("parse"):
+            output = parse_sncast_output(out, err, code)
+            contract_address = output.contract_address
+            transaction_hash = output.transaction_hash
+            if not contract_address or not transaction_hash:
+                raise JobError("could not parse deploy output", stdout=_tail(out), stderr=_tail(err))
+
+        return {
+            "class_hash": class_hash,
+            "contract_address": contract_address,
+            "transaction_hash": transaction_hash,
+            "transaction_url": self.network.tx_url(transaction_hash),
+        }
+
+    async def template_class(self, job: Job, template_dir: str, contract_name: str) -> Declaration:
+        """Return the confirmed declaration of a template class, building and declaring it on first use."""
+        # Concurrent first uses of one template share a single build and declare
+        async with self._template_locks.setdefault(contract_name, asyncio.Lock()):
+            declaration = self._template_classes.get(contract_name)
+            if declaration is None:
+                # The template sources are never rendered, so the build cache and
+                # class registry make this cheap after the first process start too
+                async with self.checkout(template_dir) as project_dir:
+                    declaration = await self.build_and_declare(job, project_dir, contract_name)
+                await self.await_declaration(job, declaration)
+                declaration = declaration._replace(transaction_hash=None, already_declared=True)
+                self._template_classes[contract_name] = declaration
+                return declaration
+        with job.stage("declare") as stage:
+            stage["template"] = "cached"
+        return declaration
+
+    async def deploy_template(
+        self, job: Job, template_dir: str, contract_name: str, calldata: List[str]
+    ) -> Dict[str, str]:
+        """Launch a token/collection from its precompiled template class: one deploy, no compilation."""
+        declaration = await self.template_class(job, template_dir, contract_name)
+        return await self.deploy(job, template_dir, declaration.class_hash, calldata)
+
+    @asynccontextmanager
+    async def checkout(self, template_dir: str) -> AsyncIterator[str]:
+        """Yield the directory a job should render and build in."""
+        if self.workspaces is None:
+            # Without workspaces every job shares the template's source file and target dir
+            async with _project_lock(template_dir):
+                yield template_dir
+        else:
+            workspace_dir = await asyncio.to_thread(self.workspaces.create, template_dir)
+            try:
+                yield workspace_dir
+            finally:
+                self.workspaces.release(workspace_dir)
+
+    async def run_token_job(
+        self, job: Job, name: str, symbol: str, max_token: int, decimals: Optional[int]
+    ) -> Dict[str, Any]:
+        if self.precompiled_templates:
+            try:
+                calldata = token_constructor_calldata(
+                    name, symbol, DEFAULT_DECIMALS if decimals is None else decimals, max_token
+                )
+            except ValueError as e:
+                raise JobError("invalid constructor arguments", details=str(e))
+            deployed = await self.deploy_template(job, TOKEN_PROJECT_DIR, TOKEN_TEMPLATE_CONTRACT, calldata)
+            logger.info("Deployed token %s (%s) from template at %s", name, symbol, deployed["contract_address"])
+            return {"name": name, "symbol": symbol, "max_token": max_token, **deployed}
+
+        async with self.checkout(TOKEN_PROJECT_DIR) as project_dir:
+            contract_src_path = os.path.join(project_dir, "src", "erc20_token.cairo")
+            with job.stage("render"):
+                cairo_src = _read_source(contract_src_path)
+                try:
+                    updated_src = render_token_source(cairo_src, name, symbol, max_token, decimals)
+                except ValueError as e:
+                    raise JobError(
+                        "contract source unchanged after edit",
+                        hint="Regex did not match current constructor lines. Please share current lines around constructor.",
+                        path=contract_src_path,
+                        details=str(e),
+                    )
+                _write_source(contract_src_path, updated_src)
+            declaration = await self.build_and_declare(job, project_dir, "MyToken")
+            deployed = await self.deploy_class(job, project_dir, declaration, [])
+
+        logger.info(
+            "Deployed token: name=%s, symbol=%s, max_token=%s, class_hash=%s, address=%s, tx=%s",
+            name,
+            symbol,
+            max_token,
+            deployed["class_hash"],
+            deployed["contract_address"],
+            deployed["transaction_hash"],
+        )
+        return {"name": name, "symbol": symbol, "max_token": max_token, **deployed}
+
+    async def run_nft_job(self, job: Job, name: str, symbol: str, base_uri: str) -> Dict[str, Any]:
+        if self.precompiled_templates:
+            calldata = nft_constructor_calldata(name, symbol, base_uri, NFT_OWNER_ADDRESS)
+            deployed = await self.deploy_template(job, NFT_PROJECT_DIR, NFT_TEMPLATE_CONTRACT, calldata)
+            return {"name": name, "symbol": symbol, "base_uri": base_uri, **deployed}
+
+        async with self.checkout(NFT_PROJECT_DIR) as project_dir:
+            contract_path = os.path.join(project_dir, "src", "your_collectible.cairo")
+            with job.stage("render"):
+                cairo_src = _read_source(contract_path)
+                _write_source(contract_path, render_nft_source(cairo_src, name, symbol, base_uri))
+            declaration = await self.build_and_declare(job, project_dir, "YourCollectible")
+            # No constructor calldata required (owner hardcoded)
+            deployed = await self.deploy_class(job, project_dir, declaration, [])
+
+        return {"name": name, "symbol": symbol, "base_uri": base_uri, **deployed}
+
+    async def run_contract_job(self, job: Job, cairo_code: str) -> Dict[str, Any]:
+        with job.stage("preflight") as stage:
+            # Routes reject bad submissions up front; this guards other callers and records the constructor
+            try:
+                analysis = analyze(cairo_code, contract_name=CONTRACT_NAME)
+            except CairoPreflightError as e:
+                raise JobError(e.message, **e.details)
+            stage["constructor"] = [{"name": p.name, "type": p.type} for p in analysis.constructor]
+        async with self.checkout(CONTRACT_PROJECT_DIR) as project_dir:
+            src_path = os.path.join(project_dir, "src", "your_contract.cairo")
+            with job.stage("render"):
+                _write_source(src_path, cairo_code)
+            declaration = await self.build_and_declare(job, project_dir, CONTRACT_NAME)
+            # Every constructor parameter gets its zero value, serialized as the contract expects
+            return await self.deploy_class(job, project_dir, declaration, analysis.calldata)
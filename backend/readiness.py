@@ -0,0 +1,163 @@
+import asyncio
+import inspect
+import itertools
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from jobs import JobError
+
+logger = logging.getLogger(__name__)
+
+# Finality states after which a declared class can be referenced by a deploy
+_ACCEPTED_STATUSES = ("ACCEPTED_ON_L2", "ACCEPTED_ON_L1")
+# starknet JSON-RPC error code for an unknown class hash
+_CLASS_HASH_NOT_FOUND = 28
+
+
+class DeclarationNotReady(JobError):
+    """The declaration was rejected, reverted, or did not land before the deadline."""
+
+
+class RpcStatusSource:
+    """Reads class and transaction status from a starknet JSON-RPC node.
+
+    Calls are coroutines on the shared event loop and reuse one aiohttp
+    session, so polling many declarations costs no threads and no per-poll
+    connection setup.
+    """
+
+    def __init__(self, rpc_url: str, timeout: float = 10.0) -> None:
+        self.rpc_url = rpc_url
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        body = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        async with self._session.post(self.rpc_url, json=body) as resp:
+            return await resp.json(content_type=None)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+    async def is_class_declared(self, class_hash: str) -> bool:
+        reply = await self._call("starknet_getClass", {"block_id": "latest", "class_hash": class_hash})
+        if "result" in reply:
+            return True
+        if reply.get("error", {}).get("code") == _CLASS_HASH_NOT_FOUND:
+            return False
+        raise RuntimeError(f"starknet_getClass failed: {reply.get('error')}")
+
+    async def transaction_status(self, tx_hash: str) -> Dict[str, Any]:
+        """Returns the raw ``{finality_status, execution_status}`` dict, or {} if unknown."""
+        reply = await self._call("starknet_getTransactionStatus", {"transaction_hash": tx_hash})
+        return reply.get("result") or {}
+
+    async def get_nonce(self, address: str) -> int:
+        reply = await self._call("starknet_getNonce", {"block_id": "latest", "contract_address": address})
+        if "result" not in reply:
+            raise RuntimeError(f"starknet_getNonce failed: {reply.get('error')}")
+        return int(reply["result"], 16)
+
+
+class DeclarationWaiter:
+    """Waits until a declared class can be deployed, polling with exponential backoff.
+
+    ``source`` is anything with ``is_class_declared`` and ``transaction_status``
+    (an RPC node, or fakenet's ``FakeNode``); either may be a coroutine. The
+    wait itself is a coroutine, so a slow declaration holds no thread. Without
+    a source the waiter falls back to a fixed delay, matching the old behaviour.
+    """
+
+    def __init__(
+        self,
+        source: Optional[Any] = None,
+        initial_delay: float = 1.0,
+        max_delay: float = 8.0,
+        multiplier: float = 2.0,
+        timeout: float = 180.0,
+        fallback_delay: float = 30.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.source = source
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.timeout = timeout
+        self.fallback_delay = fallback_delay
+        self.sleep = sleep
+        self.clock = clock
+
+    @staticmethod
+    async def _resolve(value: Any) -> Any:
+        return await value if inspect.isawaitable(value) else value
+
+    async def _is_ready(self, class_hash: str, tx_hash: Optional[str]) -> bool:
+        if tx_hash:
+            status = await self._resolve(self.source.transaction_status(tx_hash))
+            finality = status.get("finality_status")
+            if finality == "REJECTED" or status.get("execution_status") == "REVERTED":
+                raise DeclarationNotReady(
+                    "declare transaction failed", transaction_hash=tx_hash, status=status
+                )
+            if finality in _ACCEPTED_STATUSES:
+                return True
+        return await self._resolve(self.source.is_class_declared(class_hash))
+
+    async def wait(self, class_hash: str, tx_hash: Optional[str] = None, already_declared: bool = False) -> Dict[str, Any]:
+        """Wait until ``class_hash`` is deployable; returns how long and how often we polled."""
+        if already_declared:
+            return {"skipped": True, "attempts": 0, "waited": 0.0}
+        if self.source is None:
+            await self.sleep(self.fallback_delay)
+            return {"skipped": False, "attempts": 0, "waited": self.fallback_delay}
+
+        started = self.clock()
+        deadline = started + self.timeout
+        delay = self.initial_delay
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                if await self._is_ready(class_hash, tx_hash):
+                    return {"skipped": False, "attempts": attempts, "waited": self.clock() - started}
+            except DeclarationNotReady:
+                raise
+            except Exception as e:  # noqa: BLE001
+                # Transient RPC failures are retried like a "not yet" answer
+                logger.warning("readiness poll for %s failed: %s", class_hash, e)
+
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                raise DeclarationNotReady(
+                    "timed out waiting for class declaration",
+                    class_hash=class_hash,
+                    transaction_hash=tx_hash,
+                    attempts=attempts,
+                )
+            await self.sleep(min(delay, remaining))
+            delay = min(delay * self.multiplier, self.max_delay)
+
+
+def create_waiter(network: Optional[Any] = None) -> DeclarationWaiter:
+    """Build the waiter from the network's RPC (or STARKNET_RPC) and the DECLARE_WAIT_* settings."""
+    if network is not None and network.fake is not None:
+        source = network.fake.node
+    else:
+        rpc_url = network.rpc_url if network is not None else os.getenv("STARKNET_RPC")
+        source = RpcStatusSource(rpc_url) if rpc_url else None
+    return DeclarationWaiter(
+        source=source,
+        initial_delay=float(os.getenv("DECLARE_WAIT_INITIAL_DELAY", "1")),
+        max_delay=float(os.getenv("DECLARE_WAIT_MAX_DELAY", "8")),
+        timeout=float(os.getenv("DECLARE_WAIT_TIMEOUT", "180")),
+        fallback_delay=float(os.getenv("DECLARE_WAIT_FALLBACK_DELAY", "30")),
+    )
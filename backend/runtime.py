@@ -0,0 +1,250 @@
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from admission import ROUTE_CLASSES, AdmissionController, Rejection, create_admission
+from build_cache import BuildCache, create_build_cache
+from cairo_preflight import MAX_SOURCE_BYTES
+from class_registry import create_class_registry
+from history import HistoryStore, create_history
+from idempotency import Claim, RequestDeduplicator, create_deduplicator
+from job_events import HEARTBEAT_SECONDS
+from jobs import Job, JobQueue, create_job_queue
+from metrics import ServiceMetrics
+from network import NetworkConfig, create_network
+from pipeline import TEMPLATE_DIRS, DeployPipeline
+from readiness import create_waiter
+from signers import SignerPool, create_signer_pool
+from starknet_client import StarknetClientPool, StarknetUnavailable, get_client_pool
+from toolchain import ToolchainExecutor, create_toolchain
+from tx_tracker import TX_SUCCEEDED
+from workspaces import create_workspace_manager
+
+
+class Runtime:
+    """The services one backend process serves from, shared by the Flask and async servers."""
+
+    def __init__(
+        self,
+        network: NetworkConfig,
+        metrics: ServiceMetrics,
+        jobs: JobQueue,
+        dedup: Optional[RequestDeduplicator],
+        build_cache: Optional[BuildCache],
+        toolchain: ToolchainExecutor,
+        deployer: DeployPipeline,
+        signers: SignerPool,
+        admission: Optional[AdmissionController] = None,
+        history: Optional[HistoryStore] = None,
+    ) -> None:
+        self.network = network
+        self.metrics = metrics
+        self.jobs = jobs
+        self.dedup = dedup
+        self.build_cache = build_cache
+        self.toolchain = toolchain
+        self.deployer = deployer
+        self.signers = signers
+        self.admission = admission
+        self.history = history
+        self.default_batch_size = int(os.getenv("MINT_BATCH_SIZE", "25"))
+        self.max_batch_items = int(os.getenv("MINT_BATCH_MAX_ITEMS", "10000"))
+        self.events_heartbeat = float(os.getenv("JOB_EVENTS_HEARTBEAT", str(HEARTBEAT_SECONDS)))
+        self.max_source_bytes = int(os.getenv("CAIRO_MAX_SOURCE_BYTES", str(MAX_SOURCE_BYTES)))
+
+    def submit(
+        self,
+        kind: str,
+        runner: Callable[[Job], Any],
+        params: Dict[str, Any],
+        idempotency_key: Optional[str],
+        client: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Claim:
+        """Submit a deploy job, or attach to the job of an identical request.
+
+        ``params`` decide whether two requests are identical; ``meta`` (the
+        history owner) does not. A new job counts against ``client``'s
+        in-flight limit until it finishes. Raises IdempotencyConflict if the
+        key was used with a different body.
+        """
+        if self.dedup is None:
+            claim = Claim(self.jobs.submit(kind, runner, params, meta), None, False)
+        else:
+            claim = self.dedup.submit(kind, runner, params, idempotency_key, meta)
+        if self.admission is not None and client is not None and claim.job is not None and not claim.reused:
+            self.admission.track(client, claim.job)
+        return claim
+
+    def admit(self, route: Optional[str], client: str) -> Optional[Rejection]:
+        """Admission for a request to ``route`` (a URL rule); None if it may proceed or the route is not limited."""
+        route_class = ROUTE_CLASSES.get(route or "")
+        if self.admission is None or route_class is None:
+            return None
+        return self.admission.admit(route_class, client)
+
+    def release(self, route: Optional[str]) -> None:
+        """Call once an admitted request to ``route`` has been answered, streamed bodies included."""
+        route_class = ROUTE_CLASSES.get(route or "")
+        if self.admission is not None and route_class is not None:
+            self.admission.release(route_class)
+
+    def mint_pool(self) -> Tuple[Optional[StarknetClientPool], Optional[Tuple[Dict[str, Any], int]]]:
+        """Return (pool, None), or (None, (error body, status)) if minting is not configured."""
+        try:
+            pool = get_client_pool(self.network, self.signers)
+        except StarknetUnavailable as e:
+            return None, ({
+                "error": "starknet_py not available",
+                "details": str(e),
+                "hint": "pip install starknet-py",
+            }, 500)
+        if pool is None:
+            return None, ({
+                "error": "missing starknet credentials",
+                "hint": "Set STARKNET_RPC and STARKNET_ACCOUNT_ADDRESS/STARKNET_PRIVATE_KEY (or SIGNER_ACCOUNTS_FILE), optional STARKNET_CHAIN_ID",
+            }, 400)
+        return pool, None
+
+    def network_info(self) -> Dict[str, Any]:
+        info = self.network.to_dict()
+        if self.network.fake is not None:
+            info["fake"] = self.network.fake.stats()
+        return info
+
+    def mint_finished(
+        self, mint: Dict[str, Any], result: Dict[str, Any], started: float, wait: bool = True
+    ) -> Tuple[Dict[str, Any], int]:
+        """Record a /mint-nft outcome and build its response body (before any status_url).
+
+        A mint sent without ``wait``, or one that timed out waiting, is only
+        submitted here; it reaches the history from ``mint_confirmed`` once the
+        tracker sees it succeed. A timed-out mint answers 504, with its tx hash
+        if it was sent.
+        """
+        self.metrics.stage_seconds.observe(time.perf_counter() - started, route="mint-nft", stage="mint_invoke")
+        if result.get("timed_out"):
+            self.metrics.results_total.inc(route="mint-nft", outcome="timed_out")
+            body = {"error": "mint timed out", "details": result.get("error")}
+            if result.get("transaction_hash"):
+                tx_hash = result["transaction_hash"]
+                body.update(transaction_hash=tx_hash, transaction_url=self.network.tx_url(tx_hash), status=result["status"])
+            return body, 504
+        self.metrics.results_total.inc(route="mint-nft", outcome="succeeded" if result.get("ok") else "failed")
+        if not result.get("ok"):
+            return {"error": "mint failed", "details": result.get("error")}, 500
+        tx_hash = result["transaction_hash"]
+        if self.history is not None and wait:
+            self.history.record(
+                "mint-nft", mint, result, owner=mint["recipient"], duration=time.perf_counter() - started
+            )
+        return {
+            "contract_address": mint["contract_address"],
+            "recipient": mint["recipient"],
+            "uri": mint["uri"],
+            "transaction_hash": tx_hash,
+            "transaction_url": self.network.tx_url(tx_hash),
+        }, 200
+
+    def mint_confirmed(self, record: Dict[str, Any]) -> None:
+        """TxTracker callback for a fire-and-forget /mint-nft: record it in the history if it succeeded."""
+        if self.history is None or record["status"] != TX_SUCCEEDED:
+            return
+        mint = {"contract_address": record["contract_address"], "recipient": record["recipient"], "uri": record["uri"]}
+        self.history.record(
+            "mint-nft",
+            mint,
+            record,
+            owner=record["recipient"],
+            created_at=record["submitted_at"],
+            duration=record["settled_at"] - record["submitted_at"],
+        )
+
+    def batch_finished(self, succeeded: int, failed: int, started: Optional[float]) -> None:
+        if started is not None:
+            self.metrics.stage_seconds.observe(time.perf_counter() - started, route="mint-nft-batch", stage="mint_invoke")
+        self.metrics.results_total.inc(succeeded, route="mint-nft-batch", outcome="succeeded")
+        self.metrics.results_total.inc(failed, route="mint-nft-batch", outcome="failed")
+
+    def mints_settled(self, contract_address: str, results: List[Dict[str, Any]]) -> None:
+        """Record the minted items of a settled /mint-nft/batch batch in the history."""
+        if self.history is None:
+            return
+        for result in results:
+            if result["ok"]:
+                params = {"contract_address": contract_address, "recipient": result["recipient"], "uri": result["uri"]}
+                self.history.record("mint-nft-batch", params, result, owner=result["recipient"])
+
+    @staticmethod
+    def batch_summary(contract_address: str, batch_size: int, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        succeeded = sum(1 for r in results if r["ok"])
+        return {
+            "contract_address": contract_address,
+            "batch_size": batch_size,
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        }
+
+
+def create_runtime() -> Runtime:
+    """Load .env, configure logging and wire the deploy and mint services from the environment."""
+    load_dotenv()
+
+    # Configure basic logging; in production, hook into your centralized logger
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    logging.basicConfig(level=getattr(logging, log_level, logging.INFO))
+
+    # sepolia by default; a local devnet or the in-process fake for load testing
+    network = create_network()
+    metrics = ServiceMetrics(output_ring_size=int(os.getenv("COMMAND_OUTPUT_RING_SIZE", "200")))
+    # Deploy pipelines take minutes; run them on the job queue instead of the request thread
+    jobs = create_job_queue()
+    jobs.add_listener(metrics.observe_job)
+    # Retried or concurrent identical deploys share one job and its stored result
+    dedup = create_deduplicator(jobs)
+    # Rate limits and load shedding in front of the deploy and mint routes
+    admission = create_admission(jobs)
+    build_cache = create_build_cache()
+    # Every successful deploy and mint, for GET /history
+    history = create_history(network.name, jobs)
+    toolchain = create_toolchain(network)
+    # Deploys and mints lease accounts from one pool, so they never race on a nonce
+    signers = create_signer_pool(network)
+    if os.getenv("TOOLCHAIN_WARM", "1").lower() not in ("0", "false", "no"):
+        toolchain.warm_in_background(TEMPLATE_DIRS)
+    deployer = DeployPipeline(
+        waiter=create_waiter(network),
+        build_cache=build_cache,
+        # Classes declared on an ephemeral network are gone after its restart
+        class_registry=None if network.ephemeral else create_class_registry(),
+        workspaces=create_workspace_manager(),
+        toolchain=toolchain,
+        outputs=metrics.outputs,
+        precompiled_templates=os.getenv("PRECOMPILED_TEMPLATES_ENABLED", "0").lower() in ("1", "true", "yes"),
+        network=network,
+        signers=signers,
+        sncast_json=os.getenv("SNCAST_JSON", "1").lower() not in ("0", "false", "no"),
+    )
+    if build_cache is not None:
+        metrics.register_stats("build_cache", build_cache.stats, counters=("hits", "misses", "evictions"), gauges=("bytes",))
+    if dedup is not None:
+        metrics.register_stats("idempotency", dedup.stats, counters=("coalesced", "replayed"), gauges=("entries",))
+    metrics.register_stats(
+        "signers", signers.stats, counters=("leased", "waited", "quarantines", "sent"), gauges=("in_use", "quarantined")
+    )
+    if admission is not None:
+        metrics.register_stats(
+            "admission",
+            admission.stats,
+            counters=("admitted", "rate_limited", "client_busy", "queue_full", "mint_busy"),
+            gauges=("queued", "running", "mints_in_flight", "clients_with_jobs"),
+        )
+    if history is not None:
+        metrics.register_stats(
+            "history", history.stats, counters=("recorded", "flushes", "write_errors", "queries"), gauges=("pending",)
+        )
+    return Runtime(network, metrics, jobs, dedup, build_cache, toolchain, deployer, signers, admission, history)
@@ -0,0 +1,345 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# RPC error 52 as nodes, starknet_py and sncast word it; a bare "nonce" also
+# appears in transaction dumps printed for unrelated failures
+_NONCE_ERROR = re.compile(r"invalid\s*(?:transaction\s*)?nonce|nonce too (?:low|high)", re.IGNORECASE)
+
+# Returns an account's next nonce as the chain sees it
+NonceFetcher = Callable[[str], Awaitable[int]]
+
+# Where sncast keeps the accounts it signs for, unless SNCAST_ACCOUNTS_FILE says otherwise
+DEFAULT_SNCAST_ACCOUNTS_FILE = os.path.join("~", ".starknet_accounts", "starknet_open_zeppelin_accounts.json")
+
+_T = TypeVar("_T")
+
+
+class NoSignerAvailable(Exception):
+    """No configured account can sign this kind of transaction."""
+
+
+def is_nonce_error(message: str) -> bool:
+    return _NONCE_ERROR.search(message) is not None
+
+
+class SignerAccount(NamedTuple):
+    # sncast account name (--account); the deploy pipeline signs through sncast's accounts file.
+    # None for an account only the mint client can use.
+    name: Optional[str]
+    address: Optional[str] = None
+    # Needed only by the mint client, which signs with starknet_py
+    private_key: Optional[str] = None
+
+    def usable(self, signing: bool) -> bool:
+        """Whether starknet_py (``signing``) or sncast can send from this account."""
+        return bool(self.private_key and self.address) if signing else self.name is not None
+
+
+class Turn:
+    """One transaction's hold on an account: the nonce to send with, and how it went."""
+
+    def __init__(self, nonce: Optional[int]) -> None:
+        # None when the nonce is not tracked and the sending tool looks it up itself
+        self.nonce = nonce
+        self.error: Optional[str] = None
+
+    def failed(self, error: str) -> None:
+        """Report a failure that did not raise, such as a non-zero sncast exit."""
+        self.error = error
+
+
+class _AccountState:
+    def __init__(self, account: SignerAccount, fetch_nonce: Optional[NonceFetcher]) -> None:
+        self.account = account
+        self.fetch_nonce = fetch_nonce if account.address else None
+        self.nonce: Optional[int] = None
+        self.leases = 0
+        self.quarantined_until = 0.0
+        self.sent = 0
+        self.failed = 0
+        self.nonce_errors = 0
+        # Created on the loop by the first send so it binds to that loop
+        self.send_lock: Optional[asyncio.Lock] = None
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "name": self.account.name,
+            "address": self.account.address,
+            "sncast": self.account.usable(signing=False),
+            "starknet_py": self.account.usable(signing=True),
+            "leases": self.leases,
+            "nonce": self.nonce,
+            "sent": self.sent,
+            "failed": self.failed,
+            "nonce_errors": self.nonce_errors,
+            "quarantined_for": max(0.0, round(self.quarantined_until - now, 3)),
+        }
+
+
+class Lease:
+    """An account handed to one job; released when the job's ``lease()`` block ends."""
+
+    def __init__(self, pool: "SignerPool", state: _AccountState) -> None:
+        self.pool = pool
+        self._state = state
+
+    @property
+    def account(self) -> SignerAccount:
+        return self._state.account
+
+    async def send(self, transaction: Callable[[Turn], Awaitable[_T]]) -> _T:
+        """Take the account's send turn and return ``await transaction(turn)``, which sends at ``turn.nonce``.
+
+        Sends on one account are serialised; the nonce only advances once the
+        transaction went out, so a failed send never leaves a gap. A nonce
+        rejection, raised or reported with ``turn.failed``, re-syncs the nonce
+        from the chain and sends once more. If that is rejected too the
+        account is quarantined, which gives its pending transactions time to
+        land before the next re-sync.
+        """
+        state = self._state
+        if state.send_lock is None:
+            state.send_lock = asyncio.Lock()
+        async with state.send_lock:
+            retries = 1
+            while True:
+                if state.fetch_nonce is not None and state.nonce is None:
+                    state.nonce = await state.fetch_nonce(state.account.address)
+                turn = Turn(state.nonce)
+                try:
+                    result = await transaction(turn)
+                except BaseException as e:
+                    # Cancelled mid-send counts as failed: a nonce that did go out surfaces as a nonce error later
+                    turn.error = str(e) or type(e).__name__
+                    if not (retries and isinstance(e, Exception) and is_nonce_error(turn.error)):
+                        self.pool._settle(state, turn)
+                        raise
+                if retries and turn.error is not None and is_nonce_error(turn.error):
+                    retries -= 1
+                    self.pool._settle(state, turn, retrying=True)
+                    continue
+                self.pool._settle(state, turn)
+                return result
+
+
+class SignerPool:
+    """Leases a set of funded accounts to jobs so their transactions do not share one nonce sequence.
+
+    Each lease goes to the healthy account with the fewest leases, at most
+    ``max_leases`` per account. Every account keeps its own local nonce, so
+    throughput grows with the number of accounts. A rejected nonce is
+    re-synced from the chain and the send retried once; an account rejected
+    again is quarantined for ``quarantine_seconds``. The pool lives on the
+    shared event loop.
+    """
+
+    def __init__(
+        self,
+        accounts: List[SignerAccount],
+        fetch_nonce: Optional[NonceFetcher] = None,
+        max_leases: int = 4,
+        quarantine_seconds: float = 30.0,
+    ) -> None:
+        if not accounts:
+            raise ValueError("a signer pool needs at least one account")
+        self.max_leases = max_leases
+        self.quarantine_seconds = quarantine_seconds
+        self.leased = 0
+        self.waited = 0
+        self.quarantines = 0
+        self._accounts = [_AccountState(account, fetch_nonce) for account in accounts]
+        self._available: Optional[asyncio.Condition] = None
+
+    @property
+    def can_sign(self) -> bool:
+        return any(state.account.usable(signing=True) for state in self._accounts)
+
+    @asynccontextmanager
+    async def lease(self, signing: bool = False) -> AsyncIterator[Lease]:
+        """Lease an account for the block: one starknet_py can sign for if ``signing``, else one sncast knows.
+
+        Waits while every eligible account is fully leased or quarantined.
+        Raises NoSignerAvailable if no configured account is eligible at all.
+        """
+        if self._available is None:
+            self._available = asyncio.Condition()
+        async with self._available:
+            waited = False
+            while True:
+                state, retry_in = self._pick(signing)
+                if state is not None:
+                    break
+                waited = True
+                try:
+                    await asyncio.wait_for(self._available.wait(), retry_in)
+                except asyncio.TimeoutError:
+                    pass
+            state.leases += 1
+            self.leased += 1
+            self.waited += waited
+        try:
+            yield Lease(self, state)
+        finally:
+            async with self._available:
+                state.leases -= 1
+                # Waiters may want different accounts (signing or not), so wake them all
+                self._available.notify_all()
+
+    def _pick(self, signing: bool) -> Tuple[Optional[_AccountState], Optional[float]]:
+        """The least-leased usable account, or (None, seconds until a quarantine ends)."""
+        eligible = [s for s in self._accounts if s.account.usable(signing)]
+        if not eligible:
+            raise NoSignerAvailable(
+                "no configured account has an address and private key" if signing else "no configured sncast account"
+            )
+        now = time.monotonic()
+        healthy = [s for s in eligible if s.quarantined_until <= now]
+        free = [s for s in healthy if s.leases < self.max_leases]
+        if free:
+            return min(free, key=lambda s: (s.leases, s.sent)), None
+        if healthy:
+            # A release will notify us
+            return None, None
+        return None, min(s.quarantined_until for s in eligible) - now
+
+    def _settle(self, state: _AccountState, turn: Turn, retrying: bool = False) -> None:
+        if turn.error is None:
+            state.sent += 1
+            if state.nonce is not None:
+                state.nonce += 1
+            return
+        if is_nonce_error(turn.error):
+            state.nonce_errors += 1
+            state.nonce = None
+        if retrying:
+            logger.info(
+                "account %s: nonce %s rejected, re-syncing and retrying: %s",
+                state.account.name or state.account.address, turn.nonce, turn.error,
+            )
+            return
+        state.failed += 1
+        if is_nonce_error(turn.error):
+            state.quarantined_until = time.monotonic() + self.quarantine_seconds
+            self.quarantines += 1
+            logger.warning(
+                "account %s: nonce %s rejected, quarantined for %.0fs: %s",
+                state.account.name or state.account.address, turn.nonce, self.quarantine_seconds, turn.error,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        accounts = [state.to_dict(now) for state in self._accounts]
+        return {
+            "accounts": accounts,
+            "size": len(accounts),
+            "leased": self.leased,
+            "waited": self.waited,
+            "quarantines": self.quarantines,
+            "in_use": sum(a["leases"] for a in accounts),
+            "quarantined": sum(1 for a in accounts if a["quarantined_for"] > 0),
+            "sent": sum(a["sent"] for a in accounts),
+            "max_leases": self.max_leases,
+        }
+
+
+def load_accounts(path: str) -> List[SignerAccount]:
+    """Read a JSON list of ``{"name", "address", "private_key"}`` objects.
+
+    Each needs a ``name`` (usable by sncast), an ``address`` and ``private_key``
+    (usable for mints), or all three, in which case both share its nonce.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty JSON list of accounts")
+    accounts = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: account {index} is not an object")
+        account = SignerAccount(entry.get("name"), entry.get("address"), entry.get("private_key"))
+        if not (account.usable(signing=False) or account.usable(signing=True)):
+            raise ValueError(f"{path}: account {index} needs a 'name', or an 'address' and 'private_key'")
+        accounts.append(account)
+    return accounts
+
+
+def sncast_account_address(name: str, path: Optional[str] = None) -> Optional[str]:
+    """The address sncast has on file for account ``name`` (on any network), or None if unknown.
+
+    Reads SNCAST_ACCOUNTS_FILE, else sncast's default accounts file.
+    """
+    path = os.path.expanduser(path or os.getenv("SNCAST_ACCOUNTS_FILE") or DEFAULT_SNCAST_ACCOUNTS_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            networks = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(networks, dict):
+        return None
+    for accounts in networks.values():
+        entry = accounts.get(name) if isinstance(accounts, dict) else None
+        if isinstance(entry, dict) and isinstance(entry.get("address"), str):
+            return entry["address"]
+    return None
+
+
+def _same_address(a: str, b: str) -> bool:
+    try:
+        return int(a, 16) == int(b, 16)
+    except ValueError:
+        return False
+
+
+def create_signer_pool(network: Any) -> SignerPool:
+    """Build the pool from SIGNER_ACCOUNTS_FILE, else SNCAST_ACCOUNT plus the STARKNET_ACCOUNT_ADDRESS signer.
+
+    Without a file the sncast account and the mint signer are one entry, with
+    one nonce, when sncast's accounts file gives the sncast account the
+    STARKNET_ACCOUNT_ADDRESS; otherwise they stay separate. A fake network gets
+    FAKENET_ACCOUNTS simulated accounts. Nonces are tracked locally for
+    accounts with an address when the network's RPC is known; otherwise sncast
+    and starknet_py look them up per transaction, one at a time per account.
+    """
+    accounts_file = os.getenv("SIGNER_ACCOUNTS_FILE")
+    fetch_nonce: Optional[NonceFetcher] = None
+    if network.fake is not None:
+        from fakenet import fake_account_address
+
+        if accounts_file:
+            accounts = load_accounts(accounts_file)
+        else:
+            names = [f"fake-{i}" for i in range(int(os.getenv("FAKENET_ACCOUNTS", "1")))]
+            accounts = [SignerAccount(name, fake_account_address(name), "0x1") for name in names]
+        fetch_nonce = network.fake.get_nonce
+    else:
+        if accounts_file:
+            accounts = load_accounts(accounts_file)
+        else:
+            accounts = [SignerAccount(network.account)]
+            address = os.getenv("STARKNET_ACCOUNT_ADDRESS") or None
+            private_key = os.getenv("STARKNET_PRIVATE_KEY") or None
+            if address and private_key:
+                sncast_address = sncast_account_address(network.account)
+                if sncast_address is not None and _same_address(sncast_address, address):
+                    accounts = [SignerAccount(network.account, address, private_key)]
+                else:
+                    accounts.append(SignerAccount(None, address, private_key))
+        if network.rpc_url:
+            from readiness import RpcStatusSource
+
+            fetch_nonce = RpcStatusSource(network.rpc_url).get_nonce
+    logger.info("signer pool: %d account(s)", len(accounts))
+    return SignerPool(
+        accounts,
+        fetch_nonce=fetch_nonce,
+        max_leases=int(os.getenv("SIGNER_MAX_LEASES_PER_ACCOUNT", "4")),
+        quarantine_seconds=float(os.getenv("SIGNER_QUARANTINE_SECONDS", "30")),
+    )
@@ -0,0 +1,91 @@
+import json
+import re
+from typing import Any, Dict, NamedTuple, Optional
+
+# One scan over both streams finds every line sncast prints a field on: "Class Hash:"
+# (current releases, padded), "class_hash:" (older ones), "command:", "error:"
+# and --json records. Every alternative starts after a literal newline, and
+# the lookahead drops lines that cannot match on their first character, so
+# the regex engine skips through build output at close to str.find speed.
+_LINE = re.compile(
+    r"\n(?=[ \tCcTtEe{])[ \t]*(?:"
+    r"(?P<label>[Cc]lass[ _][Hh]ash|[Cc]ontract[ _][Aa]ddress|[Tt]ransaction[ _][Hh]ash)[ \t]*:[ \t]*"
+    r"(?P<value>0x[0-9a-fA-F]+)"
+    r"|[Cc]ommand[ \t]*:[ \t]*(?P<command>[\w-]+)"
+    r"|(?:[Ee]rror|ERROR)[ \t]*:[ \t]*(?P<error>[^\n]*)"
+    r"|(?P<record>\{[^\n]*)"
+    r")"
+)
+# Only consulted for an already declared class whose hash has no label
+_DECLARED_HASH = re.compile(r"[Cc]lass with hash (0x[0-9a-fA-F]+) is already declared")
+_HEX = re.compile(r"0x[0-9a-fA-F]{10,}")
+_RECORD_FIELDS = ("command", "class_hash", "contract_address", "transaction_hash", "error")
+
+
+class SncastOutput(NamedTuple):
+    command: Optional[str] = None
+    class_hash: Optional[str] = None
+    contract_address: Optional[str] = None
+    transaction_hash: Optional[str] = None
+    error: Optional[str] = None
+    already_declared: bool = False
+    # True when the fields came from ``sncast --json`` records
+    json: bool = False
+
+
+def parse(stdout: str, stderr: str = "", returncode: int = 0) -> SncastOutput:
+    """Extract hashes, addresses and errors from one sncast run.
+
+    Both streams are scanned in one pass, stdout first; ``sncast --json``
+    records win over text when a run printed any. The first value seen for a
+    field is kept, as sncast prints the node's answer before any follow-up
+    details. Pass the exit status so a failed declare whose reason is only on
+    a continuation or ``Caused by:`` line is still seen as already declared.
+    """
+    fields: Dict[str, Any] = {}
+    records: Dict[str, Any] = {}
+    is_json = False
+    for match in _LINE.finditer("\n" + stdout + "\n" + stderr):
+        kind = match.lastgroup
+        if kind == "value":
+            fields.setdefault(match.group("label").lower().replace(" ", "_"), match.group("value"))
+        elif kind == "error":
+            fields.setdefault("error", match.group("error").rstrip())
+        elif kind == "record":
+            try:
+                record = json.loads(match.group("record"))
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            is_json = True
+            for key in _RECORD_FIELDS:
+                if record.get(key) is not None:
+                    records.setdefault(key, str(record[key]))
+        else:
+            fields.setdefault(kind, match.group(kind))
+    if is_json:
+        fields = records
+
+    error = fields.get("error")
+    # Where sncast said so: its error field, else the rest of stderr of a failed
+    # run. Build output on a successful run cannot trip this.
+    declared_detail = error if error is not None and "already declared" in error else None
+    if declared_detail is None and returncode != 0 and "already declared" in stderr:
+        declared_detail = stderr
+    already_declared = declared_detail is not None
+    class_hash = fields.get("class_hash")
+    if class_hash is None and declared_detail is not None:
+        # The hash is only in the message; fall back to the last long hex in it
+        match = _DECLARED_HASH.search(declared_detail)
+        hashes = [match.group(1)] if match else _HEX.findall(declared_detail)
+        class_hash = hashes[-1] if hashes else None
+    return SncastOutput(
+        command=fields.get("command"),
+        class_hash=class_hash,
+        contract_address=fields.get("contract_address"),
+        transaction_hash=None if already_declared else fields.get("transaction_hash"),
+        error=error,
+        already_declared=already_declared,
+        json=is_json,
+    )
@@ -0,0 +1,295 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import event_loop
+from signers import SignerAccount, SignerPool
+from tx_tracker import TxTracker
+
+logger = logging.getLogger(__name__)
+
+# Callers wait this much past a mint's own ``timeout`` for its answer, which carries the tx hash
+MINT_TIMEOUT_GRACE = 5.0
+
+
+class StarknetUnavailable(Exception):
+    """starknet_py is not installed in this environment."""
+
+
+class StarknetClientPool:
+    """Long-lived starknet_py client, accounts and contract cache for one worker process.
+
+    Transactions are signed by accounts leased from ``signers``, each with its
+    own local nonce, so mints spread over every funded account instead of
+    queueing on one nonce sequence.
+
+    All starknet_py objects live on a single event loop, so they are only
+    ever touched from that loop's thread. Pass ``loop`` to share an existing
+    one (the process-wide loop from ``event_loop``, which the async server
+    also serves requests on); otherwise the pool starts its own in a daemon
+    thread. Synchronous request threads hand coroutines to it with ``run()``,
+    which makes the shared objects safe to use from any number of threads;
+    code already on the loop awaits them directly.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        signers: SignerPool,
+        chain: str = "SEPOLIA",
+        max_contracts: int = 128,
+        max_in_flight: int = 4,
+        timeout: float = 300.0,
+        tracker_interval: float = 2.0,
+        tracker_timeout: float = 900.0,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        try:
+            from starknet_py.net.models import StarknetChainId
+        except Exception as e:
+            raise StarknetUnavailable(str(e)) from e
+
+        self.rpc_url = rpc_url
+        self.signers = signers
+        self.chain_id = StarknetChainId.MAINNET if chain.upper() == "MAINNET" else StarknetChainId.SEPOLIA
+        self.max_contracts = max_contracts
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._contracts: "OrderedDict[int, Any]" = OrderedDict()
+        self._contract_locks: Dict[int, asyncio.Lock] = {}
+        self._client: Optional[Any] = None
+        # account address -> starknet_py Account
+        self._accounts: Dict[str, Any] = {}
+        self._session: Optional[Any] = None
+        self.tracker = TxTracker(
+            rpc_url,
+            self.http_session,
+            interval=tracker_interval,
+            timeout=tracker_timeout,
+        )
+
+        self._thread: Optional[threading.Thread] = None
+        if loop is not None:
+            self.loop = loop
+        else:
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self.loop.run_forever, name="starknet-loop", daemon=True)
+            self._thread.start()
+
+    def submit(self, coro: Awaitable[Any]) -> "concurrent.futures.Future[Any]":
+        """Schedule ``coro`` on the pool's loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run ``coro`` on the pool's loop from a synchronous thread and return its result."""
+        return self.submit(coro).result(timeout if timeout is not None else self.timeout)
+
+    async def http_session(self) -> Any:
+        # One keep-alive HTTP session for every RPC call this worker makes
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def client(self) -> Any:
+        if self._client is None:
+            from starknet_py.net.full_node_client import FullNodeClient
+
+            self._client = FullNodeClient(node_url=self.rpc_url, session=await self.http_session())
+        return self._client
+
+    async def account(self, signer: SignerAccount) -> Any:
+        """The starknet_py Account for a leased signer, built on first use."""
+        account = self._accounts.get(signer.address)
+        if account is None:
+            from starknet_py.net.account.account import Account
+            from starknet_py.net.signer.stark_curve_signer import KeyPair
+
+            account = self._accounts[signer.address] = Account(
+                address=int(signer.address, 16),
+                client=await self.client(),
+                key_pair=KeyPair.from_private_key(int(signer.private_key, 16)),
+                chain=self.chain_id,
+            )
+        return account
+
+    async def contract(self, address: int) -> Any:
+        """Return a Contract for ``address``, fetching its ABI only on the first use."""
+        contract = self._contracts.get(address)
+        if contract is not None:
+            self._contracts.move_to_end(address)
+            return contract
+
+        # Concurrent first uses of one address share a single ABI fetch
+        lock = self._contract_locks.setdefault(address, asyncio.Lock())
+        async with lock:
+            contract = self._contracts.get(address)
+            if contract is None:
+                from starknet_py.contract import Contract
+
+                # Only the ABI is needed; calls are signed by whichever account is leased
+                contract = await Contract.from_address(address=address, provider=await self.client())
+                self._contracts[address] = contract
+                while len(self._contracts) > self.max_contracts:
+                    evicted, _ = self._contracts.popitem(last=False)
+                    self._contract_locks.pop(evicted, None)
+        return contract
+
+    async def mint(
+        self,
+        contract_address: str,
+        recipient: str,
+        uri: str,
+        wait: bool = True,
+        callback_url: Optional[str] = None,
+        on_settled: Optional[Callable[[Dict[str, Any]], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Invoke mint_item; with ``wait=False`` return once the tx hash is known and let the tracker follow it.
+
+        The tracker POSTs the final record to ``callback_url`` and passes it to ``on_settled``.
+        With ``wait``, a tx still unconfirmed ``timeout`` seconds after the call
+        is handed to the tracker the same way, and the result is ``timed_out``.
+        """
+        from starknet_py.net.client_errors import ClientError
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        try:
+            contract = await self.contract(int(contract_address, 16))
+            call = contract.functions["mint_item"].prepare_invoke_v3(recipient=int(recipient, 16), uri=uri)
+            async with self.signers.lease(signing=True) as lease:
+                account = await self.account(lease.account)
+                sent = await lease.send(lambda turn: account.execute_v3([call], nonce=turn.nonce, auto_estimate=True))
+            tx_hash = hex(sent.hash)
+            remaining = deadline - loop.time() if deadline is not None else None
+            if wait and (remaining is None or remaining > 0):
+                try:
+                    # Wait for confirmation
+                    await asyncio.wait_for(account.client.wait_for_tx(sent.hash), remaining)
+                    return {"ok": True, "transaction_hash": tx_hash}
+                except asyncio.TimeoutError:
+                    pass
+            record = self.tracker.track(
+                tx_hash,
+                {"contract_address": contract_address, "recipient": recipient, "uri": uri},
+                callback_url=callback_url,
+                on_settled=on_settled,
+            )
+            if wait:
+                return {
+                    "ok": False,
+                    "timed_out": True,
+                    "error": f"not confirmed within {timeout:g}s",
+                    "transaction_hash": tx_hash,
+                    "status": record["status"],
+                }
+            return {"ok": True, "transaction_hash": tx_hash, "status": record["status"]}
+        except ClientError as ce:
+            return {"ok": False, "error": str(ce)}
+        except Exception as e:  # noqa: BLE001
+            return {"ok": False, "error": str(e)}
+
+    async def mint_batch(
+        self,
+        contract_address: str,
+        items: List[Tuple[str, str]],
+        batch_size: int,
+        on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Mint ``(recipient, uri)`` pairs as multicall invokes of ``batch_size`` mint_item calls.
+
+        Up to ``max_in_flight`` batches await confirmation at once, each signed
+        by the account leased for it. Returns one result per item in input
+        order; ``on_batch`` is called as each batch settles.
+        """
+        contract = await self.contract(int(contract_address, 16))
+        mint_item = contract.functions["mint_item"]
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        async def _send_batch(batch_index: int, start: int, chunk: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+            outcome: Dict[str, Any]
+            async with in_flight:
+                try:
+                    calls = [mint_item.prepare_invoke_v3(recipient=int(r, 16), uri=u) for r, u in chunk]
+                    async with self.signers.lease(signing=True) as lease:
+                        account = await self.account(lease.account)
+                        sent = await lease.send(
+                            lambda turn: account.execute_v3(calls, nonce=turn.nonce, auto_estimate=True)
+                        )
+                    await account.client.wait_for_tx(sent.hash)
+                    outcome = {"ok": True, "transaction_hash": hex(sent.hash)}
+                except Exception as e:  # noqa: BLE001
+                    outcome = {"ok": False, "error": str(e)}
+            results = [
+                {"index": start + offset, "recipient": recipient, "uri": uri, "batch": batch_index, **outcome}
+                for offset, (recipient, uri) in enumerate(chunk)
+            ]
+            if on_batch is not None:
+                on_batch(results)
+            return results
+
+        batches = await asyncio.gather(
+            *[
+                _send_batch(batch_index, start, items[start:start + batch_size])
+                for batch_index, start in enumerate(range(0, len(items), batch_size))
+            ]
+        )
+        return [result for batch in batches for result in batch]
+
+    async def aclose(self) -> None:
+        await self.tracker.aclose()
+        if self._session is not None:
+            await self._session.close()
+
+    def close(self) -> None:
+        self.run(self.aclose())
+        if self._thread is not None:
+            # Only stop a loop we started; a shared loop belongs to its owner
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_pool: Optional[StarknetClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool(network: Any, signers: SignerPool) -> Optional[StarknetClientPool]:
+    """Return this process's pool, built from STARKNET_* env on first use; None if credentials are missing.
+
+    ``network`` supplies the RPC URL (else STARKNET_RPC); a fake network gets a
+    pool backed by the in-process stand-in. ``signers`` is shared with the
+    deploy pipeline, so mints and deploys never race on one account's nonce.
+    The pool runs on the shared event loop, alongside the deploy pipeline.
+    Raises StarknetUnavailable when starknet_py cannot be imported.
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+    options = {
+        "max_contracts": int(os.getenv("STARKNET_CONTRACT_CACHE_SIZE", "128")),
+        "max_in_flight": int(os.getenv("MINT_MAX_IN_FLIGHT", "4")),
+        "timeout": float(os.getenv("MINT_TIMEOUT", "300")),
+        "tracker_interval": float(os.getenv("TX_TRACKER_INTERVAL", "2")),
+        "tracker_timeout": float(os.getenv("TX_TRACKER_TIMEOUT", "900")),
+        "loop": event_loop.shared_loop(),
+    }
+    if network.fake is not None:
+        from fakenet import FakeStarknetClientPool
+
+        with _pool_lock:
+            if _pool is None:
+                _pool = FakeStarknetClientPool(network.fake, signers, **options)
+        return _pool
+
+    rpc_url = network.rpc_url or os.getenv("STARKNET_RPC")
+    if not rpc_url or not signers.can_sign:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = StarknetClientPool(rpc_url, signers, chain=os.getenv("STARKNET_CHAIN_ID", "SEPOLIA"), **options)
+    return _pool
@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing app builds its module-level app from the environment; keep that on
+# the in-process fake network with nothing written next to the sources
+_SCRATCH = tempfile.mkdtemp(prefix="backend-tests-")
+for _name, _value in {
+    "STARKNET_NETWORK": "fake",
+    "FAKENET_JITTER": "0",
+    "FAKENET_BUILD_LATENCY": "0",
+    "FAKENET_DECLARE_LATENCY": "0",
+    "FAKENET_DEPLOY_LATENCY": "0",
+    "FAKENET_INVOKE_LATENCY": "0",
+    "FAKENET_ACCEPT_LATENCY": "0",
+    "DECLARE_WAIT_INITIAL_DELAY": "0.01",
+    "TOOLCHAIN_WARM": "0",
+    "CLASS_REGISTRY_ENABLED": "0",
+    "HISTORY_ENABLED": "0",
+    "WORKSPACE_ROOT": os.path.join(_SCRATCH, "workspaces"),
+    "BUILD_CACHE_DIR": os.path.join(_SCRATCH, "build-cache"),
+    "LOG_LEVEL": "WARNING",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+def wait_until(predicate: Callable[[], Any], timeout: float = 10.0) -> Any:
+    """Poll ``predicate`` until it returns something truthy; fails the test after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        value = predicate()
+        if value:
+            return value
+        if time.monotonic() > deadline:
+            pytest.fail(f"condition not met within {timeout}s")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def gate():
+    """An event blocking runners can wait on; set at teardown so no worker is left stuck."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def make_runtime(monkeypatch):
+    """Build a fresh fake-network runtime, with ``env`` applied first."""
+
+    def make(**env: str):
+        from runtime import create_runtime
+
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return create_runtime()
+
+    return make
+
+
+@pytest.fixture
+def make_client(make_runtime):
+    """Build a Flask test client on a fresh fake-network runtime, with ``env`` applied first."""
+
+    def make(**env: str):
+        from app import create_app
+
+        runtime = make_runtime(**env)
+        return runtime, create_app(runtime).test_client()
+
+    return make
+
+
+def post_json(client: Any, path: str, body: Dict[str, Any], **headers: str):
+    response = client.post(path, json=body, headers=headers)
+    response.close()
+    return response
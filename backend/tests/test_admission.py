@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from admission import DEFAULT_JOB_SECONDS, AdmissionController, MemoryBucketStore, RateLimit, client_key
+from conftest import post_json, wait_until
+from jobs import InProcessBackend, JobQueue
+
+TOKEN = {"name": "Token", "symbol": "TKN", "max_token": 1000, "decimals": 18}
+
+
+@pytest.fixture
+def jobs():
+    queue = JobQueue(InProcessBackend(concurrency=1))
+    yield queue
+    queue.backend.shutdown(wait=False)
+
+
+def _admission(jobs: JobQueue, limits=None, **kwargs) -> AdmissionController:
+    return AdmissionController(jobs, MemoryBucketStore(), limits or {}, **kwargs)
+
+
+def test_full_queue_sheds_load_with_503(jobs, gate):
+    admission = _admission(jobs, max_queue=2)
+    started = threading.Event()
+
+    def blocking(job):
+        started.set()
+        gate.wait(10)
+
+    jobs.submit("create-token", blocking)
+    started.wait(10)
+    assert admission.admit("deploy", "ip:1") is None
+    jobs.submit("create-token", blocking)
+    jobs.submit("create-token", blocking)
+
+    rejection = admission.admit("deploy", "ip:1")
+
+    assert rejection.status == 503
+    assert rejection.reason == "queue_full"
+    # Two queued jobs ahead of it on one worker, at the default job length
+    assert rejection.retry_after == int(2 * DEFAULT_JOB_SECONDS)
+
+
+def test_client_over_its_job_share_gets_429(jobs, gate):
+    admission = _admission(jobs, max_client_jobs=1)
+    admission.track("ip:1", jobs.submit("create-token", lambda job: gate.wait(10)))
+
+    rejection = admission.admit("deploy", "ip:1")
+
+    assert (rejection.status, rejection.reason) == (429, "client_busy")
+    assert admission.admit("deploy", "ip:2") is None
+
+
+def test_client_slot_is_freed_when_its_job_finishes(jobs):
+    admission = _admission(jobs, max_client_jobs=1)
+    job = jobs.submit("create-token", lambda job: {})
+    admission.track("ip:1", job)
+
+    wait_until(lambda: admission.stats()["clients_with_jobs"] == 0)
+    assert admission.admit("deploy", "ip:1") is None
+
+
+def test_empty_bucket_gets_429_with_its_refill_time(jobs):
+    admission = _admission(jobs, {"deploy": RateLimit(rate=1 / 60, burst=2)})
+
+    assert admission.admit("deploy", "ip:1") is None
+    assert admission.admit("deploy", "ip:1") is None
+    rejection = admission.admit("deploy", "ip:1")
+
+    assert (rejection.status, rejection.reason) == (429, "rate_limited")
+    assert 59 <= rejection.retry_after <= 60
+    assert admission.admit("deploy", "ip:2") is None
+    assert admission.stats()["rate_limited"] == 1
+
+
+def test_mint_slots_503_until_released(jobs):
+    admission = _admission(jobs, max_mints=1)
+
+    assert admission.admit("mint", "ip:1") is None
+    rejection = admission.admit("mint", "ip:2")
+    assert (rejection.status, rejection.reason, rejection.retry_after) == (503, "mint_busy", 1)
+
+    admission.release("mint")
+    assert admission.admit("mint", "ip:2") is None
+
+
+def test_client_key_prefers_the_api_key_and_hides_it():
+    key = client_key("secret", "10.0.0.1", "1.2.3.4")
+
+    assert key.startswith("key:")
+    assert "secret" not in key
+    assert client_key(None, "10.0.0.1", "1.2.3.4, 10.0.0.1") == "ip:1.2.3.4"
+    assert client_key(None, "10.0.0.1") == "ip:10.0.0.1"
+
+
+def test_rate_limited_response_carries_retry_after(make_client):
+    _, client = make_client(RATE_LIMIT_DEPLOY_PER_MINUTE="1", RATE_LIMIT_DEPLOY_BURST="1", IDEMPOTENCY_ENABLED="0")
+
+    first = post_json(client, "/create-token", TOKEN)
+    limited = post_json(client, "/create-token", {**TOKEN, "symbol": "TWO"})
+
+    assert first.status_code == 202
+    assert limited.status_code == 429
+    assert limited.get_json()["reason"] == "rate_limited"
+    assert 1 <= int(limited.headers["Retry-After"]) <= 60
+    assert limited.get_json()["retry_after"] == int(limited.headers["Retry-After"])
+
+
+def test_shed_response_is_503_with_retry_after(make_client):
+    _, client = make_client(ADMISSION_MAX_QUEUE="0")
+
+    shed = post_json(client, "/create-token", TOKEN)
+
+    assert shed.status_code == 503
+    assert shed.get_json()["reason"] == "queue_full"
+    assert shed.headers["Retry-After"] == "1"
@@ -0,0 +1,59 @@
+import pytest
+
+from conftest import post_json
+
+MINT = {"contract_address": "0xc0", "recipient": "0xa11ce", "uri": "ipfs://1"}
+
+
+def test_mint_timeout_is_a_json_504_with_the_tx_hash(make_client, monkeypatch):
+    monkeypatch.setattr("starknet_client._pool", None)
+    _, client = make_client(MINT_TIMEOUT="0.05", FAKENET_ACCEPT_LATENCY="5", ADMISSION_ENABLED="0")
+
+    response = post_json(client, "/mint-nft", MINT)
+
+    assert response.status_code == 504
+    body = response.get_json()
+    assert body["error"] == "mint timed out"
+    assert body["transaction_hash"].startswith("0x")
+    assert client.get(body["status_url"]).get_json()["status"] == "pending"
+
+
+def test_mint_wait_must_be_a_boolean(make_client):
+    _, client = make_client(ADMISSION_ENABLED="0")
+
+    response = post_json(client, "/mint-nft", {**MINT, "wait": 0})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "'wait' must be a boolean"
+
+
+def test_mint_webhook_to_a_loopback_host_is_refused(make_client):
+    _, client = make_client(ADMISSION_ENABLED="0")
+
+    response = post_json(client, "/mint-nft", {**MINT, "wait": False, "callback_url": "http://127.0.0.1:5000/admin"})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("'callback_url' is not allowed")
+
+
+@pytest.mark.parametrize("path,body", [
+    ("/create-token", {"name": 'Evil";', "symbol": "EVL", "max_token": 1000}),
+    ("/create-token", {"name": "Token", "symbol": "A\\u0041", "max_token": 1000}),
+    ("/deploy-nft", {"name": "Collection", "symbol": "COL", "base_uri": "ipfs://x\n"}),
+])
+def test_strings_that_would_break_the_cairo_literal_are_rejected(make_client, path, body):
+    _, client = make_client(ADMISSION_ENABLED="0")
+
+    response = post_json(client, path, body)
+
+    assert response.status_code == 400
+    assert "must not contain quotes" in response.get_json()["error"]
+
+
+def test_source_size_limit_is_read_when_the_runtime_is_built(make_client):
+    _, client = make_client(CAIRO_MAX_SOURCE_BYTES="64", ADMISSION_ENABLED="0")
+
+    response = post_json(client, "/deploy-contract", {"code": "// padding\n" * 10})
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "contract source too large", "bytes": 110, "max_bytes": 64}
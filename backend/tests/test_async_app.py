@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import event_loop
+from async_app import create_async_app
+
+TOKEN = {"name": "Token", "symbol": "TKN", "max_token": 1000, "decimals": 18}
+
+
+@pytest.fixture
+def serve(make_runtime, monkeypatch):
+    """Run ``scenario(client)`` against the async app on the shared loop, as async_app.main serves it."""
+    monkeypatch.setattr("starknet_client._pool", None)
+
+    def serve(scenario, **env: str):
+        runtime = make_runtime(**env)
+
+        async def main():
+            async with TestClient(TestServer(create_async_app(runtime))) as client:
+                return await scenario(client)
+
+        return event_loop.run(main(), timeout=30)
+
+    return serve
+
+
+async def _poll_job(client: TestClient, status_url: str) -> dict:
+    for _ in range(500):
+        job = await (await client.get(status_url)).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{status_url} did not finish")
+
+
+def test_deploy_is_accepted_and_finishes_on_the_job_queue(serve):
+    async def scenario(client):
+        accepted = await client.post("/create-token", json=TOKEN)
+        body = await accepted.json()
+        assert accepted.status == 202
+        assert accepted.headers["Location"] == body["status_url"] == f"/jobs/{body['job_id']}"
+        return await _poll_job(client, body["status_url"])
+
+    job = serve(scenario)
+
+    assert job["status"] == "succeeded"
+    assert job["result"]["contract_address"].startswith("0x")
+
+
+def test_invalid_body_is_a_json_400(serve):
+    async def scenario(client):
+        invalid = await client.post("/create-token", json={**TOKEN, "decimals": 999})
+        not_json = await client.post("/deploy-nft", data="name=x")
+        return invalid.status, await invalid.json(), not_json.status
+
+    status, body, not_json_status = serve(scenario)
+
+    assert status == 400
+    assert "decimals" in body["error"]
+    assert not_json_status == 400
+
+
+def test_idempotency_key_reused_for_another_body_is_a_422(serve):
+    async def scenario(client):
+        headers = {"Idempotency-Key": "key-1"}
+        await client.post("/create-token", json=TOKEN, headers=headers)
+        conflict = await client.post("/create-token", json={**TOKEN, "symbol": "OTHER"}, headers=headers)
+        return conflict.status
+
+    assert serve(scenario) == 422
+
+
+def test_unknown_job_is_a_404(serve):
+    async def scenario(client):
+        response = await client.get("/jobs/nope")
+        return response.status, await response.json()
+
+    assert serve(scenario) == (404, {"error": "job not found", "job_id": "nope"})
+
+
+def test_metrics_label_routes_like_the_flask_app(serve):
+    async def scenario(client):
+        await client.get("/jobs/nope")
+        return await (await client.get("/metrics")).text()
+
+    text = serve(scenario)
+
+    assert 'starkflow_http_requests_total{route="/jobs/<job_id>",status="404"} 1' in text
+
+
+def test_mint_waits_for_the_transaction(serve):
+    mint = {"contract_address": "0xc0", "recipient": "0xa11ce", "uri": "ipfs://1"}
+
+    async def scenario(client):
+        response = await client.post("/mint-nft", json=mint)
+        return response.status, await response.json()
+
+    status, body = serve(scenario)
+
+    assert status == 200
+    assert body["transaction_hash"].startswith("0x")
+    assert body["recipient"] == "0xa11ce"
+
+
+def test_mint_timeout_is_a_json_504_with_the_tx_hash(serve):
+    mint = {"contract_address": "0xc0", "recipient": "0xa11ce", "uri": "ipfs://1"}
+
+    async def scenario(client):
+        response = await client.post("/mint-nft", json=mint)
+        body = await response.json()
+        tracked = await client.get(body["status_url"])
+        return response.status, body, tracked.status
+
+    status, body, tracked = serve(scenario, MINT_TIMEOUT="0.05", FAKENET_ACCEPT_LATENCY="5")
+
+    assert status == 504
+    assert body["error"] == "mint timed out"
+    assert body["transaction_hash"].startswith("0x")
+    assert tracked == 200
+
+
+def test_mint_wait_must_be_a_boolean(serve):
+    mint = {"contract_address": "0xc0", "recipient": "0xa11ce", "uri": "ipfs://1", "wait": "false"}
+
+    async def scenario(client):
+        response = await client.post("/mint-nft", json=mint)
+        return response.status, await response.json()
+
+    status, body = serve(scenario)
+
+    assert status == 400
+    assert body["error"] == "'wait' must be a boolean"
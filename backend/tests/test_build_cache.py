@@ -0,0 +1,133 @@
+import os
+import shutil
+
+import pytest
+
+from build_cache import BuildCache
+
+
+def _write(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = str(tmp_path / "project")
+    _write(os.path.join(root, "Scarb.toml"), '[package]\nname = "token"\n')
+    _write(os.path.join(root, "src", "lib.cairo"), "mod token;\n")
+    _write(os.path.join(root, "src", "token.cairo"), "// name: Token\n")
+    return root
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BuildCache(str(tmp_path / "cache"))
+
+
+def _build(project: str, size: int = 10) -> str:
+    target = os.path.join(project, "target", "release")
+    _write(os.path.join(target, "token_Token.contract_class.json"), "s" * size)
+    _write(os.path.join(target, "token_Token.compiled_contract_class.json"), "c" * size)
+    _write(os.path.join(target, "scratch.txt"), "not an artifact")
+    return target
+
+
+def test_key_follows_sources_and_manifest_only(cache, project):
+    key = cache.key(project)
+    _build(project)
+    _write(os.path.join(project, "README.md"), "docs")
+
+    assert cache.key(project) == key
+    _write(os.path.join(project, "src", "token.cairo"), "// name: Other\n")
+    assert cache.key(project) != key
+    _write(os.path.join(project, "src", "token.cairo"), "// name: Token\n")
+    _write(os.path.join(project, "Scarb.lock"), "version = 1\n")
+    assert cache.key(project) != key
+
+
+def test_stored_artifacts_are_restored_on_a_hit(cache, project, tmp_path):
+    key = cache.key(project)
+    assert not cache.restore(key, str(tmp_path / "out"))
+
+    cache.store(key, _build(project))
+
+    assert cache.restore(key, str(tmp_path / "out"))
+    assert sorted(os.listdir(tmp_path / "out")) == [
+        "token_Token.compiled_contract_class.json",
+        "token_Token.contract_class.json",
+    ]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, project):
+    cache = BuildCache(str(tmp_path / "cache"), max_bytes=50)
+    target = _build(project, size=10)
+    for key in ("a", "b"):
+        cache.store(key, target)
+    cache.restore("a", str(tmp_path / "out"))
+
+    cache.store("c", target)
+
+    assert cache.stats()["evictions"] == 1
+    assert not os.path.exists(tmp_path / "cache" / "b")
+    assert cache.restore("a", str(tmp_path / "out"))
+    assert cache.restore("c", str(tmp_path / "out"))
+
+
+def test_entries_survive_a_restart(tmp_path, project):
+    BuildCache(str(tmp_path / "cache")).store("a", _build(project))
+
+    reopened = BuildCache(str(tmp_path / "cache"))
+
+    assert reopened.stats()["entries"] == 1
+    assert reopened.restore("a", str(tmp_path / "out"))
+
+
+def test_size_bound_covers_entries_of_other_workers(tmp_path, project):
+    one = BuildCache(str(tmp_path / "cache"), max_bytes=50)
+    two = BuildCache(str(tmp_path / "cache"), max_bytes=50)
+    target = _build(project, size=10)
+
+    one.store("a", target)
+    two.store("b", target)
+    one.store("c", target)
+
+    assert sorted(os.listdir(tmp_path / "cache")) == ["b", "c"]
+
+
+def test_entry_evicted_mid_copy_is_a_miss(cache, project, tmp_path, monkeypatch):
+    cache.store("a", _build(project))
+    copy2 = shutil.copy2
+
+    def evicted_by_another_worker(src, dst):
+        copy2(src, dst)
+        shutil.rmtree(tmp_path / "cache" / "a")
+
+    monkeypatch.setattr("build_cache.shutil.copy2", evicted_by_another_worker)
+
+    assert not cache.restore("a", str(tmp_path / "out"))
+    assert os.listdir(tmp_path / "out") == []
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 1)
+
+
+def test_entry_being_restored_is_not_evicted(tmp_path, project, monkeypatch):
+    cache = BuildCache(str(tmp_path / "cache"), max_bytes=50)
+    target = _build(project, size=10)
+    cache.store("a", target)
+    cache.store("b", target)
+    copy2 = shutil.copy2
+    stored = []
+
+    def store_while_copying(src, dst):
+        if not stored:
+            stored.append(True)
+            cache.store("c", target)
+        copy2(src, dst)
+
+    monkeypatch.setattr("build_cache.shutil.copy2", store_while_copying)
+
+    assert cache.restore("a", str(tmp_path / "out"))
+    assert sorted(os.listdir(tmp_path / "cache")) == ["a", "c"]
@@ -0,0 +1,140 @@
+import pytest
+
+from cairo_preflight import CairoPreflightError, analyze, default_calldata
+
+COUNTER = """
+#[starknet::contract]
+mod Counter {
+    use starknet::ContractAddress;
+
+    #[derive(Drop, Serde)]
+    struct Limits {
+        low: u8,
+        high: u256,
+    }
+
+    #[derive(Drop, Serde)]
+    enum Mode {
+        Open: (),
+        Capped: u64,
+    }
+
+    #[storage]
+    struct Storage {
+        value: u128,
+    }
+
+    // A "quoted" comment with a stray { does not count
+    #[constructor]
+    fn constructor(
+        ref self: ContractState,
+        owner: ContractAddress,
+        label: ByteArray,
+        limits: Limits,
+        mode: Mode,
+        tags: Array<felt252>,
+        note: Option<u32>,
+    ) {
+        let _greeting = "}{";
+        self.value.write(0);
+    }
+}
+"""
+
+
+def test_analyze_reads_the_contract_and_constructor():
+    analysis = analyze(COUNTER)
+
+    assert analysis.contract_name == "Counter"
+    assert [(p.name, p.type) for p in analysis.constructor] == [
+        ("owner", "ContractAddress"),
+        ("label", "ByteArray"),
+        ("limits", "Limits"),
+        ("mode", "Mode"),
+        ("tags", "Array<felt252>"),
+        ("note", "Option<u32>"),
+    ]
+    assert analysis.calldata == [
+        "0x0",
+        "0x0", "0x0", "0x0",
+        "0x0", "0x0", "0x0",
+        "0x0",
+        "0x0",
+        "0x1",
+    ]
+
+
+def test_contract_without_constructor_has_no_calldata():
+    code = "#[starknet::contract]\nmod Empty {\n    #[storage]\n    struct Storage {}\n}\n"
+
+    assert analyze(code, contract_name="Empty").calldata == []
+
+
+@pytest.mark.parametrize(
+    "code, message",
+    [
+        ("", "contract source is empty"),
+        ("fn main() {}", "no #[starknet::contract] module found"),
+        ("#[starknet::contract]\nmod A {\n    #[storage]\n    struct Storage {}\n", "unclosed '{'"),
+        ("#[starknet::contract]\nmod A {\n    #[storage]\n    struct Storage {}\n)}", "unbalanced ')'"),
+        ("#[starknet::contract]\nmod A {\n    let s = \"open;\n}", "unterminated string literal"),
+        ("#[starknet::contract]\nmod A {\n}\n", "contract module has no #[storage] struct Storage"),
+        (
+            "#[starknet::contract]\nmod A {\n    #[storage]\n    struct Storage {}\n}\n"
+            "#[starknet::contract]\nmod B {\n    #[storage]\n    struct Storage {}\n}\n",
+            "more than one #[starknet::contract] module",
+        ),
+    ],
+)
+def test_rejects_invalid_sources(code, message):
+    with pytest.raises(CairoPreflightError) as raised:
+        analyze(code)
+
+    assert raised.value.message == message
+
+
+def test_error_reports_the_line():
+    with pytest.raises(CairoPreflightError) as raised:
+        analyze("#[starknet::contract]\nmod A {\n    #[storage]\n    struct Storage {}\n    fn f() { ]\n}\n")
+
+    assert raised.value.details == {"line": 5}
+
+
+def test_contract_name_must_match():
+    with pytest.raises(CairoPreflightError) as raised:
+        analyze(COUNTER, contract_name="YourContract")
+
+    assert raised.value.details["found"] == "Counter"
+
+
+def test_oversized_source_is_rejected_first():
+    with pytest.raises(CairoPreflightError) as raised:
+        analyze("x" * 100, max_bytes=10)
+
+    assert raised.value.details == {"bytes": 100, "max_bytes": 10}
+
+
+def test_unknown_parameter_type_names_the_parameter():
+    code = COUNTER.replace("note: Option<u32>", "pair: external::Pair")
+
+    with pytest.raises(CairoPreflightError) as raised:
+        analyze(code)
+
+    assert raised.value.message == "unsupported constructor parameter type"
+    assert raised.value.details == {"parameter": "pair", "type": "Pair"}
+
+
+@pytest.mark.parametrize(
+    "type_text, expected",
+    [
+        ("core::integer::u256", ["0x0", "0x0"]),
+        ("(u8, bool)", ["0x0", "0x0"]),
+        ("[u16; 3]", ["0x0", "0x0", "0x0"]),
+        ("Span<ContractAddress>", ["0x0"]),
+        ("NonZero<u256>", ["0x1", "0x0"]),
+        ("Box<felt252>", ["0x0"]),
+        ("()", []),
+    ],
+)
+def test_default_calldata(type_text, expected):
+    assert default_calldata(type_text) == expected
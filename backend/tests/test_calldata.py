@@ -0,0 +1,78 @@
+import pytest
+
+from calldata import (
+    FIELD_PRIME,
+    encode_address,
+    encode_byte_array,
+    encode_felt,
+    encode_u8,
+    encode_u256,
+    nft_constructor_calldata,
+    token_constructor_calldata,
+)
+
+
+def test_felt_range():
+    assert encode_felt(0) == "0x0"
+    assert encode_felt(FIELD_PRIME - 1) == hex(FIELD_PRIME - 1)
+    for value in (-1, FIELD_PRIME):
+        with pytest.raises(ValueError):
+            encode_felt(value)
+
+
+def test_u8_range():
+    assert encode_u8(255) == ["0xff"]
+    with pytest.raises(ValueError):
+        encode_u8(256)
+
+
+def test_u256_is_low_word_first():
+    assert encode_u256(1) == ["0x1", "0x0"]
+    assert encode_u256(2**128 + 5) == ["0x5", "0x1"]
+    assert encode_u256(2**256 - 1) == [hex(2**128 - 1), hex(2**128 - 1)]
+    with pytest.raises(ValueError):
+        encode_u256(2**256)
+
+
+def test_short_byte_array_is_all_pending_word():
+    assert encode_byte_array("") == ["0x0", "0x0", "0x0"]
+    assert encode_byte_array("abc") == ["0x0", hex(0x616263), "0x3"]
+
+
+def test_byte_array_splits_full_31_byte_words():
+    text = "a" * 31 + "bc"
+
+    assert encode_byte_array(text) == [
+        "0x1",
+        hex(int.from_bytes(b"a" * 31, "big")),
+        hex(0x6263),
+        "0x2",
+    ]
+    assert encode_byte_array("a" * 31) == ["0x1", hex(int.from_bytes(b"a" * 31, "big")), "0x0", "0x0"]
+
+
+def test_byte_array_counts_utf8_bytes():
+    assert encode_byte_array("é")[-1] == "0x2"
+
+
+def test_address_is_one_felt():
+    assert encode_address("0x0ABC") == ["0xabc"]
+    with pytest.raises(ValueError):
+        encode_address(hex(FIELD_PRIME))
+
+
+def test_token_constructor_calldata():
+    assert token_constructor_calldata("Tok", "T", 18, 10**18) == [
+        "0x0", hex(int.from_bytes(b"Tok", "big")), "0x3",
+        "0x0", hex(ord("T")), "0x1",
+        hex(18),
+        hex(10**18), "0x0",
+    ]
+
+
+def test_nft_constructor_calldata_ends_with_the_owner():
+    calldata = nft_constructor_calldata("Coll", "C", "ipfs://x/", "0x1234")
+
+    assert calldata[:3] == ["0x0", hex(int.from_bytes(b"Coll", "big")), "0x4"]
+    assert calldata[-1] == "0x1234"
+    assert len(calldata) == 3 * 3 + 1
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from class_registry import ClassRegistry, artifact_hash
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "registry.sqlite3")
+
+
+def test_lookup_is_per_network(path):
+    registry = ClassRegistry(path)
+    registry.put("sepolia", "abc", "0x1", "MyToken")
+
+    assert registry.get("sepolia", "abc") == "0x1"
+    assert registry.get("mainnet", "abc") is None
+    assert len(registry) == 1
+
+
+def test_rows_are_loaded_at_startup(path):
+    ClassRegistry(path).put("sepolia", "abc", "0x1")
+
+    assert len(ClassRegistry(path)) == 1
+
+
+def test_miss_falls_through_to_another_process_writes(path):
+    reader = ClassRegistry(path)
+    ClassRegistry(path).put("sepolia", "abc", "0x1")
+
+    assert reader.get("sepolia", "abc") == "0x1"
+
+
+def test_artifact_hash_reads_the_named_sierra_class(tmp_path):
+    target = str(tmp_path)
+    with open(os.path.join(target, "token_MyToken.contract_class.json"), "w", encoding="utf-8") as f:
+        f.write("{}")
+
+    assert artifact_hash(target, "MyToken") == "44136fa355b3678a1146ad16f7e8649e94fb4fc21fe77e8310c060f61caaff8a"
+    assert artifact_hash(target, "MyNFT") is None
@@ -0,0 +1,159 @@
+import pytest
+
+from conftest import post_json, wait_until
+from history import HistoryQuery, HistoryStore, normalize_address, parse_cursor
+from jobs import JOB_SUCCEEDED, Job
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.sqlite3"), "sepolia", batch_size=1000, flush_interval=60)
+
+
+def _mint(store: HistoryStore, uri: int, owner: str = "0xa11ce", contract: str = "0xc0", **kwargs) -> None:
+    params = {"contract_address": contract, "recipient": owner, "uri": str(uri)}
+    store.record("mint-nft", params, {"transaction_hash": hex(uri)}, owner=owner, **kwargs)
+
+
+def _pages(store: HistoryStore, query: HistoryQuery) -> list:
+    pages = []
+    while True:
+        page = store.query(query)
+        pages.append([int(item["params"]["uri"]) for item in page["items"]])
+        if page["next_cursor"] is None:
+            return pages
+        query = query._replace(cursor=parse_cursor(page["next_cursor"]))
+
+
+def test_pages_are_newest_first_without_gaps_or_repeats(store):
+    for uri in range(7):
+        _mint(store, uri)
+
+    assert _pages(store, HistoryQuery(limit=3)) == [[6, 5, 4], [3, 2, 1], [0]]
+
+
+def test_exactly_full_last_page_ends_with_an_empty_one(store):
+    for uri in range(4):
+        _mint(store, uri)
+
+    assert _pages(store, HistoryQuery(limit=2)) == [[3, 2], [1, 0], []]
+
+
+def test_rows_recorded_in_the_same_instant_page_by_id(store, monkeypatch):
+    monkeypatch.setattr("history.time.time", lambda: 1700000000.0)
+    for uri in range(5):
+        _mint(store, uri)
+
+    assert _pages(store, HistoryQuery(limit=2)) == [[4, 3], [2, 1], [0]]
+
+
+def test_rows_recorded_after_the_first_page_do_not_shift_later_pages(store):
+    for uri in range(4):
+        _mint(store, uri)
+    first = store.query(HistoryQuery(limit=2))
+    _mint(store, 99)
+
+    second = store.query(HistoryQuery(limit=2, cursor=parse_cursor(first["next_cursor"])))
+
+    assert [item["params"]["uri"] for item in second["items"]] == ["1", "0"]
+
+
+def test_filters_match_normalized_addresses(store):
+    _mint(store, 1, owner="0xA11CE", contract="0x00c0")
+    _mint(store, 2, owner="0xb0b", contract="0xc0")
+    _mint(store, 3, owner="0xa11ce", contract="0xc1")
+
+    assert _pages(store, HistoryQuery(owner="0x0a11ce")) == [[3, 1]]
+    assert _pages(store, HistoryQuery(contract_address="0xC0")) == [[2, 1]]
+    assert _pages(store, HistoryQuery(owner="0xa11ce", contract_address="0xc0")) == [[1]]
+
+
+def test_time_range_is_inclusive(store, monkeypatch):
+    now = iter([100.0, 200.0, 300.0])
+    monkeypatch.setattr("history.time.time", lambda: next(now))
+    for uri in range(3):
+        _mint(store, uri)
+
+    assert _pages(store, HistoryQuery(since=200.0)) == [[2, 1]]
+    assert _pages(store, HistoryQuery(until=200.0)) == [[1, 0]]
+    assert _pages(store, HistoryQuery(since=150.0, until=250.0)) == [[1]]
+
+
+def test_query_sees_its_own_buffered_writes(store):
+    _mint(store, 1)
+
+    assert store.stats()["pending"] == 1
+    assert len(store.query(HistoryQuery())["items"]) == 1
+    assert store.stats()["pending"] == 0
+
+
+def test_other_networks_are_not_listed(store, tmp_path):
+    other = HistoryStore(store.path, "mainnet", flush_interval=60)
+    _mint(other, 1)
+    other.flush()
+
+    assert store.query(HistoryQuery())["items"] == []
+
+
+def test_limit_is_capped(store):
+    store.max_limit = 2
+    for uri in range(3):
+        _mint(store, uri)
+
+    assert len(store.query(HistoryQuery(limit=100))["items"]) == 2
+
+
+def test_succeeded_deploy_job_is_recorded_with_stage_timings(store):
+    job = Job("deploy-nft", {"name": "Coll", "symbol": "C", "base_uri": "ipfs://x/"}, meta={"owner": "0xA11CE"})
+    job.update(
+        status=JOB_SUCCEEDED,
+        stages=[{"name": "build", "started_at": 10.0, "finished_at": 12.5}],
+        result={"contract_address": "0xC0", "class_hash": "0x5", "transaction_hash": "0x6"},
+        finished_at=job.created_at + 3,
+    )
+
+    store.job_finished(job)
+    item = store.query(HistoryQuery(symbol="C"))["items"][0]
+
+    assert (item["kind"], item["owner"], item["contract_address"], item["job_id"]) == (
+        "deploy-nft", "0xa11ce", "0xc0", job.id
+    )
+    assert item["stages"] == {"build": 2.5}
+    assert item["duration"] == pytest.approx(3)
+
+
+def test_failed_job_is_not_recorded(store):
+    job = Job("create-token", {"name": "T"})
+    job.update(status="failed")
+
+    store.job_finished(job)
+
+    assert store.query(HistoryQuery())["items"] == []
+
+
+def test_normalize_address():
+    assert normalize_address("0x00ABC") == "0xabc"
+    assert normalize_address("") is None
+    assert normalize_address("not-hex") == "not-hex"
+
+
+def test_fire_and_forget_mint_is_recorded_once_confirmed(make_client, monkeypatch, tmp_path):
+    # A fresh client pool, so its tracker polls at this test's interval
+    monkeypatch.setattr("starknet_client._pool", None)
+    runtime, client = make_client(
+        HISTORY_ENABLED="1",
+        HISTORY_PATH=str(tmp_path / "history.sqlite3"),
+        FAKENET_ACCEPT_LATENCY="0.5",
+        TX_TRACKER_INTERVAL="0.05",
+        ADMISSION_ENABLED="0",
+    )
+    mint = {"contract_address": "0xc0", "recipient": "0xa11ce", "uri": "ipfs://1", "wait": False}
+
+    sent = post_json(client, "/mint-nft", mint)
+
+    assert sent.status_code == 202
+    assert runtime.history.query(HistoryQuery(owner="0xa11ce"))["items"] == []
+    items = wait_until(lambda: runtime.history.query(HistoryQuery(owner="0xa11ce"))["items"])
+    assert items[0]["transaction_hash"] == sent.get_json()["transaction_hash"]
+    assert items[0]["params"] == {"contract_address": "0xc0", "recipient": "0xa11ce", "uri": "ipfs://1"}
+    assert items[0]["duration"] >= 0.4
@@ -0,0 +1,92 @@
+import pytest
+
+from conftest import post_json, wait_until
+from idempotency import IdempotencyConflict, RequestDeduplicator, fingerprint
+from jobs import InProcessBackend, JobQueue
+
+TOKEN = {"name": "Token", "symbol": "TKN", "max_token": 1000, "decimals": 18}
+
+
+@pytest.fixture
+def dedup():
+    jobs = JobQueue(InProcessBackend(concurrency=1))
+    yield RequestDeduplicator(jobs)
+    jobs.backend.shutdown(wait=False)
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint("create-token", {"a": 1, "b": 2}) == fingerprint("create-token", {"b": 2, "a": 1})
+    assert fingerprint("create-token", {"a": 1}) != fingerprint("deploy-nft", {"a": 1})
+
+
+def test_identical_request_attaches_to_the_running_job(dedup, gate):
+    first = dedup.submit("create-token", lambda job: gate.wait(10) and {}, dict(TOKEN))
+    second = dedup.submit("create-token", lambda job: {}, dict(TOKEN))
+
+    assert not first.reused
+    assert second.reused
+    assert second.job is first.job
+    assert dedup.coalesced == 1
+
+
+def test_owner_label_does_not_split_identical_requests(dedup, gate):
+    first = dedup.submit("create-token", lambda job: gate.wait(10) and {}, dict(TOKEN), meta={"owner": "0xa11ce"})
+    second = dedup.submit("create-token", lambda job: {}, dict(TOKEN), meta={"owner": "0xb0b"})
+
+    assert second.job is first.job
+    assert first.job.meta == {"owner": "0xa11ce"}
+
+
+def test_finished_result_is_replayed(dedup):
+    first = dedup.submit("create-token", lambda job: {"contract_address": "0x1"}, dict(TOKEN), "key-1")
+    wait_until(lambda: dedup.stats()["in_flight"] == 0)
+
+    again = dedup.submit("create-token", lambda job: {}, dict(TOKEN), "key-1")
+
+    assert again.job is None
+    assert again.record["job_id"] == first.job.id
+    assert again.record["result"] == {"contract_address": "0x1"}
+
+
+def test_failed_job_is_forgotten_so_a_retry_runs_again(dedup):
+    def fail(job):
+        raise RuntimeError("scarb crashed")
+
+    first = dedup.submit("create-token", fail, dict(TOKEN), "key-1")
+    wait_until(lambda: first.job.done and dedup.stats()["in_flight"] == 0)
+
+    retry = dedup.submit("create-token", lambda job: {}, dict(TOKEN), "key-1")
+
+    assert not retry.reused
+    assert retry.job is not first.job
+
+
+def test_key_reused_with_another_payload_conflicts(dedup, gate):
+    dedup.submit("create-token", lambda job: gate.wait(10) and {}, dict(TOKEN), "key-1")
+
+    with pytest.raises(IdempotencyConflict):
+        dedup.submit("create-token", lambda job: {}, {**TOKEN, "symbol": "OTHER"}, "key-1")
+
+
+def test_key_conflict_is_answered_with_422(make_client):
+    _, client = make_client(ADMISSION_ENABLED="0")
+
+    first = post_json(client, "/create-token", TOKEN, **{"Idempotency-Key": "key-1"})
+    conflict = post_json(client, "/create-token", {**TOKEN, "symbol": "OTHER"}, **{"Idempotency-Key": "key-1"})
+
+    assert first.status_code in (200, 202)
+    assert conflict.status_code == 422
+    assert "key-1" in conflict.get_json()["error"]
+
+
+def test_same_launch_for_another_owner_is_deduplicated(make_client):
+    runtime, client = make_client(ADMISSION_ENABLED="0")
+
+    first = post_json(client, "/deploy-nft", {"name": "Coll", "symbol": "C", "base_uri": "ipfs://x/", "owner": "0xa11ce"})
+    second = post_json(client, "/deploy-nft", {"name": "Coll", "symbol": "C", "base_uri": "ipfs://x/", "owner": "0xb0b"})
+
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.get_json()["job_id"] == first.get_json()["job_id"]
+    job = wait_until(lambda: runtime.jobs.get(first.get_json()["job_id"]))
+    assert job.params == {"name": "Coll", "symbol": "C", "base_uri": "ipfs://x/"}
+    assert job.meta == {"owner": "0xa11ce"}
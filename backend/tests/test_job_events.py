@@ -0,0 +1,103 @@
+import json
+
+from aiohttp.test_utils import TestClient, TestServer
+
+import event_loop
+from async_app import create_async_app
+from conftest import wait_until
+from job_events import iter_events, resume_from
+from jobs import JOB_RUNNING, JOB_SUCCEEDED, Job
+
+
+def _finished_job() -> Job:
+    job = Job("create-token")
+    job.emit("status", status=JOB_RUNNING)
+    job.emit("output", tool="scarb", line="Compiling token")
+    job.emit("status", status=JOB_SUCCEEDED)
+    return job
+
+
+def _sse_ids(text: str) -> list:
+    return [int(line[4:]) for line in text.splitlines() if line.startswith("id: ")]
+
+
+def test_resume_point_from_since_or_last_event_id():
+    assert resume_from("3", None) == 3
+    assert resume_from(None, "3") == 4
+    assert resume_from("1", "3") == 1
+    assert resume_from("nope", None) == 0
+
+
+def test_events_resume_and_end_with_the_final_status():
+    job = _finished_job()
+
+    assert [e["seq"] for e in iter_events(job, since=1)] == [1, 2]
+    assert list(iter_events(job, since=3)) == []
+
+
+def test_idle_stream_yields_heartbeats():
+    job = Job("create-token")
+    job.emit("status", status=JOB_RUNNING)
+    events = iter_events(job, heartbeat=0.01)
+
+    assert next(events)["seq"] == 0
+    assert next(events) is None
+    job.emit("status", status=JOB_SUCCEEDED)
+    assert next(events)["seq"] == 1
+    assert list(events) == []
+
+
+def test_sse_stream_sends_heartbeats_until_the_job_finishes(make_client, gate):
+    runtime, client = make_client(JOB_EVENTS_HEARTBEAT="0.01", ADMISSION_ENABLED="0")
+    job = runtime.jobs.submit("create-token", lambda job: gate.wait(10) and {})
+    wait_until(lambda: job.status == JOB_RUNNING)
+
+    response = client.get(f"/jobs/{job.id}/events")
+    chunks = []
+    for chunk in response.response:
+        chunks.append(chunk.decode() if isinstance(chunk, bytes) else chunk)
+        if chunks[-1] == ": keep-alive\n\n":
+            gate.set()
+    text = "".join(chunks)
+
+    assert response.mimetype == "text/event-stream"
+    assert ": keep-alive" in text
+    assert _sse_ids(text) == list(range(len(job.events_since(0))))
+    assert f'"status": "{JOB_SUCCEEDED}"' in text.rstrip().splitlines()[-1]
+
+
+def test_stream_resumes_after_last_event_id(make_client):
+    runtime, client = make_client(ADMISSION_ENABLED="0")
+    job = runtime.jobs.submit("create-token", lambda job: {})
+    wait_until(lambda: job.done)
+    last = job.last_event()["seq"]
+
+    sse = client.get(f"/jobs/{job.id}/events", headers={"Last-Event-ID": "0"})
+    ndjson = client.get(f"/jobs/{job.id}/events?format=ndjson&since={last}")
+
+    assert _sse_ids(sse.get_data(as_text=True)) == list(range(1, last + 1))
+    assert ndjson.mimetype == "application/x-ndjson"
+    assert [json.loads(line)["seq"] for line in ndjson.get_data(as_text=True).splitlines()] == [last]
+
+
+def test_async_ndjson_stream_sends_heartbeats_until_the_job_finishes(make_runtime, gate):
+    runtime = make_runtime(JOB_EVENTS_HEARTBEAT="0.01", ADMISSION_ENABLED="0")
+    job = runtime.jobs.submit("create-token", lambda job: gate.wait(10) and {})
+
+    async def main():
+        async with TestClient(TestServer(create_async_app(runtime))) as client:
+            response = await client.get(f"/jobs/{job.id}/events?format=ndjson")
+            lines = []
+            async for line in response.content:
+                lines.append(json.loads(line))
+                if lines[-1]["type"] == "heartbeat":
+                    gate.set()
+            return lines
+
+    lines = event_loop.run(main(), timeout=30)
+    events = [line for line in lines if line["type"] != "heartbeat"]
+
+    assert len(events) < len(lines)
+    assert [e["seq"] for e in events] == list(range(len(events)))
+    assert events[-1]["type"] == "status"
+    assert events[-1]["status"] == JOB_SUCCEEDED
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import wait_until
+from jobs import JOB_FAILED, JOB_SUCCEEDED, AsyncioBackend, InProcessBackend, JobError, JobQueue
+
+
+@pytest.fixture(params=["inprocess", "asyncio"])
+def queue(request):
+    backend = InProcessBackend(concurrency=1) if request.param == "inprocess" else AsyncioBackend(concurrency=1)
+    jobs = JobQueue(backend)
+    yield jobs
+    backend.shutdown(wait=False)
+
+
+def _finished(jobs: JobQueue) -> "list":
+    finished = []
+    jobs.add_listener(finished.append)
+    return finished
+
+
+def test_sync_runner_result_and_stages(queue):
+    finished = _finished(queue)
+
+    def runner(job):
+        with job.stage("build") as info:
+            info["cached"] = True
+        return {"contract_address": "0x1"}
+
+    job = queue.submit("create-token", runner, {"name": "T"})
+    wait_until(lambda: finished)
+
+    assert finished == [job]
+    assert job.status == JOB_SUCCEEDED
+    assert job.result == {"contract_address": "0x1"}
+    assert [(s["name"], s["status"], s["cached"]) for s in job.stages] == [("build", JOB_SUCCEEDED, True)]
+    assert job.events_since(0)[-1]["type"] == "status"
+    assert job.events_since(0)[-1]["status"] == JOB_SUCCEEDED
+
+
+def test_coroutine_runner(queue):
+    finished = _finished(queue)
+
+    async def runner(job):
+        await asyncio.sleep(0)
+        return {"ok": True}
+
+    job = queue.submit("deploy-nft", runner)
+    wait_until(lambda: finished)
+
+    assert job.status == JOB_SUCCEEDED
+    assert job.result == {"ok": True}
+
+
+def test_job_error_fails_with_its_details(queue):
+    finished = _finished(queue)
+
+    def runner(job):
+        raise JobError("declare failed", stderr="boom")
+
+    job = queue.submit("create-token", runner)
+    wait_until(lambda: finished)
+
+    assert job.status == JOB_FAILED
+    assert job.error == {"error": "declare failed", "stderr": "boom"}
+
+
+def test_unexpected_exception_is_an_internal_error(queue):
+    finished = _finished(queue)
+
+    def runner(job):
+        raise KeyError("x")
+
+    job = queue.submit("create-token", runner)
+    wait_until(lambda: finished)
+
+    assert job.status == JOB_FAILED
+    assert job.error["error"] == "internal error"
+
+
+def test_depth_counts_queued_and_running_jobs(queue, gate):
+    finished = _finished(queue)
+    started = threading.Event()
+
+    def blocking(job):
+        started.set()
+        gate.wait(10)
+
+    queue.submit("create-token", blocking)
+    started.wait(10)
+    queue.submit("create-token", blocking)
+
+    assert queue.depth() == {"queued": 1, "running": 1}
+    gate.set()
+    wait_until(lambda: len(finished) == 2)
+    assert queue.depth() == {"queued": 0, "running": 0}
+
+
+def test_oldest_finished_jobs_are_evicted(queue):
+    queue.max_jobs = 2
+    finished = _finished(queue)
+
+    jobs = []
+    for _ in range(3):
+        jobs.append(queue.submit("create-token", lambda job: {}))
+        wait_until(lambda: len(finished) == len(jobs))
+
+    queue.submit("create-token", lambda job: {})
+    assert queue.get(jobs[0].id) is None
+    assert queue.get(jobs[2].id) is jobs[2]
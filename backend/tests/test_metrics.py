@@ -0,0 +1,74 @@
+from jobs import JOB_SUCCEEDED, Job
+from metrics import Counter, Histogram, OutputRing, ServiceMetrics
+
+
+def test_counter_renders_labelled_series():
+    counter = Counter("starkflow_results_total", "Results.", ("route", "outcome"))
+    counter.inc(route="mint-nft", outcome="succeeded")
+    counter.inc(2, route="mint-nft", outcome="succeeded")
+
+    assert counter.value(route="mint-nft", outcome="succeeded") == 3
+    assert counter.render() == [
+        "# HELP starkflow_results_total Results.",
+        "# TYPE starkflow_results_total counter",
+        'starkflow_results_total{route="mint-nft",outcome="succeeded"} 3',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("c", "C.", ("route",))
+    counter.inc(route='a"b\\c\nd')
+
+    assert counter.render()[-1] == 'c{route="a\\"b\\\\c\\nd"} 1'
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("h", "H.", ("stage",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.7, 3):
+        histogram.observe(value, stage="build")
+
+    assert histogram.render()[2:] == [
+        'h_bucket{stage="build",le="0.1"} 1',
+        'h_bucket{stage="build",le="1"} 3',
+        'h_bucket{stage="build",le="+Inf"} 4',
+        'h_sum{stage="build"} 4.25',
+        'h_count{stage="build"} 4',
+    ]
+
+
+def test_finished_job_records_stage_durations_and_outcome():
+    metrics = ServiceMetrics()
+    job = Job("deploy-nft")
+    job.stages = [
+        {"name": "build", "started_at": 10.0, "finished_at": 10.5},
+        {"name": "declare", "started_at": 10.5},
+    ]
+    job.update(status=JOB_SUCCEEDED)
+
+    metrics.observe_job(job)
+    text = metrics.render()
+
+    assert 'starkflow_stage_seconds_count{route="deploy-nft",stage="build"} 1' in text
+    assert 'stage="declare"' not in text
+    assert metrics.results_total.value(route="deploy-nft", outcome=JOB_SUCCEEDED) == 1
+
+
+def test_component_stats_are_read_at_scrape_time():
+    metrics = ServiceMetrics()
+    stats = {"hits": 1, "entries": 4}
+    metrics.register_stats("build_cache", lambda: stats, counters=("hits",), gauges=("entries",))
+    stats["hits"] = 5
+
+    text = metrics.render()
+
+    assert "# TYPE starkflow_build_cache_hits_total counter\nstarkflow_build_cache_hits_total 5\n" in text
+    assert "# TYPE starkflow_build_cache_entries gauge\nstarkflow_build_cache_entries 4\n" in text
+
+
+def test_output_ring_keeps_the_latest_entries():
+    ring = OutputRing(maxlen=2)
+    for code in range(3):
+        ring.append(("scarb", "build"), code, "out", "", 0.1)
+
+    assert [e["returncode"] for e in ring.snapshot()] == [1, 2]
+    assert ring.snapshot(limit=1)[0]["argv"] == ["scarb", "build"]
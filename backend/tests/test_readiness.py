@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from fakenet import FakeNode
+from readiness import DeclarationNotReady, DeclarationWaiter
+
+
+class FakeClock:
+    """Time that only moves when the waiter sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _waiter(node: FakeNode, clock: FakeClock, **kwargs) -> DeclarationWaiter:
+    return DeclarationWaiter(source=node, sleep=clock.sleep, clock=clock, **kwargs)
+
+
+def test_waits_with_exponential_backoff_until_the_declare_is_accepted():
+    clock = FakeClock()
+    node = FakeNode(clock=clock)
+    node.declare("0xABC", "0x1", ready_after=10.0)
+
+    waited = asyncio.run(_waiter(node, clock, initial_delay=1.0, max_delay=4.0).wait("0xabc", "0x1"))
+
+    assert clock.sleeps == [1.0, 2.0, 4.0, 4.0]
+    assert waited == {"skipped": False, "attempts": 5, "waited": 11.0}
+
+
+def test_class_visible_without_a_transaction_hash():
+    clock = FakeClock()
+    node = FakeNode(clock=clock)
+    node.declare("0xabc")
+
+    waited = asyncio.run(_waiter(node, clock).wait("0xabc"))
+
+    assert waited["attempts"] == 1
+    assert clock.sleeps == []
+
+
+def test_already_declared_skips_polling():
+    clock = FakeClock()
+    waited = asyncio.run(_waiter(FakeNode(clock=clock), clock).wait("0xabc", already_declared=True))
+
+    assert waited == {"skipped": True, "attempts": 0, "waited": 0.0}
+
+
+def test_rejected_declare_fails_at_once():
+    clock = FakeClock()
+    node = FakeNode(clock=clock)
+    node.declare("0xabc", "0x1", ready_after=60.0)
+    node.reject("0x1")
+
+    with pytest.raises(DeclarationNotReady) as raised:
+        asyncio.run(_waiter(node, clock).wait("0xabc", "0x1"))
+
+    assert raised.value.details["status"] == {"finality_status": "REJECTED"}
+    assert clock.sleeps == []
+
+
+def test_times_out_at_the_deadline():
+    clock = FakeClock()
+    node = FakeNode(clock=clock)
+
+    with pytest.raises(DeclarationNotReady) as raised:
+        asyncio.run(_waiter(node, clock, initial_delay=1.0, max_delay=8.0, timeout=10.0).wait("0xabc"))
+
+    assert raised.value.message == "timed out waiting for class declaration"
+    # The last sleep is cut short so the wait never overshoots the deadline
+    assert clock.sleeps == [1.0, 2.0, 4.0, 3.0]
+    assert clock.now == 10.0
+
+
+def test_transient_poll_failures_are_retried():
+    clock = FakeClock()
+    node = FakeNode(clock=clock)
+    node.declare("0xabc")
+    failures = iter([RuntimeError("connection reset")])
+
+    class FlakySource:
+        def transaction_status(self, tx_hash):
+            return {}
+
+        async def is_class_declared(self, class_hash):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            return node.is_class_declared(class_hash)
+
+    waiter = DeclarationWaiter(source=FlakySource(), initial_delay=0.5, sleep=clock.sleep, clock=clock)
+    waited = asyncio.run(waiter.wait("0xabc", "0x1"))
+
+    assert waited["attempts"] == 2
+    assert clock.sleeps == [0.5]
+
+
+def test_without_a_source_falls_back_to_a_fixed_delay():
+    clock = FakeClock()
+    waiter = DeclarationWaiter(fallback_delay=30.0, sleep=clock.sleep, clock=clock)
+
+    assert asyncio.run(waiter.wait("0xabc", "0x1")) == {"skipped": False, "attempts": 0, "waited": 30.0}
+    assert clock.sleeps == [30.0]
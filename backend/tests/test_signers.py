@@ -0,0 +1,191 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from signers import NoSignerAvailable, SignerAccount, SignerPool, create_signer_pool, is_nonce_error
+
+ALICE = SignerAccount("alice", "0xa11ce", "0x1")
+BOB = SignerAccount("bob", "0xb0b", "0x2")
+
+
+class Chain:
+    """Nonces as the node reports them, counting how often the pool asks."""
+
+    def __init__(self, **nonces: int) -> None:
+        self.nonces = {hex(int(address, 16)): nonce for address, nonce in nonces.items()}
+        self.fetches = 0
+
+    async def get_nonce(self, address: str) -> int:
+        self.fetches += 1
+        return self.nonces[hex(int(address, 16))]
+
+    async def execute(self, address: str, nonce: int) -> int:
+        expected = self.nonces[hex(int(address, 16))]
+        if nonce != expected:
+            raise RuntimeError(f"Invalid transaction nonce: expected {expected}, got {nonce}")
+        self.nonces[hex(int(address, 16))] += 1
+        return nonce
+
+
+async def _send(pool: SignerPool, error: str = None) -> tuple:
+    async with pool.lease(signing=True) as lease:
+
+        async def transaction(turn):
+            if error is not None:
+                turn.failed(error)
+            return turn.nonce
+
+        return lease.account.name, await lease.send(transaction)
+
+
+def test_nonces_advance_locally_after_one_fetch():
+    chain = Chain(**{"0xa11ce": 7})
+    pool = SignerPool([ALICE], fetch_nonce=chain.get_nonce)
+
+    async def scenario():
+        return [await _send(pool) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [("alice", 7), ("alice", 8), ("alice", 9)]
+    assert chain.fetches == 1
+
+
+def test_failed_send_does_not_spend_the_nonce():
+    chain = Chain(**{"0xa11ce": 3})
+    pool = SignerPool([ALICE], fetch_nonce=chain.get_nonce)
+
+    async def scenario():
+        return [await _send(pool, error="Contract not found"), await _send(pool)]
+
+    assert asyncio.run(scenario()) == [("alice", 3), ("alice", 3)]
+    assert pool.quarantines == 0
+
+
+def test_nonce_rejection_quarantines_and_resyncs_the_account():
+    chain = Chain(**{"0xa11ce": 5, "0xb0b": 0})
+    pool = SignerPool([ALICE, BOB], fetch_nonce=chain.get_nonce, max_leases=1, quarantine_seconds=0.2)
+
+    async def scenario():
+        sent = [await _send(pool, error="Invalid transaction nonce: expected 6, got 5")]
+        # Only bob is eligible while alice is quarantined
+        sent.append(await _send(pool))
+        sent.append(await _send(pool))
+        stats = pool.stats()
+        # Meanwhile the chain moved on; the next lease of alice reads it again
+        chain.nonces[hex(0xA11CE)] = 6
+        pool._accounts[1].quarantined_until = float("inf")
+        sent.append(await _send(pool))
+        return sent, stats
+
+    sent, stats = asyncio.run(scenario())
+
+    assert sent == [("alice", 5), ("bob", 0), ("bob", 1), ("alice", 6)]
+    assert stats["quarantines"] == 1
+    assert stats["quarantined"] == 1
+    alice = stats["accounts"][0]
+    assert (alice["nonce"], alice["nonce_errors"], alice["failed"]) == (None, 2, 1)
+    # Re-synced once for the retry, once after the quarantine
+    assert chain.fetches == 4
+
+
+def test_nonce_rejection_is_retried_once_after_a_resync():
+    chain = Chain(**{"0xa11ce": 5})
+    pool = SignerPool([ALICE], fetch_nonce=chain.get_nonce)
+
+    async def scenario():
+        sent = [await _execute(pool, chain)]
+        # Another process sent from alice meanwhile
+        chain.nonces[hex(0xA11CE)] += 1
+        sent.append(await _execute(pool, chain))
+        return sent
+
+    assert asyncio.run(scenario()) == [5, 7]
+    assert pool.quarantines == 0
+    assert pool.stats()["accounts"][0]["nonce_errors"] == 1
+
+
+def _raise(error: Exception):
+    async def transaction(turn):
+        raise error
+
+    return transaction
+
+
+async def _execute(pool: SignerPool, chain: Chain, signing: bool = True) -> int:
+    async with pool.lease(signing=signing) as lease:
+        return await lease.send(lambda turn: chain.execute(lease.account.address, turn.nonce))
+
+
+def test_exception_in_send_settles_the_turn():
+    chain = Chain(**{"0xa11ce": 1})
+    pool = SignerPool([ALICE], fetch_nonce=chain.get_nonce, quarantine_seconds=60)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with pool.lease(signing=True) as lease:
+                await lease.send(_raise(RuntimeError("nonce too low")))
+
+    asyncio.run(scenario())
+
+    assert pool.quarantines == 1
+    assert pool.stats()["in_use"] == 0
+    # Retried once, then quarantined
+    assert chain.fetches == 2
+
+
+def test_deploy_then_mint_share_the_nonce_of_a_shared_account(tmp_path, monkeypatch):
+    address = "0x0" + "a1" * 31
+    accounts_file = tmp_path / "accounts.json"
+    accounts_file.write_text(json.dumps({"alpha-sepolia": {"deployer": {"address": address, "private_key": "0x1"}}}))
+    monkeypatch.setenv("SNCAST_ACCOUNTS_FILE", str(accounts_file))
+    monkeypatch.setenv("STARKNET_ACCOUNT_ADDRESS", "0x" + "a1" * 31)
+    monkeypatch.setenv("STARKNET_PRIVATE_KEY", "0x1")
+    monkeypatch.delenv("SIGNER_ACCOUNTS_FILE", raising=False)
+    chain = Chain(**{address: 3})
+    monkeypatch.setattr("readiness.RpcStatusSource", lambda rpc_url: chain)
+    pool = create_signer_pool(SimpleNamespace(fake=None, account="deployer", rpc_url="http://127.0.0.1:1/rpc"))
+
+    async def scenario():
+        return [await _execute(pool, chain, signing=False), await _execute(pool, chain, signing=True)]
+
+    assert pool.stats()["size"] == 1
+    assert asyncio.run(scenario()) == [3, 4]
+    assert pool.stats()["accounts"][0]["nonce_errors"] == 0
+
+
+def test_sncast_account_at_another_address_stays_separate(tmp_path, monkeypatch):
+    accounts_file = tmp_path / "accounts.json"
+    accounts_file.write_text(json.dumps({"alpha-sepolia": {"deployer": {"address": "0xde9"}}}))
+    monkeypatch.setenv("SNCAST_ACCOUNTS_FILE", str(accounts_file))
+    monkeypatch.setenv("STARKNET_ACCOUNT_ADDRESS", "0xa11ce")
+    monkeypatch.setenv("STARKNET_PRIVATE_KEY", "0x1")
+    monkeypatch.delenv("SIGNER_ACCOUNTS_FILE", raising=False)
+
+    pool = create_signer_pool(SimpleNamespace(fake=None, account="deployer", rpc_url=None))
+
+    assert [(a["name"], a["address"]) for a in pool.stats()["accounts"]] == [("deployer", None), (None, "0xa11ce")]
+
+
+def test_no_eligible_account():
+    pool = SignerPool([SignerAccount("deployer")])
+
+    async def scenario():
+        async with pool.lease(signing=True):
+            pass
+
+    with pytest.raises(NoSignerAvailable):
+        asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("Invalid transaction nonce of contract at address 0x1", True),
+        ("InvalidTransactionNonce", True),
+        ("Nonce too low", True),
+        ("Transaction reverted: nonce: 0x5, out of gas", False),
+    ],
+)
+def test_is_nonce_error(message, expected):
+    assert is_nonce_error(message) is expected
@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+
+from sncast_output import SncastOutput, parse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "sncast_outputs.json")
+HASH = "0x0485b8e4e6ff1b8bf4b4b3d18ee9ac0d66c9d4a6bf1e2c7f6f2e0f3c1a9b8d7e"
+
+with open(FIXTURES, encoding="utf-8") as _f:
+    CASES = json.load(_f)
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["name"] for case in CASES])
+def test_corpus(case):
+    got = parse(case["stdout"], case["stderr"], case["returncode"])
+
+    assert got._asdict() == {**SncastOutput()._asdict(), **case["expected"]}
+
+
+def test_caused_by_line_needs_a_failed_run():
+    stderr = f"Error: Failed to declare contract\n\nCaused by:\n    Class with hash {HASH} is already declared.\n"
+
+    assert parse("", stderr, 1).already_declared
+    assert not parse("", stderr, 0).already_declared
+
+
+def test_stdout_mentioning_already_declared_is_not_trusted():
+    stdout = "warn: `Event` is already declared in this scope\n"
+
+    assert not parse(stdout, "Error: Failed to declare contract\n", 1).already_declared
+
+
+def test_hash_in_the_error_field_wins_over_other_hex_in_stderr():
+    stderr = (
+        f"Error: Class with hash {HASH} is already declared.\n"
+        "Transaction: 0x07d2e6f1a4b3c8d9e0f1a2b3c4d5e6f708192a3b4c5d6e7f8091a2b3c4d5e6f7\n"
+    )
+
+    assert parse("", stderr, 1).class_hash == HASH
+
+
+def test_first_value_of_a_field_is_kept():
+    stdout = "Class Hash: 0xaaaaaaaaaaaa\nClass Hash: 0xbbbbbbbbbbbb\n"
+
+    assert parse(stdout).class_hash == "0xaaaaaaaaaaaa"
+
+
+def test_json_records_win_over_text():
+    stdout = 'Class Hash: 0xaaaaaaaaaaaa\n{"command": "declare", "class_hash": "0xbbbbbbbbbbbb"}\n'
+
+    got = parse(stdout)
+
+    assert (got.class_hash, got.command, got.json) == ("0xbbbbbbbbbbbb", "declare", True)
+
+
+def test_malformed_json_lines_are_ignored():
+    assert not parse("{not json\n").json
@@ -0,0 +1,146 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from starknet_py.contract import Contract
+
+from signers import SignerAccount, SignerPool
+from starknet_client import StarknetClientPool, get_client_pool
+
+MINTER = SignerAccount(None, "0x" + "a1" * 31, "0x1234")
+
+
+class FakeMintItem:
+    def prepare_invoke_v3(self, recipient: int, uri: str):
+        return (recipient, uri)
+
+
+class FakeContract:
+    def __init__(self, address: int) -> None:
+        self.address = address
+        self.functions = {"mint_item": FakeMintItem()}
+
+
+class FakeAccount:
+    """Accepts multicalls with the next nonce in sequence; ``reject`` fails the call holding that recipient."""
+
+    def __init__(self, nonce: int = 7) -> None:
+        self.nonce = nonce
+        self.sent = []
+        self.reject = set()
+        self.confirm_after = 0.0
+        self.client = self
+
+    async def get_nonce(self, address: str) -> int:
+        return self.nonce
+
+    async def execute_v3(self, calls, nonce, auto_estimate):
+        await asyncio.sleep(0)
+        if nonce != self.nonce:
+            raise RuntimeError(f"Invalid transaction nonce: expected {self.nonce}, got {nonce}")
+        if any(recipient in self.reject for recipient, _ in calls):
+            raise RuntimeError("execution reverted")
+        self.nonce += 1
+        self.sent.append((nonce, [uri for _, uri in calls]))
+        return type("Sent", (), {"hash": 0x100 + nonce})()
+
+    async def wait_for_tx(self, tx_hash):
+        await asyncio.sleep(self.confirm_after)
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Addresses whose ABI was fetched; each fetch yields to the loop so concurrent uses overlap."""
+    fetched = []
+
+    async def from_address(address, provider):
+        fetched.append(address)
+        await asyncio.sleep(0.01)
+        if address == 0xdead:
+            raise RuntimeError("contract not found")
+        return FakeContract(address)
+
+    monkeypatch.setattr(Contract, "from_address", staticmethod(from_address))
+    return fetched
+
+
+@pytest.fixture
+def account():
+    return FakeAccount(nonce=7)
+
+
+@pytest.fixture
+def pool(account):
+    signers = SignerPool([MINTER], fetch_nonce=account.get_nonce)
+    pool = StarknetClientPool("http://127.0.0.1:1/rpc", signers, max_contracts=2)
+    yield pool
+    pool.close()
+
+
+def test_concurrent_first_uses_share_one_abi_fetch(pool, fetches):
+    async def use_twice():
+        return await asyncio.gather(pool.contract(0xc0), pool.contract(0xc0))
+
+    first, second = pool.run(use_twice())
+
+    assert first is second
+    assert pool.run(pool.contract(0xc0)) is first
+    assert fetches == [0xc0]
+
+
+def test_least_recently_used_contract_is_dropped(pool, fetches):
+    for address in (0xc0, 0xc1, 0xc0, 0xc2):
+        pool.run(pool.contract(address))
+
+    pool.run(pool.contract(0xc1))
+
+    assert fetches == [0xc0, 0xc1, 0xc2, 0xc1]
+
+
+def test_mint_failure_is_reported_not_raised(pool, fetches):
+    result = pool.run(pool.mint(hex(0xdead), "0xa11ce", "ipfs://1"))
+
+    assert result == {"ok": False, "error": "contract not found"}
+
+
+def test_unconfirmed_mint_times_out_and_is_handed_to_the_tracker(pool, account, fetches, monkeypatch):
+    account.confirm_after = 10
+
+    async def fake_account(signer):
+        return account
+
+    monkeypatch.setattr(pool, "account", fake_account)
+
+    result = pool.run(pool.mint("0xc0", "0xa11ce", "ipfs://1", timeout=0.05))
+
+    assert result["ok"] is False
+    assert result["timed_out"] is True
+    assert result["transaction_hash"] == hex(0x107)
+    assert pool.tracker.get(hex(0x107))["status"] == "pending"
+
+
+def test_batch_results_keep_input_order(pool, account, fetches, monkeypatch):
+    account.reject.add(0xb2)
+
+    async def fake_account(signer):
+        return account
+
+    monkeypatch.setattr(pool, "account", fake_account)
+    items = [(hex(0xb0 + i), f"ipfs://{i}") for i in range(5)]
+    settled = []
+
+    results = pool.run(pool.mint_batch("0xc0", items, batch_size=2, on_batch=settled.append))
+
+    assert [(r["index"], r["batch"], r["ok"]) for r in results] == [
+        (0, 0, True), (1, 0, True), (2, 1, False), (3, 1, False), (4, 2, True)
+    ]
+    assert results[2]["error"] == "execution reverted"
+    assert sorted(uris for _, uris in account.sent) == [["ipfs://0", "ipfs://1"], ["ipfs://4"]]
+    assert len(settled) == 3
+
+
+def test_no_pool_without_a_signing_account(monkeypatch):
+    monkeypatch.setattr("starknet_client._pool", None)
+    network = SimpleNamespace(fake=None, rpc_url="http://127.0.0.1:1/rpc")
+
+    assert get_client_pool(network, SignerPool([SignerAccount("deployer")])) is None
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+from toolchain import ToolchainExecutor
+
+# Echoes its arguments; `fetch` fails when FETCH_FAILS is set, `sleep` outlasts any test timeout
+STUB = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+if args[:1] == ["fetch"] and os.environ.get("FETCH_FAILS"):
+    print("registry unreachable", file=sys.stderr)
+    sys.exit(1)
+if args[:1] == ["sleep"]:
+    time.sleep(5)
+print(" ".join(args))
+"""
+
+
+@pytest.fixture
+def bin_dir(tmp_path):
+    path = tmp_path / "bin"
+    path.mkdir()
+    for tool in ("scarb", "sncast"):
+        stub = path / tool
+        stub.write_text(STUB.format(python=sys.executable))
+        stub.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def executor(bin_dir):
+    return ToolchainExecutor(env={"PATH": bin_dir})
+
+
+def test_binaries_are_resolved_to_absolute_paths(executor, bin_dir):
+    assert executor.binaries == {"scarb": os.path.join(bin_dir, "scarb"), "sncast": os.path.join(bin_dir, "sncast")}
+
+
+def test_builds_go_offline_once_warm(executor, tmp_path):
+    assert executor.scarb_build(str(tmp_path)).stdout.strip() == "build"
+
+    assert executor.warm([str(tmp_path)])
+
+    assert executor.scarb_build(str(tmp_path)).stdout.strip() == "--offline build"
+    assert executor.stats()["offline"]
+
+
+def test_failed_fetch_keeps_builds_online(bin_dir, tmp_path):
+    executor = ToolchainExecutor(env={"PATH": bin_dir, "FETCH_FAILS": "1"})
+
+    assert not executor.warm([str(tmp_path)])
+    assert executor.scarb_build(str(tmp_path)).stdout.strip() == "build"
+
+
+def test_calls_are_counted_and_recorded(executor, tmp_path):
+    executor.sncast(["declare", "--contract-name", "MyToken"], str(tmp_path))
+    timed_out = executor.run("sncast", ["sleep"], str(tmp_path), timeout=0.2)
+
+    stats = executor.stats()
+    assert timed_out.timed_out and timed_out.returncode == -1
+    assert stats["tools"]["sncast"]["calls"] == 2
+    assert stats["tools"]["sncast"]["timeouts"] == 1
+    assert stats["tools"]["sncast"]["failures"] == 1
+    assert stats["tools"]["scarb"]["calls"] == 0
+    assert stats["recent"][0]["argv"] == ["declare", "--contract-name", "MyToken"]
+
+
+def test_missing_binary_is_a_failed_result(tmp_path):
+    executor = ToolchainExecutor(binaries={"scarb": str(tmp_path / "no-such-scarb")})
+
+    result = executor.scarb_build(str(tmp_path))
+
+    assert result.returncode == 127
+    assert "failed to start scarb" in result.stderr
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from fakenet import FakeNode, FakeTxTracker
+from tx_tracker import TX_PENDING, TX_REJECTED, TX_SUCCEEDED, TX_TIMEOUT, webhook_refusal
+
+
+def _settle(node: FakeNode, tx_hashes, timeout: float = 900.0) -> tuple:
+    settled = []
+
+    async def scenario():
+        tracker = FakeTxTracker(node, None, interval=60, timeout=timeout)
+        for tx_hash in tx_hashes:
+            tracker.track(tx_hash, {"uri": tx_hash}, on_settled=settled.append)
+        await tracker.poll(tracker.pending())
+        return tracker
+
+    tracker = asyncio.run(scenario())
+    return settled, tracker
+
+
+def test_settled_transactions_are_handed_to_their_callback():
+    node = FakeNode()
+    node.send("0x1")
+    node.send("0x2")
+    node.reject("0x2")
+    node.send("0x3", ready_after=60)
+
+    settled, tracker = _settle(node, ["0x1", "0x2", "0x3"])
+
+    assert [(r["transaction_hash"], r["status"]) for r in settled] == [("0x1", TX_SUCCEEDED), ("0x2", TX_REJECTED)]
+    assert settled[0]["uri"] == "0x1"
+    assert settled[0]["settled_at"] >= settled[0]["submitted_at"]
+    assert tracker.get("0x3")["status"] == TX_PENDING
+
+
+def test_unseen_transaction_times_out():
+    settled, _ = _settle(FakeNode(), ["0x9"], timeout=-1)
+
+    assert [r["status"] for r in settled] == [TX_TIMEOUT]
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/hook",
+    "http://localhost:8080/hook",
+    "http://169.254.169.254/latest/meta-data",
+    "http://10.0.0.7/hook",
+    "http://[::ffff:192.168.1.1]/hook",
+    "http:///hook",
+])
+def test_webhooks_to_internal_addresses_are_refused(url):
+    assert webhook_refusal(url) is not None
+
+
+def test_webhook_to_a_public_address_is_allowed():
+    assert webhook_refusal("https://93.184.216.34/hook") is None
+
+
+def test_allowed_webhook_hosts_replace_the_address_check(monkeypatch):
+    monkeypatch.setenv("MINT_WEBHOOK_ALLOWED_HOSTS", "localhost, hooks.example.com")
+
+    assert webhook_refusal("http://LOCALHOST:8080/hook") is None
+    assert webhook_refusal("https://93.184.216.34/hook") is not None
+
+
+def test_refused_webhook_is_not_posted():
+    posted = []
+
+    class Session:
+        def post(self, url, **kwargs):
+            posted.append(url)
+            raise AssertionError("webhook posted")
+
+    async def session_factory():
+        return Session()
+
+    tracker = FakeTxTracker(FakeNode(), session_factory)
+
+    asyncio.run(tracker._notify("http://127.0.0.1:9/hook", {"transaction_hash": "0x1"}))
+
+    assert posted == []
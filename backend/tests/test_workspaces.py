@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from workspaces import WorkspaceManager
+
+
+@pytest.fixture
+def template(tmp_path):
+    path = tmp_path / "token-contract"
+    (path / "src").mkdir(parents=True)
+    (path / "src" / "lib.cairo").write_text("mod token;\n")
+    (path / "Scarb.toml").write_text('[package]\nname = "token"\n')
+    (path / "Scarb.lock").write_text("version = 1\n")
+    (path / "target" / "dev").mkdir(parents=True)
+    return str(path)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return WorkspaceManager(str(tmp_path / "workspaces"), gc_interval=60)
+
+
+def test_workspace_copies_sources_and_links_the_rest(manager, template):
+    path = manager.create(template)
+
+    assert not os.path.islink(os.path.join(path, "src"))
+    assert os.path.samefile(os.path.join(path, "Scarb.toml"), os.path.join(template, "Scarb.toml"))
+    assert not os.path.samefile(os.path.join(path, "target"), os.path.join(template, "target"))
+
+
+def test_concurrent_workspaces_hold_different_target_dirs(manager, template):
+    first = manager.create(template)
+    second = manager.create(template)
+
+    assert os.path.realpath(os.path.join(first, "target")) != os.path.realpath(os.path.join(second, "target"))
+    assert manager.stats()["targets_held"] == 2
+
+
+def test_released_target_dir_is_reused_with_its_contents(manager, template):
+    first = manager.create(template)
+    os.makedirs(os.path.join(first, "target", "dev", "incremental"))
+    target = os.path.realpath(os.path.join(first, "target"))
+    manager.release(first)
+    manager.collect()
+
+    second = manager.create(template)
+
+    assert not os.path.exists(first)
+    assert os.path.realpath(os.path.join(second, "target")) == target
+    assert os.path.isdir(os.path.join(second, "target", "dev", "incremental"))
+
+
+def test_target_dirs_are_never_collected(manager, template):
+    manager.max_age = 0
+    path = manager.create(template)
+    target = os.path.realpath(os.path.join(path, "target"))
+    manager.release(path)
+
+    assert manager.collect() == 1
+    assert os.path.isdir(target)
+
+
+def test_managers_sharing_a_root_do_not_share_target_dirs(manager, template):
+    # As two worker processes would
+    other = WorkspaceManager(manager.root, gc_interval=60)
+
+    first = manager.create(template)
+    second = other.create(template)
+
+    assert os.path.realpath(os.path.join(first, "target")) != os.path.realpath(os.path.join(second, "target"))
+
+
+def test_workspace_in_use_by_another_manager_is_not_collected(manager, template):
+    other = WorkspaceManager(manager.root, max_age=0, gc_interval=60)
+    path = manager.create(template)
+
+    assert other.collect() == 0
+    assert os.path.isdir(path)
+
+    # Left behind, as by a worker that exited without collecting
+    manager.release(path)
+
+    assert other.collect() == 1
+    assert not os.path.exists(path)
+
+
+def test_private_targets_when_sharing_is_off(tmp_path, template):
+    manager = WorkspaceManager(str(tmp_path / "workspaces"), gc_interval=60, shared_targets=False)
+
+    path = manager.create(template)
+
+    assert not os.path.exists(os.path.join(path, "target"))
+    assert manager.stats()["targets_held"] == 0
@@ -1,2 +1,2 @@
 pub mod erc20_token;
-
+pub mod erc20_template;
@@ -1,6 +1,7 @@
 use contracts::your_contract::YourContract::FELT_STRK_CONTRACT;
 use contracts::your_contract::{IYourContractDispatcher, IYourContractDispatcherTrait};
 use contracts::erc20_token::MyToken::{IERC20Dispatcher as MyTokenDispatcher, IERC20DispatcherTrait as MyTokenDispatcherTrait};
+use contracts::erc20_token::{IERC20Dispatcher as TemplateTokenDispatcher, IERC20DispatcherTrait as TemplateTokenDispatcherTrait};
 use openzeppelin_testing::declare_and_deploy;
 use openzeppelin_token::erc20::interface::{IERC20Dispatcher, IERC20DispatcherTrait};
 use openzeppelin_utils::serde::SerializedAppend;
@@ -109,3 +110,22 @@ fn test_erc20_transfer_approve() {
     assert(ok3 == true, 'transfer_from should succeed');
     assert(token.balance_of(recipient) == 0, 'recipient debited');
 }
+
+#[test]
+fn test_erc20_template_constructor_calldata() {
+    // Exactly what backend/calldata.py token_constructor_calldata(
+    //     "Starkflow Community Governance Token", "SCGT", 6, 10**24) produces
+    let calldata = array![
+        0x1, 0x537461726b666c6f7720436f6d6d756e69747920476f7665726e616e636520, 0x546f6b656e, 0x5,
+        0x0, 0x53434754, 0x4,
+        0x6,
+        0xd3c21bcecceda1000000, 0x0,
+    ];
+    let token_address = declare_and_deploy("MyTokenTemplate", calldata);
+    let token = TemplateTokenDispatcher { contract_address: token_address };
+
+    assert(token.name() == "Starkflow Community Governance Token", 'name');
+    assert(token.symbol() == "SCGT", 'symbol');
+    assert(token.decimals() == 6, 'decimals');
+    assert(token.total_supply() == 1000000000000000000000000, 'total supply');
+}
@@ -0,0 +1,243 @@
+import asyncio
+import codecs
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+TOOLS = ("scarb", "sncast")
+_READ_CHUNK = 64 * 1024
+
+# on_line(stream, line): stream is "stdout" or "stderr", line has no trailing newline
+OutputCallback = Callable[[str, str], None]
+
+
+class CommandResult(NamedTuple):
+    tool: str
+    argv: List[str]
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+
+
+class ToolchainExecutor:
+    """Single instrumented entry point for running scarb and sncast.
+
+    Binaries are resolved to absolute paths once and run without a shell, each
+    tool has its own concurrency limit, and every call is timed. ``warm()``
+    runs ``scarb fetch`` for the project templates at boot; once that succeeds
+    builds pass ``--offline`` so scarb skips registry resolution per request.
+    ``arun`` is the event-loop variant used by the deploy pipeline: the child
+    is spawned with ``asyncio.create_subprocess_exec`` and awaited, so waiting
+    on scarb or sncast never holds a thread.
+    """
+
+    def __init__(
+        self,
+        binaries: Optional[Dict[str, str]] = None,
+        timeout: float = 600.0,
+        max_concurrency: Optional[Dict[str, int]] = None,
+        env: Optional[Dict[str, str]] = None,
+        history_size: int = 200,
+    ) -> None:
+        self.timeout = timeout
+        self.env = {**os.environ, **(env or {})}
+        self.binaries: Dict[str, str] = {}
+        for tool in TOOLS:
+            name = (binaries or {}).get(tool, tool)
+            self.binaries[tool] = shutil.which(name, path=self.env.get("PATH")) or name
+        self._limits = {tool: (max_concurrency or {}).get(tool, 4) for tool in TOOLS}
+        self._slots = {tool: threading.BoundedSemaphore(limit) for tool, limit in self._limits.items()}
+        # Created on first arun() so they bind to the shared loop
+        self._async_slots: Optional[Dict[str, asyncio.Semaphore]] = None
+        self.offline = False
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {
+            tool: {"calls": 0, "failures": 0, "timeouts": 0, "total_seconds": 0.0, "max_seconds": 0.0} for tool in TOOLS
+        }
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+
+    def run(self, tool: str, args: Sequence[str], cwd: str, timeout: Optional[float] = None) -> CommandResult:
+        argv = [self.binaries[tool], *args]
+        timed_out = False
+        with self._slots[tool]:
+            started = time.perf_counter()
+            try:
+                completed = subprocess.run(
+                    argv,
+                    cwd=cwd,
+                    env=self.env,
+                    text=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=timeout or self.timeout,
+                )
+                returncode, stdout, stderr = completed.returncode, completed.stdout, completed.stderr
+            except subprocess.TimeoutExpired as e:
+                timed_out = True
+                returncode = -1
+                stdout = _decode(e.stdout)
+                stderr = _decode(e.stderr) + f"\n{tool} timed out after {timeout or self.timeout}s"
+            except OSError as e:
+                returncode, stdout, stderr = 127, "", f"failed to start {tool}: {e}"
+            duration = time.perf_counter() - started
+
+        self._record(tool, argv, returncode, duration, timed_out)
+        return CommandResult(tool, argv, returncode, stdout, stderr, duration, timed_out)
+
+    async def arun(
+        self,
+        tool: str,
+        args: Sequence[str],
+        cwd: str,
+        timeout: Optional[float] = None,
+        on_line: Optional[OutputCallback] = None,
+    ) -> CommandResult:
+        """``run`` for the event loop: same limits, timeout and stats, no blocking.
+
+        stdout and stderr are read from the pipes as the tool writes them;
+        ``on_line(stream, line)`` is called for every complete line.
+        """
+        argv = [self.binaries[tool], *args]
+        timed_out = False
+        async with self._async_slot(tool):
+            started = time.perf_counter()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv, cwd=cwd, env=self.env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                )
+            except OSError as e:
+                returncode, stdout, stderr = 127, "", f"failed to start {tool}: {e}"
+            else:
+                out: List[str] = []
+                err: List[str] = []
+                pumps = asyncio.gather(
+                    _pump(proc.stdout, "stdout", out, on_line),
+                    _pump(proc.stderr, "stderr", err, on_line),
+                )
+                try:
+                    await asyncio.wait_for(asyncio.shield(pumps), timeout or self.timeout)
+                    returncode = await proc.wait()
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    # The pipes close once the child is gone, which ends the pumps
+                    await pumps
+                    await proc.wait()
+                    timed_out = True
+                    returncode = -1
+                    err.append(f"\n{tool} timed out after {timeout or self.timeout}s")
+                stdout, stderr = "".join(out), "".join(err)
+            duration = time.perf_counter() - started
+
+        self._record(tool, argv, returncode, duration, timed_out)
+        return CommandResult(tool, argv, returncode, stdout, stderr, duration, timed_out)
+
+    def _async_slot(self, tool: str) -> asyncio.Semaphore:
+        if self._async_slots is None:
+            self._async_slots = {t: asyncio.Semaphore(limit) for t, limit in self._limits.items()}
+        return self._async_slots[tool]
+
+    def scarb_build_args(self) -> List[str]:
+        return ["--offline", "build"] if self.offline else ["build"]
+
+    def scarb_build(self, cwd: str) -> CommandResult:
+        return self.run("scarb", self.scarb_build_args(), cwd)
+
+    def sncast(self, args: Sequence[str], cwd: str) -> CommandResult:
+        return self.run("sncast", args, cwd)
+
+    async def ascarb_build(self, cwd: str, on_line: Optional[OutputCallback] = None) -> CommandResult:
+        return await self.arun("scarb", self.scarb_build_args(), cwd, on_line=on_line)
+
+    async def asncast(self, args: Sequence[str], cwd: str, on_line: Optional[OutputCallback] = None) -> CommandResult:
+        return await self.arun("sncast", args, cwd, on_line=on_line)
+
+    def warm(self, project_dirs: Iterable[str]) -> bool:
+        """Resolve and download every template's dependencies once; enables offline builds on success."""
+        ok = True
+        for project_dir in project_dirs:
+            result = self.run("scarb", ["fetch"], project_dir)
+            if result.returncode != 0:
+                ok = False
+                logger.warning("scarb fetch failed in %s: %s", project_dir, result.stderr or result.stdout)
+        self.offline = ok
+        logger.info("toolchain warm-up finished (offline builds %s)", "enabled" if ok else "disabled")
+        return ok
+
+    def warm_in_background(self, project_dirs: Iterable[str]) -> threading.Thread:
+        thread = threading.Thread(target=self.warm, args=(list(project_dirs),), name="toolchain-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def _record(self, tool: str, argv: List[str], returncode: int, duration: float, timed_out: bool) -> None:
+        with self._stats_lock:
+            stats = self._stats[tool]
+            stats["calls"] += 1
+            stats["failures"] += returncode != 0
+            stats["timeouts"] += timed_out
+            stats["total_seconds"] += duration
+            stats["max_seconds"] = max(stats["max_seconds"], duration)
+            self.history.append(
+                {"tool": tool, "argv": argv[1:], "returncode": returncode, "seconds": round(duration, 4), "at": time.time()}
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "offline": self.offline,
+                "binaries": dict(self.binaries),
+                "tools": {tool: dict(stats) for tool, stats in self._stats.items()},
+                "recent": list(self.history)[-20:],
+            }
+
+
+async def _pump(
+    stream: asyncio.StreamReader, name: str, chunks: List[str], on_line: Optional[OutputCallback]
+) -> None:
+    """Drain ``stream`` into ``chunks``, reporting each complete line as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while True:
+        data = await stream.read(_READ_CHUNK)
+        text = decoder.decode(data, final=not data)
+        chunks.append(text)
+        if on_line is not None:
+            pending += text
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                on_line(name, line)
+        if not data:
+            break
+    if on_line is not None and pending:
+        on_line(name, pending)
+
+
+def _decode(output: Any) -> str:
+    if output is None:
+        return ""
+    return output.decode(errors="replace") if isinstance(output, bytes) else output
+
+
+def create_toolchain(network: Optional[Any] = None) -> ToolchainExecutor:
+    """Build the executor from the TOOLCHAIN_* settings; a fake network gets the in-process stand-in."""
+    max_concurrency = {
+        "scarb": int(os.getenv("TOOLCHAIN_SCARB_CONCURRENCY", str(os.cpu_count() or 2))),
+        "sncast": int(os.getenv("TOOLCHAIN_SNCAST_CONCURRENCY", "4")),
+    }
+    if network is not None and network.fake is not None:
+        from fakenet import FakeToolchain
+
+        return FakeToolchain(network.fake, max_concurrency=max_concurrency)
+    return ToolchainExecutor(
+        binaries={"scarb": os.getenv("SCARB_BIN", "scarb"), "sncast": os.getenv("SNCAST_BIN", "sncast")},
+        timeout=float(os.getenv("TOOLCHAIN_TIMEOUT", "600")),
+        max_concurrency=max_concurrency,
+    )
@@ -0,0 +1,252 @@
+import asyncio
+import ipaddress
+import logging
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+TX_PENDING = "pending"
+TX_SUCCEEDED = "succeeded"
+TX_REVERTED = "reverted"
+TX_REJECTED = "rejected"
+TX_TIMEOUT = "timeout"
+
+_ACCEPTED_STATUSES = ("ACCEPTED_ON_L2", "ACCEPTED_ON_L1")
+
+
+def _allowed_webhook_hosts() -> Optional[Set[str]]:
+    hosts = {h.strip().lower() for h in os.getenv("MINT_WEBHOOK_ALLOWED_HOSTS", "").split(",") if h.strip()}
+    return hosts or None
+
+
+def _refusal(host: str, addresses: List[str]) -> Optional[str]:
+    if not addresses:
+        return f"host {host} does not resolve"
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            return f"host {host} resolves to non-public address {ip}"
+    return None
+
+
+def _checked_host(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """(host to resolve, None), or (None, refusal) when the URL is decided without resolving it."""
+    host = urlsplit(url).hostname
+    if not host:
+        return None, "URL has no host"
+    allowed = _allowed_webhook_hosts()
+    if allowed is not None:
+        return None, None if host.lower() in allowed else f"host {host} is not in MINT_WEBHOOK_ALLOWED_HOSTS"
+    return host, None
+
+
+def webhook_refusal(url: str) -> Optional[str]:
+    """Why a mint webhook may not be POSTed to ``url``, or None if it may; resolves the host, so it blocks.
+
+    With MINT_WEBHOOK_ALLOWED_HOSTS set only those hosts may receive
+    webhooks; otherwise any host whose addresses are all public, so a client
+    cannot aim the server at loopback, private or link-local (cloud metadata)
+    endpoints.
+    """
+    host, refusal = _checked_host(url)
+    if host is None:
+        return refusal
+    try:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        infos = []
+    return _refusal(host, [info[4][0] for info in infos])
+
+
+async def awebhook_refusal(url: str) -> Optional[str]:
+    """``webhook_refusal`` resolving on the running loop."""
+    host, refusal = _checked_host(url)
+    if host is None:
+        return refusal
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        infos = []
+    return _refusal(host, [info[4][0] for info in infos])
+
+
+class TxTracker:
+    """Follows submitted transactions to a final status in the background.
+
+    Runs as one task on the client pool's event loop. Every ``interval`` seconds
+    it asks the node for the status of all pending hashes in a single JSON-RPC
+    batch request, records the outcome, and POSTs it to the caller's webhook
+    and calls its ``on_settled`` callback if one was given. Records are
+    readable from any thread via ``get()``.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        session_factory: Any,
+        interval: float = 2.0,
+        timeout: float = 900.0,
+        max_records: int = 10000,
+        rpc_batch_size: int = 100,
+    ) -> None:
+        self.rpc_url = rpc_url
+        self._session_factory = session_factory
+        self.interval = interval
+        self.timeout = timeout
+        self.max_records = max_records
+        self.rpc_batch_size = rpc_batch_size
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._callbacks: Dict[str, str] = {}
+        self._on_settled: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def track(
+        self,
+        tx_hash: str,
+        info: Dict[str, Any],
+        callback_url: Optional[str] = None,
+        on_settled: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Start following ``tx_hash``; must be called on the pool's event loop.
+
+        ``on_settled(record)`` is called on the loop once the transaction reaches a final status.
+        """
+        record = {**info, "transaction_hash": tx_hash, "status": TX_PENDING, "submitted_at": time.time()}
+        with self._lock:
+            self._records[tx_hash] = record
+            if callback_url:
+                self._callbacks[tx_hash] = callback_url
+            if on_settled is not None:
+                self._on_settled[tx_hash] = on_settled
+            self._evict()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return dict(record)
+
+    async def aclose(self) -> None:
+        """Stop polling; records stay readable."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def get(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._records.get(tx_hash)
+            return dict(record) if record is not None else None
+
+    def pending(self) -> List[str]:
+        with self._lock:
+            return [h for h, r in self._records.items() if r["status"] == TX_PENDING]
+
+    def _evict(self) -> None:
+        # Oldest settled records go first; pending ones are kept until they settle
+        if len(self._records) <= self.max_records:
+            return
+        for tx_hash in [h for h, r in self._records.items() if r["status"] != TX_PENDING]:
+            if len(self._records) <= self.max_records:
+                break
+            del self._records[tx_hash]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            pending = self.pending()
+            if not pending:
+                return
+            try:
+                await self.poll(pending)
+            except Exception:  # noqa: BLE001
+                logger.exception("tx tracker poll failed")
+
+    async def _fetch_statuses(self, tx_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """starknet_getTransactionStatus for many hashes, one batched JSON-RPC call per chunk."""
+        session = await self._session_factory()
+        statuses: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(tx_hashes), self.rpc_batch_size):
+            chunk = tx_hashes[start:start + self.rpc_batch_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": i, "method": "starknet_getTransactionStatus", "params": {"transaction_hash": h}}
+                for i, h in enumerate(chunk)
+            ]
+            async with session.post(self.rpc_url, json=payload) as resp:
+                replies = await resp.json(content_type=None)
+            if isinstance(replies, dict):
+                replies = [replies]
+            for reply in replies:
+                if "result" in reply and isinstance(reply.get("id"), int) and reply["id"] < len(chunk):
+                    statuses[chunk[reply["id"]]] = reply["result"]
+        return statuses
+
+    async def poll(self, tx_hashes: List[str]) -> None:
+        statuses = await self._fetch_statuses(tx_hashes)
+        now = time.time()
+        settled: List[Dict[str, Any]] = []
+        with self._lock:
+            for tx_hash in tx_hashes:
+                record = self._records.get(tx_hash)
+                if record is None:
+                    continue
+                status = statuses.get(tx_hash)
+                if status:
+                    record["finality_status"] = status.get("finality_status")
+                    record["execution_status"] = status.get("execution_status")
+                    if status.get("failure_reason"):
+                        record["failure_reason"] = status["failure_reason"]
+                final = _final_status(status) if status else None
+                if final is None and now - record["submitted_at"] > self.timeout:
+                    final = TX_TIMEOUT
+                if final is not None:
+                    record["status"] = final
+                    record["settled_at"] = now
+                    settled.append(dict(record))
+        for record in settled:
+            on_settled = self._on_settled.pop(record["transaction_hash"], None)
+            if on_settled is not None:
+                try:
+                    on_settled(record)
+                except Exception:  # noqa: BLE001
+                    logger.exception("settle callback failed for %s", record["transaction_hash"])
+            callback_url = self._callbacks.pop(record["transaction_hash"], None)
+            if callback_url:
+                asyncio.get_running_loop().create_task(self._notify(callback_url, record))
+
+    async def _notify(self, callback_url: str, record: Dict[str, Any]) -> None:
+        try:
+            import aiohttp
+
+            # Checked again: the host may resolve elsewhere now than when the mint was accepted
+            refusal = await awebhook_refusal(callback_url)
+            if refusal is not None:
+                logger.warning("mint webhook %s refused: %s", callback_url, refusal)
+                return
+            session = await self._session_factory()
+            async with session.post(
+                callback_url, json=record, timeout=aiohttp.ClientTimeout(total=10), allow_redirects=False
+            ) as resp:
+                if resp.status >= 400:
+                    logger.warning("mint webhook %s answered %s", callback_url, resp.status)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("mint webhook %s failed: %s", callback_url, e)
+
+
+def _final_status(status: Dict[str, Any]) -> Optional[str]:
+    finality = status.get("finality_status")
+    if finality == "REJECTED":
+        return TX_REJECTED
+    if status.get("execution_status") == "REVERTED":
+        return TX_REVERTED
+    if finality in _ACCEPTED_STATUSES:
+        return TX_SUCCEEDED
+    return None
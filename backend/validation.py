@@ -0,0 +1,206 @@
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from cairo_preflight import MAX_SOURCE_BYTES, CairoPreflightError, analyze
+from history import HistoryQuery, parse_cursor
+from pipeline import CONTRACT_NAME, is_literal_safe
+from tx_tracker import webhook_refusal
+
+
+class ValidationError(ValueError):
+    """A request body failed validation; ``str(e)`` is the client-facing message (HTTP 400)."""
+
+    def __init__(self, message: str, **details: Any) -> None:
+        super().__init__(message)
+        self.details = details
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"error": str(self), **self.details}
+
+
+def _hex_string(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("0x")
+
+
+def _literal_fields(**fields: str) -> None:
+    # Written into the Cairo source when the contract is compiled from its template
+    for field, value in fields.items():
+        if not is_literal_safe(value):
+            raise ValidationError(f"'{field}' must not contain quotes, backslashes or control characters")
+
+
+def owner_param(payload: Dict[str, Any]) -> Optional[str]:
+    """The optional ``owner`` of a deploy body: the wallet /history lists the deployment under.
+
+    Kept out of the validated params, so it does not change which requests count as identical.
+    """
+    owner = payload.get("owner")
+    if owner is not None and not _hex_string(owner):
+        raise ValidationError("'owner' must be a hex string")
+    return owner
+
+
+def token_params(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a /create-token body; returns name, symbol, max_token and decimals (None = default)."""
+    name = payload.get("name")
+    symbol = payload.get("symbol")
+    max_token = payload.get("max_token")
+
+    # Basic type/format checks
+    if not isinstance(name, str) or not isinstance(symbol, str):
+        raise ValidationError("'name' and 'symbol' must be strings")
+    _literal_fields(name=name, symbol=symbol)
+    try:
+        max_token_int = int(max_token)
+        if max_token_int <= 0:
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValidationError("'max_token' must be a positive integer")
+
+    # Decimals remains 18 by default; only change if provided
+    decimals_int = None
+    if payload.get("decimals") is not None:
+        try:
+            decimals_int = int(payload.get("decimals"))
+            if not 0 <= decimals_int <= 255:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValidationError("'decimals' must be an integer between 0 and 255")
+
+    return {
+        "name": name,
+        "symbol": symbol,
+        "max_token": max_token_int,
+        "decimals": decimals_int,
+    }
+
+
+def nft_params(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a /deploy-nft body; the contract's owner is hardcoded, so ``owner`` is read by owner_param."""
+    name = payload.get("name")
+    symbol = payload.get("symbol")
+    base_uri = payload.get("base_uri")
+    if not isinstance(name, str) or not isinstance(symbol, str) or not isinstance(base_uri, str):
+        raise ValidationError("'name', 'symbol', and 'base_uri' must be strings")
+    _literal_fields(name=name, symbol=symbol, base_uri=base_uri)
+    return {"name": name, "symbol": symbol, "base_uri": base_uri}
+
+
+def contract_code(code: Any, max_bytes: int = MAX_SOURCE_BYTES) -> str:
+    """Validate a /deploy-contract submission with the Cairo pre-flight, before anything is compiled."""
+    if not code or not isinstance(code, str):
+        raise ValidationError("Provide Cairo code as JSON {code: string} or text/plain body")
+    try:
+        analyze(code, contract_name=CONTRACT_NAME, max_bytes=max_bytes)
+    except CairoPreflightError as e:
+        raise ValidationError(e.message, **e.details)
+    return code
+
+
+def mint_params(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a /mint-nft body; returns contract_address, recipient, uri, callback_url and wait.
+
+    Resolves the callback_url's host, so it blocks; async servers call it off the loop.
+    """
+    contract_address = payload.get("contract_address")
+    recipient = payload.get("recipient")
+    uri = payload.get("uri")
+    callback_url = payload.get("callback_url")
+    wait = payload.get("wait", True)
+
+    if not _hex_string(contract_address):
+        raise ValidationError("'contract_address' must be a hex string")
+    if not _hex_string(recipient):
+        raise ValidationError("'recipient' must be a hex string")
+    if not isinstance(uri, str) or not uri:
+        raise ValidationError("'uri' must be a non-empty string")
+    if callback_url is not None and (not isinstance(callback_url, str) or not callback_url.startswith(("http://", "https://"))):
+        raise ValidationError("'callback_url' must be an http(s) URL")
+    if callback_url is not None:
+        refusal = webhook_refusal(callback_url)
+        if refusal is not None:
+            raise ValidationError(f"'callback_url' is not allowed: {refusal}")
+    if not isinstance(wait, bool):
+        raise ValidationError("'wait' must be a boolean")
+    return {
+        "contract_address": contract_address,
+        "recipient": recipient,
+        "uri": uri,
+        "callback_url": callback_url,
+        "wait": wait,
+    }
+
+
+def mint_batch_params(
+    payload: Dict[str, Any], default_batch_size: int, max_items: int
+) -> Tuple[str, List[Tuple[str, str]], int]:
+    """Validate a /mint-nft/batch body; returns (contract_address, [(recipient, uri)], batch_size)."""
+    contract_address = payload.get("contract_address")
+    items = payload.get("items")
+
+    if not _hex_string(contract_address):
+        raise ValidationError("'contract_address' must be a hex string")
+    if not isinstance(items, list) or not items:
+        raise ValidationError("'items' must be a non-empty list of {recipient, uri}")
+    if len(items) > max_items:
+        raise ValidationError(f"at most {max_items} items per request")
+    try:
+        batch_size = int(payload.get("batch_size") or default_batch_size)
+        if batch_size <= 0:
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValidationError("'batch_size' must be a positive integer")
+
+    pairs = []
+    for index, item in enumerate(items):
+        recipient: Optional[Any] = item.get("recipient") if isinstance(item, dict) else None
+        uri: Optional[Any] = item.get("uri") if isinstance(item, dict) else None
+        if not _hex_string(recipient):
+            raise ValidationError(f"items[{index}].recipient must be a hex string")
+        if not isinstance(uri, str) or not uri:
+            raise ValidationError(f"items[{index}].uri must be a non-empty string")
+        pairs.append((recipient, uri))
+    return contract_address, pairs, batch_size
+
+
+def _timestamp(args: Mapping[str, str], key: str) -> Optional[float]:
+    value = args.get(key)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        raise ValidationError(f"'{key}' must be unix seconds or an ISO 8601 time")
+
+
+def history_query(args: Mapping[str, str]) -> HistoryQuery:
+    """Validate GET /history query parameters."""
+    try:
+        limit = int(args.get("limit") or 50)
+        if limit <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValidationError("'limit' must be a positive integer")
+    cursor = None
+    if args.get("cursor"):
+        try:
+            cursor = parse_cursor(args["cursor"])
+        except ValueError:
+            raise ValidationError("'cursor' must be the next_cursor of a previous page")
+    for key in ("owner", "contract_address"):
+        if args.get(key) and not _hex_string(args[key]):
+            raise ValidationError(f"'{key}' must be a hex string")
+    return HistoryQuery(
+        owner=args.get("owner") or None,
+        symbol=args.get("symbol") or None,
+        contract_address=args.get("contract_address") or None,
+        kind=args.get("kind") or None,
+        since=_timestamp(args, "since"),
+        until=_timestamp(args, "until"),
+        limit=limit,
+        cursor=cursor,
+    )
@@ -0,0 +1,218 @@
+import fcntl
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Entries rewritten by the render step or by scarb itself get private copies;
+# everything else in the template is linked so workspaces stay cheap.
+_COPIED_ENTRIES = ("src", "Scarb.lock")
+_SKIPPED_ENTRIES = ("target",)
+# Under the workspace root, next to the per-project workspace dirs
+_TARGETS_DIR = ".targets"
+# Inside each workspace; flocked by the process using it
+_LOCK_FILE = ".workspace.lock"
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Cross-device or unsupported filesystem
+        shutil.copy2(src, dst)
+
+
+def _try_lock(path: str) -> Optional[int]:
+    """Open and flock ``path`` without blocking; the fd holding the lock, or None if another holds it."""
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+    except FileNotFoundError:
+        # The directory was removed meanwhile
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+class WorkspaceManager:
+    """Hands out private copies of a Scarb project so jobs can render and build in parallel.
+
+    Each workspace gets its own ``src/`` while manifests and other files are
+    hardlinked from the template. Its ``target/`` links to one of the
+    template's shared target dirs, which the workspace holds until it is
+    released: scarb's incremental compilation cache there stays warm across
+    jobs, and no two running jobs write the same artifacts. A template gets
+    as many target dirs as it has concurrent jobs; each is claimed with an
+    flock, so worker processes sharing ``root`` never claim the same one.
+    With ``shared_targets`` off every workspace starts from an empty
+    ``target/``. The scarb dependency download cache is global to scarb.
+    Released workspaces, and any left behind by a crashed process, are
+    removed by a background sweeper; target dirs are kept. A workspace in use
+    is flocked by its process, so another worker's sweeper never takes it for
+    abandoned during a long build.
+    """
+
+    def __init__(
+        self, root: str, max_age: float = 3600.0, gc_interval: float = 60.0, shared_targets: bool = True
+    ) -> None:
+        self.root = root
+        self.max_age = max_age
+        self.gc_interval = gc_interval
+        self.shared_targets = shared_targets
+        self._active: Set[str] = set()
+        self._released: Set[str] = set()
+        # workspace -> (target dir it links to, fd holding that dir's lock)
+        self._targets: Dict[str, Tuple[str, int]] = {}
+        # workspace -> fd holding the workspace's own lock
+        self._held: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._gc_thread: Optional[threading.Thread] = None
+        os.makedirs(root, exist_ok=True)
+
+    def create(self, template_dir: str) -> str:
+        project = os.path.basename(os.path.normpath(template_dir))
+        path = os.path.join(self.root, project, uuid.uuid4().hex)
+        os.makedirs(path)
+        fd = _try_lock(os.path.join(path, _LOCK_FILE))
+        with self._lock:
+            self._active.add(path)
+            if fd is not None:
+                self._held[path] = fd
+        try:
+            if self.shared_targets:
+                target = self._claim_target(project)
+                with self._lock:
+                    self._targets[path] = target
+                os.symlink(target[0], os.path.join(path, "target"))
+            for entry in os.listdir(template_dir):
+                if entry in _SKIPPED_ENTRIES:
+                    continue
+                src = os.path.join(template_dir, entry)
+                dst = os.path.join(path, entry)
+                if entry in _COPIED_ENTRIES:
+                    if os.path.isdir(src):
+                        shutil.copytree(src, dst)
+                    else:
+                        shutil.copy2(src, dst)
+                elif os.path.isdir(src):
+                    os.symlink(src, dst)
+                else:
+                    _link_or_copy(src, dst)
+        except BaseException:
+            # Hand the target dir back; the sweeper removes the partial workspace
+            self.release(path)
+            raise
+        return path
+
+    def _claim_target(self, project: str) -> Tuple[str, int]:
+        """Lock the first target dir of ``project`` nobody holds, creating one if all are taken."""
+        targets = os.path.join(self.root, _TARGETS_DIR, project)
+        os.makedirs(targets, exist_ok=True)
+        index = 0
+        while True:
+            target_dir = os.path.join(targets, str(index))
+            fd = _try_lock(target_dir + ".lock")
+            if fd is None:
+                index += 1
+                continue
+            os.makedirs(target_dir, exist_ok=True)
+            return target_dir, fd
+
+    def release(self, path: str) -> None:
+        with self._lock:
+            self._active.discard(path)
+            self._released.add(path)
+            target = self._targets.pop(path, None)
+            held = self._held.pop(path, None)
+        # Closing an fd drops its flock
+        if target is not None:
+            os.close(target[1])
+        if held is not None:
+            os.close(held)
+
+    @contextmanager
+    def acquire(self, template_dir: str) -> Iterator[str]:
+        """Yield a fresh workspace for ``template_dir``; it is queued for removal on exit."""
+        path = self.create(template_dir)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def collect(self) -> int:
+        """Remove released workspaces and abandoned ones older than ``max_age``; returns count.
+
+        A workspace is abandoned only if no process holds its lock.
+        """
+        with self._lock:
+            doomed = set(self._released)
+            self._released.clear()
+            active = set(self._active)
+        cutoff = time.time() - self.max_age
+        abandoned: Dict[str, int] = {}
+        for project in os.listdir(self.root):
+            project_dir = os.path.join(self.root, project)
+            if project == _TARGETS_DIR or not os.path.isdir(project_dir):
+                continue
+            for name in os.listdir(project_dir):
+                path = os.path.join(project_dir, name)
+                if path in active or path in doomed or os.path.getmtime(path) >= cutoff:
+                    continue
+                fd = _try_lock(os.path.join(path, _LOCK_FILE))
+                if fd is not None:
+                    # Keep it locked until removed so no process can take it back
+                    abandoned[path] = fd
+        doomed.update(abandoned)
+        for path in doomed:
+            shutil.rmtree(path, ignore_errors=True)
+        for fd in abandoned.values():
+            os.close(fd)
+        if doomed:
+            logger.debug("workspace gc removed %d workspaces", len(doomed))
+        return len(doomed)
+
+    def start_gc(self) -> None:
+        if self._gc_thread is not None:
+            return
+
+        def _loop() -> None:
+            while not self._stop.wait(self.gc_interval):
+                try:
+                    self.collect()
+                except Exception:  # noqa: BLE001
+                    logger.exception("workspace gc failed")
+
+        self._gc_thread = threading.Thread(target=_loop, name="workspace-gc", daemon=True)
+        self._gc_thread.start()
+
+    def stop_gc(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"active": len(self._active), "pending_gc": len(self._released), "targets_held": len(self._targets)}
+
+
+def create_workspace_manager() -> Optional[WorkspaceManager]:
+    """Build the manager from WORKSPACE_* settings; WORKSPACES_ENABLED=0 builds in the template dirs."""
+    if os.getenv("WORKSPACES_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    root = os.getenv("WORKSPACE_ROOT") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".workspaces")
+    manager = WorkspaceManager(
+        root,
+        max_age=float(os.getenv("WORKSPACE_MAX_AGE", "3600")),
+        gc_interval=float(os.getenv("WORKSPACE_GC_INTERVAL", "60")),
+        shared_targets=os.getenv("WORKSPACE_SHARED_TARGETS", "1").lower() not in ("0", "false", "no"),
+    )
+    manager.start_gc()
+    return manager
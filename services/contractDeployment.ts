@@ -37,17 +37,95 @@ export interface DeploymentResult {
   details?: any;
 }
 
+export interface JobWaitOptions {
+  /** Give up on the job after this long; defaults to 15 minutes */
+  timeoutMs?: number;
+  pollIntervalMs?: number;
+  /** Stops polling and rejects with the signal's reason */
+  signal?: AbortSignal;
+}
+
+/**
+ * The job did not finish within JobWaitOptions.timeoutMs; it may still be running on the server
+ */
+export class JobTimeoutError extends Error {
+  constructor(public statusUrl: string, public timeoutMs: number) {
+    super(`Job did not finish within ${Math.round(timeoutMs / 1000)}s (${statusUrl})`);
+    this.name = "JobTimeoutError";
+  }
+}
+
+// A build, declare and deploy take minutes; a job past this is lost or stuck
+const DEFAULT_JOB_TIMEOUT_MS = 15 * 60 * 1000;
+
+function abortReason(signal: AbortSignal): Error {
+  return signal.reason instanceof Error ? signal.reason : new Error("Job polling aborted");
+}
+
+function sleep(ms: number, signal?: AbortSignal): Promise<void> {
+  return new Promise((resolve, reject) => {
+    if (signal?.aborted) {
+      reject(abortReason(signal));
+      return;
+    }
+    const onAbort = () => {
+      clearTimeout(timer);
+      reject(abortReason(signal!));
+    };
+    const timer = setTimeout(() => {
+      signal?.removeEventListener("abort", onAbort);
+      resolve();
+    }, ms);
+    signal?.addEventListener("abort", onAbort, { once: true });
+  });
+}
+
+/**
+ * Deploy routes answer 202 with a job id; poll the job until it finishes,
+ * rejecting with JobTimeoutError once options.timeoutMs has passed
+ */
+async function resolveJob(response: Response, options: JobWaitOptions = {}): Promise<any> {
+  const data = await response.json();
+  if (response.status !== 202 || !data.status_url) {
+    return data;
+  }
+
+  const { timeoutMs = DEFAULT_JOB_TIMEOUT_MS, pollIntervalMs = 2000, signal } = options;
+  const deadline = Date.now() + timeoutMs;
+  while (true) {
+    const remaining = deadline - Date.now();
+    if (remaining <= 0) {
+      throw new JobTimeoutError(data.status_url, timeoutMs);
+    }
+    await sleep(Math.min(pollIntervalMs, remaining), signal);
+    const jobResponse = await fetch(`${BASE_URL}${data.status_url}`, { signal });
+    if (!jobResponse.ok) {
+      const errorText = await jobResponse.text();
+      throw new Error(`HTTP ${jobResponse.status}: ${errorText}`);
+    }
+    const job = await jobResponse.json();
+    if (job.status === "succeeded") {
+      return job.result;
+    }
+    if (job.status === "failed") {
+      throw new Error(job.error?.error || "Job failed");
+    }
+  }
+}
+
 /**
  * Create a new ERC20 token
  */
 export async function createToken(
-  params: CreateTokenParams
+  params: CreateTokenParams,
+  options: JobWaitOptions = {}
 ): Promise<DeploymentResult> {
   try {
     console.log("🪙 Creating token:", params);
 
     const response = await fetch(`${BASE_URL}/create-token`, {
       method: "POST",
+      signal: options.signal,
       headers: {
         "Content-Type": "application/json",
       },
@@ -59,7 +137,7 @@ export async function createToken(
       throw new Error(`HTTP ${response.status}: ${errorText}`);
     }
 
-    const data = await response.json();
+    const data = await resolveJob(response, options);
     console.log("✅ Token created successfully:", data);
 
     return {
@@ -81,13 +159,15 @@ export async function createToken(
  * Deploy a custom Cairo smart contract
  */
 export async function deployContract(
-  params: DeployContractParams
+  params: DeployContractParams,
+  options: JobWaitOptions = {}
 ): Promise<DeploymentResult> {
   try {
     console.log("📄 Deploying contract...");
 
     const response = await fetch(`${BASE_URL}/deploy-contract`, {
       method: "POST",
+      signal: options.signal,
       headers: {
         "Content-Type": "text/plain",
       },
@@ -99,7 +179,7 @@ export async function deployContract(
       throw new Error(`HTTP ${response.status}: ${errorText}`);
     }
 
-    const data = await response.json();
+    const data = await resolveJob(response, options);
     console.log("✅ Contract deployed successfully:", data);
 
     return {
@@ -122,13 +202,15 @@ export async function deployContract(
  * Deploy an ERC721 NFT collection
  */
 export async function deployNFT(
-  params: DeployNFTParams
+  params: DeployNFTParams,
+  options: JobWaitOptions = {}
 ): Promise<DeploymentResult> {
   try {
     console.log("🖼️ Deploying NFT collection:", params);
 
     const response = await fetch(`${BASE_URL}/deploy-nft`, {
       method: "POST",
+      signal: options.signal,
       headers: {
         "Content-Type": "application/json",
       },
@@ -140,7 +222,7 @@ export async function deployNFT(
       throw new Error(`HTTP ${response.status}: ${errorText}`);
     }
 
-    const data = await response.json();
+    const data = await resolveJob(response, options);
     console.log("✅ NFT collection deployed successfully:", data);
 
     return {